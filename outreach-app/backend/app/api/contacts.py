@@ -1,153 +1,64 @@
 """Contacts API endpoints."""
-import csv
 import io
-from collections import Counter
 from datetime import UTC, datetime
-from fastapi import APIRouter, Depends, File, Query, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Header, Query, HTTPException, UploadFile
 from pydantic import BaseModel
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.api.jobs import run_update_layout
+from app.bulk_contacts import bulk_update_contacts
+from app.columnar import columnar_response
 from app.config import settings
+from app.contact_merge import MergeError, merge_contacts
+from app.csv_import import CSVImportError, import_contacts_csv
 from app.database import get_db
+from app.duplicates import find_duplicate_candidates
 from app.enrichment import enrich_contact_email
-from app.models import Contact, ContactInfo, ContactTag, Note, ContactConnection, OutreachLog
-from app.warm_intros import PRESET_TAGS, find_warm_intro_paths, compute_mission_alignment
-
-# Priority order for first-contact recommendations
-CONTACT_METHOD_PRIORITY = ["email", "linkedin", "twitter", "website", "other"]
-
-# Stage-specific priority adjustments
-STAGE_PRIORITY = {
-    "Cold": ["email", "linkedin", "twitter", "website", "other"],
-    "Warm": ["linkedin", "email", "twitter", "website", "other"],
-    "Engaged": None,  # Use outreach history to determine
-    "Partner-Advocate": ["email", "linkedin", "twitter", "website", "other"],
-}
-
-
-def get_recommended_method(
-    contact_infos: list,
-    outreach_logs: list | None = None,
-    relationship_stage: str | None = None,
-) -> dict:
-    """Return recommended contact method factoring in availability, outreach history, and relationship stage.
-
-    Priority logic:
-    - Cold contacts: email first (formal, low-pressure)
-    - Warm contacts: LinkedIn preferred (more personal)
-    - Engaged contacts: use whatever method got replies; fall back to most-used
-    - Partner-Advocate: email first (established relationship)
-    - If a method was tried and got a reply, boost it
-    - If a method was tried with no response, deprioritize it
-    """
-    types_present = {ci.type.lower() for ci in contact_infos}
-    outreach_logs = outreach_logs or []
-
-    # Analyze outreach history
-    replied_methods: set[str] = set()
-    no_response_methods: set[str] = set()
-    method_counts: Counter[str] = Counter()
-    for log in outreach_logs:
-        m = (log.method or "").lower()
-        method_counts[m] += 1
-        if log.response_status == "replied":
-            replied_methods.add(m)
-        elif log.response_status in ("no_response", "bounced"):
-            no_response_methods.add(m)
-
-    # Determine base priority order from relationship stage
-    stage = (relationship_stage or "").strip()
-    if stage == "Engaged" and replied_methods:
-        # For engaged contacts, prefer whatever method got replies
-        priority = list(replied_methods) + [m for m in CONTACT_METHOD_PRIORITY if m not in replied_methods]
-    elif stage in STAGE_PRIORITY and STAGE_PRIORITY[stage] is not None:
-        priority = STAGE_PRIORITY[stage]
-    else:
-        priority = list(CONTACT_METHOD_PRIORITY)
-
-    # Boost methods that got replies to the front
-    if replied_methods:
-        boosted = [m for m in priority if m in replied_methods]
-        rest = [m for m in priority if m not in replied_methods]
-        priority = boosted + rest
-
-    # Deprioritize methods that got no response (push to end, but keep available)
-    if no_response_methods and not replied_methods:
-        good = [m for m in priority if m not in no_response_methods]
-        bad = [m for m in priority if m in no_response_methods]
-        priority = good + bad
-
-    # Find the best available method
-    for method in priority:
-        if method in types_present:
-            reason = _build_reason(method, stage, replied_methods, no_response_methods, method_counts)
-            return {"method": method, "available": True, "reason": reason}
-
-    # Nothing available — suggest based on stage
-    if stage in ("Warm", "Engaged"):
-        return {
-            "method": "linkedin",
-            "available": False,
-            "reason": "LinkedIn (not found — add LinkedIn URL to contact info)",
-        }
-    return {
-        "method": "email",
-        "available": False,
-        "reason": "Email (not found — add contact info or try enrichment)",
-    }
-
-
-def _build_reason(
-    method: str,
-    stage: str,
-    replied_methods: set[str],
-    no_response_methods: set[str],
-    method_counts: Counter,
-) -> str:
-    """Build a human-readable reason string for the recommendation."""
-    label = method.capitalize()
-    parts: list[str] = []
-
-    if method in replied_methods:
-        parts.append("previously got a reply")
-    elif method_counts.get(method, 0) > 0 and method not in no_response_methods:
-        parts.append(f"used {method_counts[method]}x")
-
-    if stage == "Cold":
-        parts.append("good for cold outreach")
-    elif stage == "Warm" and method == "linkedin":
-        parts.append("personal touch for warm contacts")
-    elif stage == "Engaged" and method in replied_methods:
-        parts.append("proven channel")
-    elif stage == "Partner-Advocate":
-        parts.append("established relationship")
-
-    # Note if other methods were tried without success
-    tried_no_reply = no_response_methods - {method}
-    if tried_no_reply:
-        tried_label = ", ".join(m.capitalize() for m in sorted(tried_no_reply))
-        parts.append(f"{tried_label} tried without reply")
-
-    if parts:
-        return f"{label} ({'; '.join(parts)})"
-    return f"{label} (available)"
-
+from app.facets import contact_facets, contact_filter_clauses
+from app.graph_metrics import serialize_centrality
+from app.models import Contact, ContactInfo, ContactTag, Mention, Note, ContactConnection, OutreachLog, ReplyDraft
+from app.pagination import keyset_order, keyset_page
+from app.recommendations import serialize_recommendation
+from app.rotation import get_rotation_plan, plan_rotation
+from app.search import contact_search_subquery
+from app.serializers import draft_dict, mention_dict, outreach_dict, recent_filter
+from app.warm_intros import (
+    PRESET_TAGS,
+    WARM_INTRO_SOURCE_STAGES,
+    compute_mission_alignment,
+    find_warm_intro_paths,
+    retag_warm_intro_neighbors,
+    sync_warm_intro_tags,
+)
 
 router = APIRouter()
 
 
 @router.get("")
 def list_contacts(
-    q: str | None = Query(None, description="Search by name or category"),
+    q: str | None = Query(None, description="Full-text search: name, category, bio, role/org, interests, notes"),
     category: str | None = Query(None, description="Filter by category"),
     in_rotation: bool | None = Query(None, description="Filter to contacts in mention rotation"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Set false to skip the COUNT query (total = null)"),
+    accept: str | None = Header(None),
     db: Session = Depends(get_db),
 ):
-    """List contacts with optional search and filter."""
-    query = db.query(Contact).options(joinedload(Contact.contact_info), joinedload(Contact.tags))
-    if q:
+    """List contacts with optional search and filter.
+    Pages by list number; follow next_cursor for constant-cost paging (see app.pagination).
+    With q, results are ranked by relevance (every word matched as a prefix; see app.search)
+    and paged with skip only.
+    Send Accept: application/vnd.outreach.columnar+json (or application/x-msgpack) for columnar output."""
+    query = db.query(Contact).options(joinedload(Contact.tags), joinedload(Contact.graph_metrics))
+    hits = contact_search_subquery(db, q) if q else None
+    if hits is not None:
+        if cursor:
+            raise HTTPException(status_code=400, detail="Ranked search (q) pages with skip, not cursor")
+        query = query.join(hits, hits.c.contact_id == Contact.id)
+    elif q:
         query = query.filter(
             Contact.name.ilike(f"%{q}%") | Contact.category.ilike(f"%{q}%")
         )
@@ -155,17 +66,14 @@ def list_contacts(
         query = query.filter(Contact.category.ilike(f"%{category}%"))
     if in_rotation:
         query = query.filter(Contact.in_mention_rotation == 1)
-    total = query.count()
-    contacts = query.order_by(Contact.list_number).offset(skip).limit(limit).all()
-
-    # Batch-load outreach logs for all contacts in one query
-    contact_ids = [c.id for c in contacts]
-    all_outreach = db.query(OutreachLog).filter(OutreachLog.contact_id.in_(contact_ids)).all() if contact_ids else []
-    outreach_by_contact: dict[int, list] = {}
-    for log in all_outreach:
-        outreach_by_contact.setdefault(log.contact_id, []).append(log)
+    total = query.count() if include_total else None
+    if hits is not None:
+        contacts = query.order_by(hits.c.rank, Contact.list_number).offset(skip).limit(limit).all()
+        next_cursor = None
+    else:
+        contacts, next_cursor = keyset_page(query, Contact.list_number, Contact.id, cursor, limit, skip=skip)
 
-    return {
+    payload = {
         "total": total,
         "contacts": [
             {
@@ -181,17 +89,19 @@ def list_contacts(
                 "mission_alignment": c.mission_alignment,
                 "in_mention_rotation": bool(c.in_mention_rotation),
                 "tags": [t.tag for t in (c.tags or [])],
-                "recommended_contact_method": get_recommended_method(
-                    list(c.contact_info) if c.contact_info else [],
-                    outreach_by_contact.get(c.id),
-                    c.relationship_stage,
-                ),
+                "centrality": serialize_centrality(c.graph_metrics),
+                "recommended_contact_method": serialize_recommendation(c),
             }
             for c in contacts
         ],
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
     }
+    return columnar_response(
+        payload, ("contacts",), accept,
+        interned={"contacts": ("category", "subcategory", "relationship_stage")},
+    )
 
 
 class RotationSetBody(BaseModel):
@@ -205,6 +115,18 @@ def list_categories(db: Session = Depends(get_db)):
     return {"categories": [r[0] for r in rows if r[0]]}
 
 
+@router.get("/facets")
+def get_contact_facets(
+    q: str | None = Query(None, description="Same as the list's q"),
+    category: str | None = Query(None, description="Same as the list's category"),
+    in_rotation: bool | None = Query(None, description="Same as the list's in_rotation"),
+    db: Session = Depends(get_db),
+):
+    """Counts per category, stage, tag, rotation and enrichment status for the list filters.
+    Cached until the next contact or tag write (see app.facets)."""
+    return contact_facets(db, q=q, category=category, in_rotation=in_rotation)
+
+
 @router.put("/rotation")
 def set_mention_rotation(body: RotationSetBody, db: Session = Depends(get_db)):
     """Set the daily mention rotation: only these contact IDs will be included in the next mention fetch. Clears others."""
@@ -230,6 +152,34 @@ def get_mention_rotation(db: Session = Depends(get_db)):
     }
 
 
+class RotationPlanBody(BaseModel):
+    budget: int | None = None  # Contacts to plan; default = what today's provider quotas still allow
+
+
+@router.get("/rotation/plan")
+def get_rotation_plan_for_day(
+    date: str | None = Query(None, description="YYYY-MM-DD (default today, UTC)"),
+    db: Session = Depends(get_db),
+):
+    """The stored automatic rotation plan for a day: who gets a mention fetch, why, and whether it ran."""
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d").date() if date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    return get_rotation_plan(db, day)
+
+
+@router.post("/rotation/plan")
+def replan_rotation(body: RotationPlanBody | None = None, db: Session = Depends(get_db)):
+    """Re-plan today's mention rotation (pinned, hot, then least recently visited; see app.rotation)."""
+    budget = body.budget if body else None
+    if budget is not None and budget < 0:
+        raise HTTPException(status_code=400, detail="budget must be >= 0")
+    result = plan_rotation(db, budget=budget)
+    db.commit()
+    return result
+
+
 # --- Tags preset (must appear before /{contact_id} to avoid route shadowing) ---
 
 @router.get("/tags/preset")
@@ -247,7 +197,9 @@ class AddContactsBody(BaseModel):
 @router.post("")
 def add_contacts(body: AddContactsBody, db: Session = Depends(get_db)):
     """Add one or more contacts by name. Accepts comma-separated names.
-    Skips duplicates (case-insensitive). Auto-increments list_number."""
+    Skips exact duplicates (case-insensitive). Names that resemble an existing contact
+    ("Stuart J. Russell", "Stuart Russel") are added and listed in possible_duplicates.
+    Auto-increments list_number."""
     raw_names = [n.strip() for n in body.names.split(",") if n.strip()]
     if not raw_names:
         raise HTTPException(status_code=400, detail="No names provided.")
@@ -258,10 +210,14 @@ def add_contacts(body: AddContactsBody, db: Session = Depends(get_db)):
 
     added = []
     skipped = []
+    possible_duplicates = []
     for name in raw_names:
         if name.lower() in existing_names:
             skipped.append(name)
             continue
+        candidates = find_duplicate_candidates(db, name)
+        if candidates:
+            possible_duplicates.append({"name": name, "candidates": candidates})
         contact = Contact(
             name=name,
             list_number=next_number,
@@ -276,128 +232,34 @@ def add_contacts(body: AddContactsBody, db: Session = Depends(get_db)):
     return {
         "added": added,
         "skipped": skipped,
+        "possible_duplicates": possible_duplicates,
         "message": f"Added {len(added)} contact(s). Skipped {len(skipped)} duplicate(s).",
     }
 
 
 # --- CSV Import -----------------------------------------------------------
 
-# Maps CSV column names to ContactInfo.type values
-_CSV_COLUMN_TYPE_MAP = {
-    "email": "email",
-    "linkedin": "linkedin",
-    "x": "twitter",
-    "phone": "phone",
-    "other": "other",
-}
-
-
 @router.post("/import-csv")
-async def import_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    """Import contacts and contact info from a CSV file.
+def import_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Import contacts and contact info from a CSV file (see app.csv_import for columns and matching).
 
-    CSV columns: name, email, linkedin, x, phone, other
-    - Matches rows to existing contacts by name (case-insensitive).
-    - Adds new ContactInfo entries; skips duplicates.
-    - Creates new contacts when no name match is found.
+    Parses the upload as a stream and commits in chunks. For large files use
+    POST /api/jobs/import-csv, which runs the same import in the background with progress.
     """
-    # 1. Validate file type
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="File must be a .csv file")
-
-    # 2. Read and decode (utf-8-sig handles Excel BOM)
+    # utf-8-sig handles Excel BOM
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
     try:
-        raw = await file.read()
-        text = raw.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
-
-    # 3. Parse CSV
-    reader = csv.DictReader(io.StringIO(text))
-    if reader.fieldnames is None:
-        raise HTTPException(status_code=400, detail="CSV file is empty or has no header row")
-
-    headers = [h.strip().lower() for h in reader.fieldnames]
-    if "name" not in headers:
-        raise HTTPException(
-            status_code=400,
-            detail=f"CSV must have a 'name' column. Found columns: {', '.join(headers)}",
-        )
+        return import_contacts_csv(db, lines)
+    except CSVImportError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        lines.detach()
 
-    # 4. Pre-load all contacts for O(1) name matching
-    all_contacts = db.query(Contact).all()
-    name_to_contact = {c.name.strip().lower(): c for c in all_contacts}
-
-    # 5. Process rows
-    created: list[str] = []
-    updated: list[str] = []
-    skipped_rows: list[dict] = []
-    info_added = 0
-    info_skipped = 0
-
-    for row_num, row in enumerate(reader, start=2):  # row 1 = header
-        row = {k.strip().lower(): (v.strip() if v else "") for k, v in row.items()}
-        name = row.get("name", "").strip()
-        if not name:
-            skipped_rows.append({"row": row_num, "reason": "Empty name"})
-            continue
-
-        # Match or create contact
-        lookup = name.lower()
-        contact = name_to_contact.get(lookup)
-        if contact is None:
-            contact = Contact(name=name)
-            db.add(contact)
-            db.flush()  # assign id within the transaction
-            name_to_contact[lookup] = contact
-            created.append(name)
-        else:
-            updated.append(name)
-
-        # Existing ContactInfo for dedup
-        existing_info = db.query(ContactInfo).filter(ContactInfo.contact_id == contact.id).all()
-        existing_pairs = {(ci.type.lower(), ci.value.lower()) for ci in existing_info}
-
-        # Add new ContactInfo from each mapped column
-        for col, info_type in _CSV_COLUMN_TYPE_MAP.items():
-            value = row.get(col, "").strip()
-            if not value:
-                continue
-            if (info_type, value.lower()) in existing_pairs:
-                info_skipped += 1
-                continue
-            db.add(ContactInfo(contact_id=contact.id, type=info_type, value=value, is_primary=0))
-            existing_pairs.add((info_type, value.lower()))
-            info_added += 1
-
-    db.commit()
-
-    return {
-        "created": len(created),
-        "updated": len(updated),
-        "info_added": info_added,
-        "info_skipped_duplicates": info_skipped,
-        "skipped_rows": skipped_rows,
-        "created_names": created,
-        "updated_names": updated,
-    }
-
-
-@router.get("/{contact_id}")
-def get_contact(contact_id: int, db: Session = Depends(get_db)):
-    """Get a single contact by ID with contact info and first-contact recommendation."""
-    contact = (
-        db.query(Contact)
-        .options(joinedload(Contact.contact_info), joinedload(Contact.tags))
-        .filter(Contact.id == contact_id)
-        .first()
-    )
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
 
+def _contact_detail(contact: Contact) -> dict:
     contact_infos = list(contact.contact_info) if contact.contact_info else []
-    outreach_logs = db.query(OutreachLog).filter(OutreachLog.contact_id == contact_id).all()
-    recommendation = get_recommended_method(contact_infos, outreach_logs, contact.relationship_stage)
 
     return {
         "id": contact.id,
@@ -414,14 +276,113 @@ def get_contact(contact_id: int, db: Session = Depends(get_db)):
         "mission_alignment": contact.mission_alignment,
         "in_mention_rotation": bool(contact.in_mention_rotation),
         "tags": [t.tag for t in (contact.tags or [])],
+        "centrality": serialize_centrality(contact.graph_metrics),
         "contact_info": [
             {"type": ci.type, "value": ci.value, "is_primary": bool(ci.is_primary)}
             for ci in contact_infos
         ],
-        "recommended_contact_method": recommendation,
+        "recommended_contact_method": serialize_recommendation(contact),
     }
 
 
+@router.get("/{contact_id}")
+def get_contact(contact_id: int, db: Session = Depends(get_db)):
+    """Get a single contact by ID with contact info and first-contact recommendation."""
+    contact = (
+        db.query(Contact)
+        .options(joinedload(Contact.contact_info), joinedload(Contact.tags), joinedload(Contact.graph_metrics))
+        .filter(Contact.id == contact_id)
+        .first()
+    )
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+
+    return _contact_detail(contact)
+
+
+# Sections of GET /{contact_id}/full, in response order
+CONTACT_FULL_SECTIONS = (
+    "contact", "notes", "connections", "tags", "warm_intros", "mentions", "outreach", "reply_drafts",
+)
+
+
+@router.get("/{contact_id}/full")
+def get_contact_full(
+    contact_id: int,
+    include: str | None = Query(None, description="Comma-separated sections (default: all). " + ", ".join(CONTACT_FULL_SECTIONS)),
+    days: int = Query(7, ge=1, le=90, description="Mentions from last N days"),
+    limit: int = Query(50, ge=1, le=100, description="Max mentions and outreach entries"),
+    db: Session = Depends(get_db),
+):
+    """Everything the contact detail page shows, in one round trip.
+
+    The contact row is read once; its collections come in with one selectin
+    query each, and mentions/outreach with one capped query each, so the
+    query count is fixed however much history the contact has. Sections match
+    the standalone endpoints (notes, connections, tags, warm-intros, mentions
+    ?contact_id=, outreach?contact_id=, reply-drafts?contact_id=).
+    """
+    sections = set(CONTACT_FULL_SECTIONS)
+    if include:
+        sections = {s.strip() for s in include.split(",") if s.strip()}
+        unknown = sections - set(CONTACT_FULL_SECTIONS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown section(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(CONTACT_FULL_SECTIONS)}",
+            )
+
+    options = []
+    if "contact" in sections:
+        options += [selectinload(Contact.contact_info), selectinload(Contact.graph_metrics)]
+    if sections & {"contact", "tags"}:
+        options.append(selectinload(Contact.tags))
+    if "notes" in sections:
+        options.append(selectinload(Contact.notes))
+    if "connections" in sections:
+        options.append(selectinload(Contact.connections).selectinload(ContactConnection.other_contact))
+    if "reply_drafts" in sections:
+        options.append(selectinload(Contact.reply_drafts).selectinload(ReplyDraft.mention))
+    contact = db.query(Contact).options(*options).filter(Contact.id == contact_id).first()
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+
+    result = {}
+    if "contact" in sections:
+        result["contact"] = _contact_detail(contact)
+    if "notes" in sections:
+        notes = sorted(contact.notes, key=lambda n: (n.note_date is not None, n.note_date), reverse=True)
+        result["notes"] = [_note_dict(n) for n in notes]
+    if "connections" in sections:
+        result["connections"] = [_connection_dict(c) for c in contact.connections]
+    if "tags" in sections:
+        result["tags"] = [{"id": t.id, "tag": t.tag} for t in contact.tags]
+    if "warm_intros" in sections:
+        result["warm_intros"] = find_warm_intro_paths(db, contact_id)
+    if "mentions" in sections:
+        mentions = (
+            db.query(Mention)
+            .filter(Mention.contact_id == contact_id, Mention.dismissed == 0, recent_filter(days))
+            .order_by(*keyset_order(Mention.published_at, Mention.id, descending=True))
+            .limit(limit)
+            .all()
+        )
+        result["mentions"] = [mention_dict(m) for m in mentions]
+    if "outreach" in sections:
+        entries = (
+            db.query(OutreachLog)
+            .filter(OutreachLog.contact_id == contact_id)
+            .order_by(*keyset_order(OutreachLog.sent_at, OutreachLog.id, descending=True))
+            .limit(limit)
+            .all()
+        )
+        result["outreach"] = [outreach_dict(e) for e in entries]
+    if "reply_drafts" in sections:
+        drafts = sorted(contact.reply_drafts, key=lambda d: (d.created_at is not None, d.created_at), reverse=True)
+        result["reply_drafts"] = [draft_dict(d) for d in drafts]
+    return result
+
+
 VALID_RELATIONSHIP_STAGES = {"Cold", "Warm", "Engaged", "Partner-Advocate"}
 
 
@@ -441,11 +402,16 @@ def patch_contact(contact_id: int, data: ContactPatch, db: Session = Depends(get
         stage = data.relationship_stage.strip()
         if stage and stage not in VALID_RELATIONSHIP_STAGES:
             raise HTTPException(status_code=400, detail=f"Invalid relationship_stage. Must be one of: {', '.join(sorted(VALID_RELATIONSHIP_STAGES))}")
+        was_source = contact.relationship_stage in WARM_INTRO_SOURCE_STAGES
         contact.relationship_stage = stage or None
+        if was_source != (contact.relationship_stage in WARM_INTRO_SOURCE_STAGES):
+            db.flush()
+            retag_warm_intro_neighbors(db, contact_id)
     if data.in_mention_rotation is not None:
         contact.in_mention_rotation = 1 if data.in_mention_rotation else 0
     if data.mission_alignment is not None:
         contact.mission_alignment = max(1.0, min(10.0, data.mission_alignment))
+        contact.mission_alignment_manual = 1
     db.commit()
     db.refresh(contact)
     return {
@@ -456,12 +422,103 @@ def patch_contact(contact_id: int, data: ContactPatch, db: Session = Depends(get
     }
 
 
+class BulkContactFilter(BaseModel):
+    q: str | None = None
+    category: str | None = None
+    in_rotation: bool | None = None
+    all: bool = False  # Must be set to target every contact with no other filter
+
+
+class BulkContactChanges(BaseModel):
+    relationship_stage: str | None = None
+    in_mention_rotation: bool | None = None
+    mission_alignment: float | None = None
+    add_tags: list[str] = []
+    remove_tags: list[str] = []
+
+
+class BulkContactBody(BaseModel):
+    contact_ids: list[int] | None = None  # Either ids...
+    filter: BulkContactFilter | None = None  # ...or the list filters (same as GET /api/contacts)
+    changes: BulkContactChanges
+
+
+@router.post("/bulk")
+def bulk_update(body: BulkContactBody, db: Session = Depends(get_db)):
+    """Apply one set of changes (stage, rotation, alignment, tags) to many contacts in one transaction.
+    Warm intro tags, recommendations and the map version are recomputed once (see app.bulk_contacts)."""
+    if (body.contact_ids is None) == (body.filter is None):
+        raise HTTPException(status_code=400, detail="Give either contact_ids or filter")
+    changes = body.changes
+    if not changes.model_dump(exclude_defaults=True):
+        raise HTTPException(status_code=400, detail="No changes given")
+    stage = changes.relationship_stage.strip() if changes.relationship_stage is not None else None
+    if stage and stage not in VALID_RELATIONSHIP_STAGES:
+        raise HTTPException(status_code=400, detail=f"Invalid relationship_stage. Must be one of: {', '.join(sorted(VALID_RELATIONSHIP_STAGES))}")
+
+    if body.filter is not None:
+        f = body.filter
+        clauses = contact_filter_clauses(db, f.q, f.category, f.in_rotation)
+        if not clauses and not f.all:
+            raise HTTPException(status_code=400, detail="Filter matches every contact; narrow it or set all: true")
+        contact_ids = db.execute(select(Contact.id).where(*clauses.values())).scalars().all()
+    else:
+        contact_ids = db.execute(select(Contact.id).where(Contact.id.in_(body.contact_ids))).scalars().all()
+
+    result = bulk_update_contacts(
+        db,
+        contact_ids,
+        relationship_stage=stage,
+        in_mention_rotation=changes.in_mention_rotation,
+        mission_alignment=changes.mission_alignment,
+        add_tags=changes.add_tags,
+        remove_tags=changes.remove_tags,
+    )
+    db.commit()
+    return result
+
+
+class MergeBody(BaseModel):
+    loser_ids: list[int]  # Contacts folded into this one and then deleted
+
+
+@router.post("/{contact_id}/merge")
+def merge_into_contact(
+    contact_id: int,
+    body: MergeBody,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """Merge duplicate contacts into this one: their mentions, notes, outreach, drafts, info, tags
+    and connections move here (duplicates dropped) and they are deleted. One transaction."""
+    if not db.query(Contact.id).filter(Contact.id == contact_id).first():
+        raise HTTPException(status_code=404, detail="Contact not found")
+    try:
+        result = merge_contacts(db, contact_id, body.loser_ids)
+    except MergeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    db.commit()
+    if result["moved"]["connections"]:
+        background_tasks.add_task(run_update_layout, db.get_bind())
+    return result
+
+
 class NoteCreate(BaseModel):
     note_text: str
     note_date: str  # ISO date or datetime
     channel: str | None = None
 
 
+def _note_dict(n: Note) -> dict:
+    return {
+        "id": n.id,
+        "note_text": n.note_text,
+        "note_date": n.note_date.isoformat() if n.note_date else None,
+        "channel": n.channel,
+        "created_at": n.created_at.isoformat() if n.created_at else None,
+    }
+
+
 @router.get("/{contact_id}/notes")
 def list_notes(contact_id: int, db: Session = Depends(get_db)):
     """List notes for a contact, newest first."""
@@ -469,18 +526,7 @@ def list_notes(contact_id: int, db: Session = Depends(get_db)):
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     notes = db.query(Note).filter(Note.contact_id == contact_id).order_by(Note.note_date.desc()).all()
-    return {
-        "notes": [
-            {
-                "id": n.id,
-                "note_text": n.note_text,
-                "note_date": n.note_date.isoformat() if n.note_date else None,
-                "channel": n.channel,
-                "created_at": n.created_at.isoformat() if n.created_at else None,
-            }
-            for n in notes
-        ],
-    }
+    return {"notes": [_note_dict(n) for n in notes]}
 
 
 @router.post("/{contact_id}/notes")
@@ -517,6 +563,17 @@ class ConnectionCreate(BaseModel):
     notes: str | None = None
 
 
+def _connection_dict(c: ContactConnection) -> dict:
+    return {
+        "id": c.id,
+        "other_contact_id": c.other_contact_id,
+        "other_contact_name": c.other_contact.name if c.other_contact else None,
+        "relationship_type": c.relationship_type,
+        "notes": c.notes,
+        "created_at": c.created_at.isoformat() if c.created_at else None,
+    }
+
+
 @router.get("/{contact_id}/connections")
 def list_connections(contact_id: int, db: Session = Depends(get_db)):
     """List how this contact is related to others on the list."""
@@ -529,23 +586,16 @@ def list_connections(contact_id: int, db: Session = Depends(get_db)):
         .filter(ContactConnection.contact_id == contact_id)
         .all()
     )
-    return {
-        "connections": [
-            {
-                "id": c.id,
-                "other_contact_id": c.other_contact_id,
-                "other_contact_name": c.other_contact.name if c.other_contact else None,
-                "relationship_type": c.relationship_type,
-                "notes": c.notes,
-                "created_at": c.created_at.isoformat() if c.created_at else None,
-            }
-            for c in conns
-        ],
-    }
+    return {"connections": [_connection_dict(c) for c in conns]}
 
 
 @router.post("/{contact_id}/connections")
-def create_connection(contact_id: int, data: ConnectionCreate, db: Session = Depends(get_db)):
+def create_connection(
+    contact_id: int,
+    data: ConnectionCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """Record how this contact is related to another on the list."""
     contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if not contact:
@@ -572,8 +622,11 @@ def create_connection(contact_id: int, data: ConnectionCreate, db: Session = Dep
         notes=(data.notes.strip() or None) if data.notes else None,
     )
     db.add(conn)
+    db.flush()
+    sync_warm_intro_tags(db, [contact_id, data.other_contact_id])
     db.commit()
     db.refresh(conn)
+    background_tasks.add_task(run_update_layout, db.get_bind())
     return {
         "id": conn.id,
         "other_contact_id": conn.other_contact_id,
@@ -598,7 +651,10 @@ def delete_connection(
     )
     if not conn:
         raise HTTPException(status_code=404, detail="Connection not found")
+    endpoints = [conn.contact_id, conn.other_contact_id]
     db.delete(conn)
+    db.flush()
+    sync_warm_intro_tags(db, endpoints)
     db.commit()
     return {"ok": True}
 
@@ -708,7 +764,6 @@ def enrich_bio(contact_id: int, db: Session = Depends(get_db)):
         )
 
     from app.enrichment import BioGenerationError, generate_bio_summary
-    from app.models import Mention
 
     contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if not contact:
@@ -771,6 +826,9 @@ def add_tag(contact_id: int, data: TagCreate, db: Session = Depends(get_db)):
         .first()
     )
     if existing:
+        if existing.auto:
+            existing.auto = 0  # Added by hand now: automatic re-tagging must not remove it
+            db.commit()
         return {"id": existing.id, "tag": existing.tag, "message": "Tag already exists"}
     tag = ContactTag(contact_id=contact_id, tag=tag_name)
     db.add(tag)
@@ -810,15 +868,29 @@ def get_warm_intros(contact_id: int, db: Session = Depends(get_db)):
     return {"contact_name": contact.name, "intro_paths": paths, "count": len(paths)}
 
 
+# --- Duplicates ---
+
+@router.get("/{contact_id}/duplicates")
+def get_duplicates(contact_id: int, limit: int = Query(5, ge=1, le=50), db: Session = Depends(get_db)):
+    """Other contacts whose names likely refer to the same person (see app.duplicates), best first."""
+    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    candidates = find_duplicate_candidates(db, contact.name, exclude_id=contact_id, limit=limit)
+    return {"contact_name": contact.name, "candidates": candidates, "count": len(candidates)}
+
+
 # --- Mission Alignment ---
 
 @router.post("/{contact_id}/compute-alignment")
 def compute_alignment(contact_id: int, db: Session = Depends(get_db)):
-    """Auto-compute mission alignment score from category/interests. User can override via PATCH."""
+    """Auto-compute mission alignment score from category/interests, replacing a manual score.
+    User can override via PATCH."""
     contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     score = compute_mission_alignment(contact)
     contact.mission_alignment = score
+    contact.mission_alignment_manual = 0
     db.commit()
     return {"contact_id": contact_id, "mission_alignment": score}
@@ -3,6 +3,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db, SessionLocal
+from app.events import publish_job
 from app.scoring import generate_daily_digest, get_hot_leads, score_all_mentions
 
 router = APIRouter()
@@ -17,6 +18,7 @@ def _run_score_all(contact_id: int | None, rescore: bool):
     db = SessionLocal()
     try:
         _scoring_result = score_all_mentions(db, contact_id=contact_id, rescore=rescore)
+        publish_job("score", _scoring_result)
     finally:
         db.close()
 
@@ -30,6 +32,7 @@ async def trigger_score_mentions(
     """Score all unscored mentions (or re-score all). Runs in background."""
     global _scoring_result
     _scoring_result = None
+    publish_job("score", None)
     background_tasks.add_task(_run_score_all, contact_id, rescore)
     return {"status": "started", "message": "Scoring mentions in background. Check GET /api/digest/score-status."}
 
@@ -0,0 +1,56 @@
+"""Live event stream (server-sent events) for job progress, new mentions and new connections."""
+import asyncio
+import json
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.events import bus
+
+router = APIRouter()
+
+# A comment line is sent after this long without events so proxies keep the connection open
+KEEPALIVE_SECONDS = 15
+
+
+def format_event(item: dict) -> str:
+    """One event in text/event-stream framing."""
+    return f"id: {item['id']}\nevent: {item['type']}\ndata: {json.dumps(item['data'], default=str)}\n\n"
+
+
+async def stream_events(request: Request, types: set[str] | None, after_id: int | None):
+    sub = bus.subscribe(types, after_id)
+    try:
+        yield "retry: 1000\n\n"
+        while not sub.overflowed:
+            try:
+                item = await asyncio.wait_for(sub.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(item)
+    finally:
+        bus.unsubscribe(sub)
+
+
+@router.get("")
+async def event_stream(
+    request: Request,
+    types: str | None = Query(None, description="Comma-separated event types (job, mention, connection); default all"),
+    last_event_id: str | None = Header(None),
+):
+    """Server-sent events: "job" ({job, status, ...} as the job's status endpoint returns it),
+    "mention" ({id, contact_id, article_id, source_type}) and "connection"
+    ({id, contact_id, other_contact_id, relationship_type}), pushed as they happen.
+
+    A client reconnecting with Last-Event-ID first receives the events it missed (if still buffered).
+    """
+    wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+    after_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        stream_events(request, wanted, after_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
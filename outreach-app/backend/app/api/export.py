@@ -0,0 +1,53 @@
+"""Export API: stream contacts and mentions as CSV or JSONL (see app.export)."""
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.export import EXPORT_FORMATS, export_contacts, export_mentions
+
+router = APIRouter()
+
+FORMAT_QUERY = Query("csv", pattern="^(csv|jsonl)$", description="csv or jsonl")
+
+
+def _stream(bind, export, fmt: str, name: str, **kwargs) -> StreamingResponse:
+    """StreamingResponse over export(db, fmt) on a session of its own, open only while streaming."""
+
+    def body():
+        db = Session(bind=bind)
+        try:
+            yield from export(db, fmt, **kwargs)
+        finally:
+            db.close()
+
+    filename = f"{name}-{datetime.now(UTC):%Y%m%d}.{fmt}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/contacts")
+def export_contacts_file(format: str = FORMAT_QUERY, db: Session = Depends(get_db)):
+    """All contacts with contact info, tags and latest outreach, one row/line per contact."""
+    return _stream(db.get_bind(), export_contacts, format, "contacts")
+
+
+@router.get("/mentions")
+def export_mentions_file(
+    format: str = FORMAT_QUERY,
+    contact_id: int | None = Query(None, description="Only this contact's mentions"),
+    days: int | None = Query(None, ge=1, description="Only mentions published in the last N days"),
+    include_dismissed: bool = Query(True),
+    db: Session = Depends(get_db),
+):
+    """Mentions (newest first) with contact name, one row/line per mention."""
+    since = datetime.now(UTC) - timedelta(days=days) if days else None
+    return _stream(
+        db.get_bind(), export_mentions, format, "mentions",
+        contact_id=contact_id, since=since, include_dismissed=include_dismissed,
+    )
@@ -1,14 +1,29 @@
 """Background job endpoints."""
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
 import threading
+from datetime import UTC, datetime
+from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
 from app.scheduler import run_fetch_mentions
-from app.database import SessionLocal
+from app.csv_import import CSVImportError, check_csv_header, import_contacts_csv
+from app.database import SessionLocal, get_db
+from app.duplicates import find_duplicates
 from app.discovery import discover_from_mentions, discover_via_search, discover_all
 from app.enrichment import enrich_bulk
+from app.events import latest_mention_id, publish_job, publish_new_mentions
+from app.graph_metrics import compute_centrality, detect_communities, update_layout
 from app.media_sources import fetch_media_for_contacts
+from app.retention import archive_mentions
+from app.scoring import score_all_mentions
 from app.warm_intros import score_all_alignments, auto_tag_warm_intro
 from app.config import settings
 
@@ -19,12 +34,33 @@ _job_results_lock = threading.Lock()
 _job_results: dict[str, dict | None] = {
     "enrich": None,
     "media": None,
+    "centrality": None,
+    "communities": None,
+    "layout": None,
+    "duplicates": None,
+    "archive": None,
 }
 
 # Fetch-mentions progress state
+_FETCH_PROGRESS_RE = re.compile(r"\[(\d+)/(\d+)\]")
 _fetch_status: dict = {"status": "idle", "started_at": None, "completed_at": None, "mentions_added": None, "message": "No fetch has run yet."}
 
 
+# Layout runs are coalesced: one at a time, and requests made meanwhile fold into one rerun
+_layout_lock = threading.Lock()
+_layout_state = {"running": False, "rerun": False, "full": False}
+
+# CSV import progress state
+_import_status: dict = {"status": "idle", "started_at": None, "completed_at": None, "message": "No import has run yet."}
+
+
+def _set_job_result(job: str, result: dict | None) -> None:
+    """Store a job's result (None = running) and push it to the event stream."""
+    with _job_results_lock:
+        _job_results[job] = result
+    publish_job(job, result)
+
+
 def get_fetch_status() -> dict:
     with _job_results_lock:
         return dict(_fetch_status)
@@ -33,7 +69,10 @@ def get_fetch_status() -> dict:
 def _run_discover_from_mentions():
     db = SessionLocal()
     try:
-        return discover_from_mentions(db)
+        result = discover_from_mentions(db)
+        if result.get("added"):
+            run_update_layout(db.get_bind())
+        return result
     finally:
         db.close()
 
@@ -44,66 +83,94 @@ def _run_discover_via_search(contact_id: int, max_pairs: int = 20):
         api_key = settings.newsapi_key
         if not api_key:
             return {"added": 0, "searched_pairs": 0, "message": "NewsAPI key not configured."}
-        return discover_via_search(db, contact_id, api_key, max_pairs=max_pairs)
+        result = discover_via_search(db, contact_id, api_key, max_pairs=max_pairs)
+        if result.get("added"):
+            run_update_layout(db.get_bind())
+        return result
     finally:
         db.close()
 
 
+def _update_fetch_status(**fields) -> None:
+    with _job_results_lock:
+        _fetch_status.update(fields)
+        status = dict(_fetch_status)
+    publish_job("fetch-mentions", status)
+
+
 def _run_fetch_mentions_tracked():
-    """Wrapper around run_fetch_mentions that tracks progress in _fetch_status."""
-    from datetime import UTC, datetime
-    import subprocess, sys
-    from pathlib import Path
+    """Run scripts/fetch_mentions.py over today's rotation plan, tracking progress in _fetch_status
+    and on the event stream.
 
-    with _job_results_lock:
-        _fetch_status.update({"status": "running", "started_at": datetime.now(UTC).isoformat(), "completed_at": None, "mentions_added": None, "message": "Fetch in progress..."})
+    Same plan run as the scheduler (scheduler.run_fetch_mentions): contacts already fetched today
+    are skipped and every fetch counts against the providers' daily quotas. The script commits
+    after each contact; its mentions are announced as its progress lines arrive.
+    """
+    _update_fetch_status(
+        status="running", started_at=datetime.now(UTC).isoformat(), completed_at=None,
+        mentions_added=None, contacts_done=None, contacts_total=None, message="Fetch in progress...",
+    )
 
+    db = SessionLocal()
     try:
+        seen = latest_mention_id(db)
+        db.rollback()
         base = Path(__file__).resolve().parent.parent.parent.parent  # outreach-app/
         script = base / "scripts" / "fetch_mentions.py"
-        result = subprocess.run(
-            [sys.executable, str(script), "--limit", "50", "--days", "3", "--max-per-contact", "2"],
+        proc = subprocess.Popen(
+            [sys.executable, str(script), "--plan", "--days", "3", "--max-per-contact", "2"],
             cwd=str(base),
-            env={**__import__("os").environ, "PYTHONPATH": str(base / "backend")},
-            capture_output=True,
+            env={**os.environ, "PYTHONPATH": str(base / "backend")},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=600,
         )
-        # Parse "Added N new mentions." from stdout
+        timer = threading.Timer(600, proc.kill)  # 10 min max
+        timer.start()
+        # Parse "[i/N] name: +k mentions" progress and "Done. Added N new mentions." from stdout
         added = None
-        for line in (result.stdout or "").splitlines():
-            if line.startswith("Done. Added "):
-                try:
-                    added = int(line.split("Added ")[1].split(" ")[0])
-                except (IndexError, ValueError):
-                    pass
-        # Run post-fetch jobs (connection discovery + scoring)
-        from app.database import SessionLocal
-        from app.discovery import discover_from_mentions
-        from app.scoring import score_all_mentions
-        db = SessionLocal()
         try:
-            discover_from_mentions(db)
-            score_all_mentions(db)
+            for line in proc.stdout:
+                line = line.strip()
+                if line.startswith("Done. Added "):
+                    try:
+                        added = int(line.split("Added ")[1].split(" ")[0])
+                    except (IndexError, ValueError):
+                        pass
+                elif m := _FETCH_PROGRESS_RE.match(line):
+                    seen = publish_new_mentions(db, seen)
+                    db.rollback()
+                    done, total = int(m.group(1)), int(m.group(2))
+                    _update_fetch_status(
+                        contacts_done=done, contacts_total=total, message=f"Fetched {done}/{total} contacts...",
+                    )
+            proc.wait()
         finally:
-            db.close()
+            timer.cancel()
+        if proc.returncode < 0:
+            raise RuntimeError("Fetch stopped after 10 minutes.")
+        publish_new_mentions(db, seen)
 
-        with _job_results_lock:
-            _fetch_status.update({
-                "status": "complete",
-                "completed_at": datetime.now(UTC).isoformat(),
-                "mentions_added": added,
-                "message": f"Done. {added} new mentions added." if added is not None else "Done.",
-            })
+        # Run post-fetch jobs (connection discovery + scoring)
+        if discover_from_mentions(db).get("added"):
+            run_update_layout(db.get_bind())
+        score_all_mentions(db)
+
+        _update_fetch_status(
+            status="complete",
+            completed_at=datetime.now(UTC).isoformat(),
+            mentions_added=added,
+            message=f"Done. {added} new mentions added." if added is not None else "Done.",
+        )
     except Exception as e:
-        from datetime import UTC, datetime
-        with _job_results_lock:
-            _fetch_status.update({"status": "error", "completed_at": datetime.now(UTC).isoformat(), "message": str(e)})
+        _update_fetch_status(status="error", completed_at=datetime.now(UTC).isoformat(), message=str(e))
+    finally:
+        db.close()
 
 
 @router.post("/fetch-mentions")
 async def trigger_fetch_mentions(background_tasks: BackgroundTasks):
-    """Trigger mention fetch now (runs in background)."""
+    """Fetch what is left of today's rotation plan now (runs in background, within the daily quotas)."""
     background_tasks.add_task(_run_fetch_mentions_tracked)
     return {"status": "started", "message": "Fetching mentions in background. Check /api/mentions/fetch/status for progress."}
 
@@ -119,7 +186,10 @@ def _run_discover_all():
     db = SessionLocal()
     try:
         api_key = settings.newsapi_key
-        return discover_all(db, api_key, max_contacts=15, max_pairs_per_contact=5)
+        result = discover_all(db, api_key, max_contacts=15, max_pairs_per_contact=5)
+        if result.get("from_mentions") or result.get("from_search"):
+            run_update_layout(db.get_bind())
+        return result
     finally:
         db.close()
 
@@ -156,9 +226,11 @@ def _run_bulk_enrich(max_contacts: int):
         if not api_key:
             result = {"attempted": 0, "found": 0, "skipped": 0, "errors": 0, "message": "HUNTER_API_KEY not configured."}
         else:
-            result = enrich_bulk(db, api_key, max_contacts=max_contacts)
-        with _job_results_lock:
-            _job_results["enrich"] = result
+            result = enrich_bulk(
+                db, api_key, max_contacts=max_contacts,
+                progress=lambda stats: publish_job("enrich", {**stats, "status": "running"}),
+            )
+        _set_job_result("enrich", result)
     finally:
         db.close()
 
@@ -170,8 +242,7 @@ async def trigger_bulk_enrich(body: BulkEnrichBody, background_tasks: Background
         raise HTTPException(status_code=503, detail="HUNTER_API_KEY not configured. Add to .env for enrichment.")
     if body.max_contacts < 1 or body.max_contacts > 200:
         raise HTTPException(status_code=400, detail="max_contacts must be 1–200")
-    with _job_results_lock:
-        _job_results["enrich"] = None
+    _set_job_result("enrich", None)
     background_tasks.add_task(_run_bulk_enrich, body.max_contacts)
     return {"status": "started", "message": f"Enriching up to {body.max_contacts} contacts in background (1/sec). Check status with GET /api/jobs/enrich-status."}
 
@@ -207,9 +278,9 @@ def _run_media_fetch(days: int, max_contacts: int, max_per_source: int, contact_
             serpapi_key=settings.serpapi_key,
             max_per_source=max_per_source,
             max_contacts=max_contacts,
+            progress=lambda stats: publish_job("media", {**stats, "status": "running"}),
         )
-        with _job_results_lock:
-            _job_results["media"] = result
+        _set_job_result("media", result)
     finally:
         db.close()
 
@@ -226,8 +297,7 @@ async def trigger_fetch_media(body: MediaFetchBody, background_tasks: Background
             status_code=503,
             detail="No media API keys configured. Add LISTENNOTES_API_KEY, YOUTUBE_API_KEY, or SERPAPI_KEY to .env.",
         )
-    with _job_results_lock:
-        _job_results["media"] = None
+    _set_job_result("media", None)
     background_tasks.add_task(_run_media_fetch, body.days, body.max_contacts, body.max_per_source, body.contact_ids)
     sources = []
     if settings.listennotes_api_key:
@@ -290,3 +360,263 @@ async def trigger_auto_tag_warm_intros(background_tasks: BackgroundTasks):
             db.close()
     background_tasks.add_task(_run)
     return {"status": "started", "message": "Auto-tagging warm intro contacts in background."}
+
+
+# --- Network centrality (also runs nightly via scheduler) ---
+
+def _run_compute_centrality():
+    db = SessionLocal()
+    try:
+        result = compute_centrality(db)
+        _set_job_result("centrality", result)
+    finally:
+        db.close()
+
+
+@router.post("/compute-centrality")
+async def trigger_compute_centrality(background_tasks: BackgroundTasks):
+    """Recompute degree, PageRank and approximate betweenness for every contact now."""
+    _set_job_result("centrality", None)
+    background_tasks.add_task(_run_compute_centrality)
+    return {"status": "started", "message": "Computing network centrality in background. Check GET /api/jobs/centrality-status."}
+
+
+@router.get("/centrality-status")
+async def get_centrality_status():
+    """Check the result of the latest centrality run."""
+    with _job_results_lock:
+        result = _job_results["centrality"]
+    if result is None:
+        return {"status": "running", "message": "Centrality computation in progress or not started yet."}
+    return {"status": "complete", **result}
+
+
+def _run_detect_communities():
+    db = SessionLocal()
+    try:
+        result = detect_communities(db)
+        _set_job_result("communities", result)
+    finally:
+        db.close()
+
+
+@router.post("/detect-communities")
+async def trigger_detect_communities(background_tasks: BackgroundTasks):
+    """Cluster contacts into communities (label propagation) for the collapsed relationship map."""
+    _set_job_result("communities", None)
+    background_tasks.add_task(_run_detect_communities)
+    return {"status": "started", "message": "Detecting communities in background. Check GET /api/jobs/communities-status."}
+
+
+@router.get("/communities-status")
+async def get_communities_status():
+    """Check the result of the latest community detection run."""
+    with _job_results_lock:
+        result = _job_results["communities"]
+    if result is None:
+        return {"status": "running", "message": "Community detection in progress or not started yet."}
+    return {"status": "complete", **result}
+
+
+def run_update_layout(bind, full: bool = False):
+    """Every layout refresh the API starts goes through here (this job, new connections and
+    merges in app.api.contacts, connection discovery), so layout-status and the "layout"
+    event report each run.
+
+    While a run is in progress, further calls return at once and the running call does one
+    more pass afterwards (full if any of them asked for it), so adding several connections
+    in a row never starts overlapping layout writes.
+    """
+    with _layout_lock:
+        if _layout_state["running"]:
+            _layout_state["rerun"] = True
+            _layout_state["full"] = _layout_state["full"] or full
+            return
+        _layout_state["running"] = True
+    try:
+        while True:
+            db = Session(bind=bind)
+            try:
+                result = update_layout(db, full=full)
+                _set_job_result("layout", result)
+            finally:
+                db.close()
+            with _layout_lock:
+                if not _layout_state["rerun"]:
+                    break
+                full = _layout_state["full"]
+                _layout_state["rerun"] = _layout_state["full"] = False
+    finally:
+        with _layout_lock:
+            _layout_state.update(running=False, rerun=False, full=False)
+
+
+@router.post("/update-layout")
+async def trigger_update_layout(background_tasks: BackgroundTasks, full: bool = False, db: Session = Depends(get_db)):
+    """Refresh cached relationship-map coordinates (incremental unless full=true)."""
+    _set_job_result("layout", None)
+    background_tasks.add_task(run_update_layout, db.get_bind(), full)
+    return {"status": "started", "message": "Updating map layout in background. Check GET /api/jobs/layout-status."}
+
+
+@router.get("/layout-status")
+async def get_layout_status():
+    """Check the result of the latest layout run."""
+    with _job_results_lock:
+        result = _job_results["layout"]
+    if result is None:
+        return {"status": "running", "message": "Layout in progress or not started yet."}
+    return {"status": "complete", **result}
+
+
+# --- Duplicate contacts ---
+
+def _run_find_duplicates(bind):
+    db = Session(bind=bind)
+    try:
+        result = find_duplicates(db)
+        _set_job_result("duplicates", result)
+    finally:
+        db.close()
+
+
+@router.post("/find-duplicates")
+async def trigger_find_duplicates(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Group likely duplicate contacts (shared name keys, see app.duplicates) across the whole table."""
+    _set_job_result("duplicates", None)
+    background_tasks.add_task(_run_find_duplicates, db.get_bind())
+    return {"status": "started", "message": "Finding duplicate contacts in background. Check GET /api/jobs/duplicates-status."}
+
+
+@router.get("/duplicates-status")
+async def get_duplicates_status():
+    """Check the result of the latest duplicate scan."""
+    with _job_results_lock:
+        result = _job_results["duplicates"]
+    if result is None:
+        return {"status": "running", "message": "Duplicate scan in progress or not started yet."}
+    return {"status": "complete", **result}
+
+
+# --- Mention retention (also runs nightly via scheduler) ---
+
+def _run_archive_mentions(bind):
+    db = Session(bind=bind)
+    try:
+        _set_job_result("archive", archive_mentions(db))
+    finally:
+        db.close()
+
+
+@router.post("/archive-mentions")
+async def trigger_archive_mentions(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Move old, dismissed and low-score mentions to the compressed archive (app.retention)."""
+    _set_job_result("archive", None)
+    background_tasks.add_task(_run_archive_mentions, db.get_bind())
+    return {"status": "started", "message": "Archiving mentions in background. Check GET /api/jobs/archive-status."}
+
+
+@router.get("/archive-status")
+async def get_archive_status():
+    """Check the result of the latest archive run."""
+    with _job_results_lock:
+        result = _job_results["archive"]
+    if result is None:
+        return {"status": "running", "message": "Archiving in progress or not started yet."}
+    return {"status": "complete", **result}
+
+
+# --- CSV import (large files; same import as POST /api/contacts/import-csv) ---
+
+_UPLOAD_CHUNK_BYTES = 1 << 20
+
+
+def _run_import_csv(bind, path: str):
+    """Background: stream the spooled upload into the database (same engine as the request)."""
+    db = Session(bind=bind)
+    size = os.path.getsize(path) or 1
+    try:
+        with open(path, "rb") as raw:
+
+            def progress(result: dict):
+                with _job_results_lock:
+                    _import_status.update({
+                        **result,
+                        "skipped_rows": list(result["skipped_rows"]),
+                        "created_names": list(result["created_names"]),
+                        "updated_names": list(result["updated_names"]),
+                        "possible_duplicates": list(result["possible_duplicates"]),
+                        "percent": round(min(100.0, 100 * raw.tell() / size), 1),
+                        "message": f"Imported {result['rows']} rows so far...",
+                    })
+
+            lines = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            result = import_contacts_csv(db, lines, progress=progress)
+        with _job_results_lock:
+            _import_status.update({
+                **result,
+                "status": "complete",
+                "completed_at": datetime.now(UTC).isoformat(),
+                "percent": 100.0,
+                "message": f"Done. {result['created']} created, {result['updated']} updated, {result['skipped']} skipped.",
+            })
+    except Exception as e:
+        db.rollback()
+        with _job_results_lock:
+            _import_status.update({"status": "error", "completed_at": datetime.now(UTC).isoformat(), "message": str(e)})
+    finally:
+        db.close()
+        os.unlink(path)
+
+
+@router.post("/import-csv")
+async def trigger_import_csv(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """Import a contacts CSV of any size in the background, committing every 1000 rows.
+    Track progress and the row-level error report with GET /api/jobs/import-csv-status."""
+    if not file.filename or not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="File must be a .csv file")
+    with _job_results_lock:
+        if _import_status["status"] == "running":
+            raise HTTPException(status_code=409, detail="A CSV import is already running")
+        _import_status.clear()
+        _import_status.update({
+            "status": "running",
+            "filename": file.filename,
+            "started_at": datetime.now(UTC).isoformat(),
+            "completed_at": None,
+            "rows": 0,
+            "percent": 0.0,
+            "message": "Receiving upload...",
+        })
+
+    # The upload is gone once the request ends: spool it to disk in chunks, then check the header
+    tmp = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+    try:
+        with tmp:
+            while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+                tmp.write(chunk)
+        with open(tmp.name, encoding="utf-8-sig", newline="") as f:
+            check_csv_header(f)
+    except Exception as exc:
+        os.unlink(tmp.name)
+        with _job_results_lock:
+            _import_status.update({"status": "error", "completed_at": datetime.now(UTC).isoformat(), "message": str(exc)})
+        if isinstance(exc, CSVImportError):
+            raise HTTPException(status_code=400, detail=str(exc))
+        raise
+
+    with _job_results_lock:
+        _import_status["message"] = "Import in progress..."
+    background_tasks.add_task(_run_import_csv, db.get_bind(), tmp.name)
+    return {"status": "started", "message": f"Importing {file.filename} in background. Check GET /api/jobs/import-csv-status."}
+
+
+@router.get("/import-csv-status")
+async def get_import_csv_status():
+    """Progress of the latest background CSV import: counts, percent of file read, skipped rows with reasons."""
+    with _job_results_lock:
+        return dict(_import_status)
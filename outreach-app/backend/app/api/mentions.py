@@ -1,12 +1,17 @@
 """Mentions API endpoints."""
-from datetime import UTC, datetime, timedelta
-from fastapi import APIRouter, Depends, Query, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, Query, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import and_, func, or_
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
+from app.columnar import columnar_response
 from app.database import get_db
 from app.models import Mention
+from app.pagination import keyset_page
+from app.retention import mention_history, search_archive
+from app.search import mention_search
+from app.serializers import mention_dict, recent_filter
 
 router = APIRouter()
 
@@ -25,61 +30,108 @@ def list_mentions(
     max_per_contact: int = Query(2, ge=1, le=5, description="Max mentions per contact (1-2 typical)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Set false to skip the COUNT query (total = null)"),
+    accept: str | None = Header(None),
     db: Session = Depends(get_db),
 ):
-    """List recent mentions. Limits to max_per_contact per person on dashboard (SQL)."""
-    cutoff = datetime.now(UTC) - timedelta(days=days)
-    date_filter = or_(
-        Mention.published_at >= cutoff,
-        and_(Mention.published_at.is_(None), Mention.created_at >= cutoff),
-    )
+    """List recent mentions, newest first. Limits to max_per_contact per person on dashboard (SQL).
+    Follow next_cursor for constant-cost paging (see app.pagination).
+    Send Accept: application/vnd.outreach.columnar+json (or application/x-msgpack) for columnar output."""
+    date_filter = recent_filter(days)
 
     if contact_id:
         # Single contact: no per-contact limit, fetch all for that contact
-        query = (
-            db.query(Mention)
-            .options(joinedload(Mention.contact))
-            .filter(date_filter, Mention.contact_id == contact_id, Mention.dismissed == 0)
-            .order_by(Mention.published_at.desc().nullslast())
-        )
-        total = query.count()
-        mentions = query.offset(skip).limit(limit).all()
+        query = db.query(Mention).filter(date_filter, Mention.contact_id == contact_id, Mention.dismissed == 0)
+        total = query.count() if include_total else None
     else:
         # Dashboard: limit per contact in SQL using ROW_NUMBER
         rn = func.row_number().over(
             partition_by=Mention.contact_id,
-            order_by=Mention.published_at.desc().nullslast(),
+            order_by=(Mention.published_at.desc().nullslast(), Mention.id.desc()),
         ).label("rn")
         subq = db.query(Mention, rn).filter(date_filter, Mention.dismissed == 0).subquery()
-        mention_alias = db.query(Mention).join(
+        query = db.query(Mention).join(
             subq, Mention.id == subq.c.id
         ).filter(subq.c.rn <= max_per_contact)
-        total = db.query(func.count()).select_from(subq).filter(
+        total = (db.query(func.count()).select_from(subq).filter(
             subq.c.rn <= max_per_contact
-        ).scalar() or 0
-        mentions = (
-            mention_alias.options(joinedload(Mention.contact))
-            .order_by(Mention.published_at.desc().nullslast())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-    result = []
-    for m in mentions:
-        result.append({
-            "id": m.id,
-            "contact_id": m.contact_id,
-            "contact_name": m.contact.name if m.contact else None,
-            "source_type": m.source_type,
-            "source_url": m.source_url,
-            "title": m.title,
-            "snippet": m.snippet,
-            "published_at": m.published_at.isoformat() if m.published_at else None,
-            "created_at": m.created_at.isoformat() if m.created_at else None,
-            "relevance_score": m.relevance_score,
-        })
-    return {"total": total, "mentions": result, "skip": skip, "limit": limit}
+        ).scalar() or 0) if include_total else None
+    mentions, next_cursor = keyset_page(
+        query.options(joinedload(Mention.contact)),
+        Mention.published_at, Mention.id, cursor, limit,
+        key_type=datetime, descending=True, skip=skip,
+    )
+
+    result = [mention_dict(m) for m in mentions]
+    return columnar_response(
+        {"total": total, "mentions": result, "skip": skip, "limit": limit, "next_cursor": next_cursor},
+        ("mentions",), accept,
+        interned={"mentions": ("contact_name", "source_type")},
+    )
+
+
+@router.get("/search")
+def search_mentions(
+    q: str = Query(..., min_length=1, description="Keywords in title/snippet; each word matched as a prefix"),
+    days: int = Query(7, ge=1, le=365, description="Mentions from last N days"),
+    contact_id: int | None = Query(None, description="Filter by contact"),
+    include_dismissed: bool = Query(False, description="Include mentions dismissed as 'not this person'"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    accept: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Keyword search over mention titles and snippets, best matches first (then newest).
+    Uses the full-text index (app.search); falls back to ILIKE where it is unavailable."""
+    query = db.query(Mention).filter(recent_filter(days))
+    if contact_id:
+        query = query.filter(Mention.contact_id == contact_id)
+    if not include_dismissed:
+        query = query.filter(Mention.dismissed == 0)
+
+    searched = mention_search(query, q)
+    if searched is not None:
+        query, rank = searched
+        order_by = [rank, Mention.published_at.desc().nullslast(), Mention.id.desc()]
+    else:
+        query = query.filter(Mention.title.ilike(f"%{q}%") | Mention.snippet.ilike(f"%{q}%"))
+        order_by = [Mention.published_at.desc().nullslast(), Mention.id.desc()]
+
+    total = query.count()
+    mentions = query.options(joinedload(Mention.contact)).order_by(*order_by).offset(skip).limit(limit).all()
+    return columnar_response(
+        {"q": q, "total": total, "mentions": [mention_dict(m) for m in mentions], "skip": skip, "limit": limit},
+        ("mentions",), accept,
+        interned={"mentions": ("contact_name", "source_type")},
+    )
+
+
+@router.get("/archive/search")
+def search_archived_mentions(
+    q: str = Query(..., min_length=1, description="Keywords in title/snippet; each word matched as a prefix"),
+    days: int | None = Query(None, ge=1, description="Mentions from last N days (default: all archived)"),
+    contact_id: int | None = Query(None, description="Filter by contact"),
+    include_dismissed: bool = Query(False, description="Include mentions dismissed as 'not this person'"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Keyword search over mentions moved out by the retention job (app.retention).
+    Slower than /search: archive chunks are decompressed and scanned on every call."""
+    result = search_archive(db, q, days=days, contact_id=contact_id, include_dismissed=include_dismissed,
+                            skip=skip, limit=limit)
+    return {"q": q, **result, "skip": skip, "limit": limit}
+
+
+@router.get("/history")
+def get_mention_history(
+    contact_id: int | None = Query(None, description="Filter by contact"),
+    months: int = Query(12, ge=1, le=120),
+    db: Session = Depends(get_db),
+):
+    """Mentions per month, counting archived mentions through their rollups."""
+    return {"contact_id": contact_id, "months": mention_history(db, contact_id=contact_id, months=months)}
 
 
 class DismissMentionRequest(BaseModel):
@@ -110,15 +162,4 @@ def get_mention(mention_id: int, db: Session = Depends(get_db)):
     )
     if not mention:
         raise HTTPException(status_code=404, detail="Mention not found")
-    return {
-        "id": mention.id,
-        "contact_id": mention.contact_id,
-        "contact_name": mention.contact.name if mention.contact else None,
-        "source_type": mention.source_type,
-        "source_url": mention.source_url,
-        "title": mention.title,
-        "snippet": mention.snippet,
-        "published_at": mention.published_at.isoformat() if mention.published_at else None,
-        "created_at": mention.created_at.isoformat() if mention.created_at else None,
-        "relevance_score": mention.relevance_score,
-    }
+    return mention_dict(mention)
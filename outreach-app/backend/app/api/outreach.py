@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import OutreachLog, Contact
+from app.pagination import keyset_page
+from app.serializers import outreach_dict
 
 router = APIRouter()
 
@@ -25,31 +27,25 @@ def list_outreach(
     contact_id: int | None = Query(None, description="Filter by contact"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Set false to skip the COUNT query (total = null)"),
     db: Session = Depends(get_db),
 ):
-    """List outreach log entries."""
+    """List outreach log entries, most recently sent first. Follow next_cursor for constant-cost paging."""
     query = db.query(OutreachLog)
     if contact_id:
         query = query.filter(OutreachLog.contact_id == contact_id)
-    total = query.count()
-    entries = query.order_by(OutreachLog.sent_at.desc().nullslast()).offset(skip).limit(limit).all()
+    total = query.count() if include_total else None
+    entries, next_cursor = keyset_page(
+        query, OutreachLog.sent_at, OutreachLog.id, cursor, limit,
+        key_type=datetime, descending=True, skip=skip,
+    )
     return {
         "total": total,
-        "entries": [
-            {
-                "id": e.id,
-                "contact_id": e.contact_id,
-                "method": e.method,
-                "subject": e.subject,
-                "content": e.content,
-                "sent_at": e.sent_at.isoformat() if e.sent_at else None,
-                "response_status": e.response_status,
-                "created_at": e.created_at.isoformat() if e.created_at else None,
-            }
-            for e in entries
-        ],
+        "entries": [outreach_dict(e) for e in entries],
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
     }
 
 
@@ -1,38 +1,277 @@
 """Relationship map: all contacts as nodes, all contact_connections as edges."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from collections import Counter
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.columnar import COLUMNAR_JSON, MSGPACK, columnar_response, negotiate
 from app.database import get_db
-from app.models import Contact, ContactConnection
+from app.graph_changes import changes_since, current_graph_version
+from app.graph_metrics import ego_network, serialize_centrality
+from app.models import Contact, ContactConnection, ContactGraphMetrics
 
 router = APIRouter()
 
 
+def _node(c: Contact, metrics: ContactGraphMetrics | None) -> dict:
+    return {
+        "id": c.id,
+        "name": c.name,
+        "category": c.category,
+        "relationship_stage": c.relationship_stage,
+        "community_id": metrics.community_id if metrics else None,
+        "x": metrics.layout_x if metrics else None,
+        "y": metrics.layout_y if metrics else None,
+        "centrality": serialize_centrality(metrics),
+    }
+
+
+def _link(c: ContactConnection) -> dict:
+    return {
+        "id": c.id,
+        "source_id": c.contact_id,
+        "target_id": c.other_contact_id,
+        "relationship_type": c.relationship_type,
+    }
+
+
+def _collapsed_map(db: Session) -> dict:
+    """One super-node per community plus weighted links between communities, all aggregated in SQL."""
+    community = func.coalesce(ContactGraphMetrics.community_id, Contact.id)
+    rn = func.row_number().over(
+        partition_by=community,
+        order_by=(ContactGraphMetrics.pagerank.desc().nullslast(), Contact.id),
+    ).label("rn")
+    size = func.count().over(partition_by=community).label("size")
+    ranked = (
+        db.query(community.label("community_id"), Contact.name, Contact.category, size, rn)
+        .select_from(Contact)
+        .outerjoin(ContactGraphMetrics, ContactGraphMetrics.contact_id == Contact.id)
+        .subquery()
+    )
+    super_nodes = [
+        {
+            "id": r.community_id,
+            "size": r.size,
+            "label": r.name,  # Most central member
+            "category": r.category,
+        }
+        for r in db.query(ranked).filter(ranked.c.rn == 1).order_by(ranked.c.size.desc()).all()
+    ]
+
+    # Inter-community edges; contacts not yet clustered are their own community
+    ma = aliased(ContactGraphMetrics)
+    mb = aliased(ContactGraphMetrics)
+    ca = func.coalesce(ma.community_id, ContactConnection.contact_id)
+    cb = func.coalesce(mb.community_id, ContactConnection.other_contact_id)
+    pairs = (
+        db.query(ca, cb, func.count())
+        .select_from(ContactConnection)
+        .outerjoin(ma, ma.contact_id == ContactConnection.contact_id)
+        .outerjoin(mb, mb.contact_id == ContactConnection.other_contact_id)
+        .filter(ca != cb)
+        .group_by(ca, cb)
+        .all()
+    )
+    weights: Counter[tuple[int, int]] = Counter()
+    for a, b, count in pairs:
+        weights[(min(a, b), max(a, b))] += count
+    super_links = [
+        {"source_id": a, "target_id": b, "weight": w}
+        for (a, b), w in sorted(weights.items())
+    ]
+    return {"view": "collapsed", "nodes": super_nodes, "links": super_links}
+
+
+MAP_INTERNED = {
+    "nodes": ("category", "relationship_stage"),
+    "links": ("relationship_type",),
+}
+
+
+# ETag suffix per negotiated media type (None = plain JSON); each encoding is its own representation
+_ETAG_SUFFIX = {None: "", COLUMNAR_JSON: "-columnar", MSGPACK: "-msgpack"}
+
+
+def _etag(version: int, view: str, media_type: str | None) -> str:
+    return f'W/"graph-{version}-{view}{_ETAG_SUFFIX[media_type]}"'
+
+
+def _delta(db: Session, version: int, since: int, changed: dict[str, set[int]]) -> dict:
+    """Current state of contacts/connections changed after `since`; ids no longer present are removed."""
+    contact_ids = changed.get("contact", set())
+    connection_ids = changed.get("connection", set())
+    rows = (
+        db.query(Contact, ContactGraphMetrics)
+        .outerjoin(ContactGraphMetrics, ContactGraphMetrics.contact_id == Contact.id)
+        .filter(Contact.id.in_(contact_ids))
+        .order_by(Contact.list_number)
+        .all()
+    ) if contact_ids else []
+    connections = (
+        db.query(ContactConnection).filter(ContactConnection.id.in_(connection_ids)).all()
+    ) if connection_ids else []
+    return {
+        "version": version,
+        "since": since,
+        "nodes": [_node(c, m) for c, m in rows],
+        "links": [_link(c) for c in connections],
+        "removed_node_ids": sorted(contact_ids - {c.id for c, _ in rows}),
+        "removed_link_ids": sorted(connection_ids - {c.id for c in connections}),
+    }
+
+
 @router.get("")
-async def get_relationship_map(db: Session = Depends(get_db)):
+async def get_relationship_map(
+    view: str = Query("full", pattern="^(full|collapsed)$", description="full = every contact; collapsed = one node per community"),
+    since: int | None = Query(None, ge=0, description="Graph version the client already has; return only what changed"),
+    if_none_match: str | None = Header(None),
+    accept: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
     """
     Return the full graph for the relationship map.
     Nodes = all contacts; links = all contact_connections.
     Stays in sync: add/remove names (Names file + seed) or connections (contact detail) and refetch.
+    Nodes carry cached layout coordinates (x, y; null until laid out) so the client can skip its
+    own force simulation.
+
+    view=collapsed returns one super-node per community (from the community detection job)
+    with connection counts between communities; expand one via /communities/{community_id}.
+
+    Every response carries the graph version (also as a weak ETag). Send it back as
+    If-None-Match to get 304 when nothing changed, or as since= (view=full) to get only
+    changed nodes/links plus removed ids. If the change log no longer reaches back to
+    `since`, the full graph is returned with "full": true.
+
+    Send Accept: application/vnd.outreach.columnar+json (or application/x-msgpack) to get
+    nodes and links as parallel arrays (see app.columnar).
     """
+    version = current_graph_version(db)
+    etag = _etag(version, view, negotiate(accept))
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+
+    def respond(payload: dict):
+        return columnar_response(payload, ("nodes", "links"), accept, interned=MAP_INTERNED, headers={"ETag": etag})
+
+    if view == "collapsed":
+        return respond({**_collapsed_map(db), "version": version})
+
+    if since is not None:
+        changed = changes_since(db, since)
+        if changed is not None:
+            return respond({**_delta(db, version, since, changed), "full": False})
+
     contacts = db.query(Contact).order_by(Contact.list_number).all()
     connections = db.query(ContactConnection).all()
+    metrics = {m.contact_id: m for m in db.query(ContactGraphMetrics).all()}
 
-    nodes = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "category": c.category,
-            "relationship_stage": c.relationship_stage,
-        }
-        for c in contacts
-    ]
-    links = [
-        {
-            "source_id": c.contact_id,
-            "target_id": c.other_contact_id,
-            "relationship_type": c.relationship_type,
-        }
+    nodes = [_node(c, metrics.get(c.id)) for c in contacts]
+    links = [_link(c) for c in connections]
+    result = {"version": version, "nodes": nodes, "links": links}
+    if since is not None:
+        result["full"] = True
+    return respond(result)
+
+
+@router.get("/communities/{community_id}")
+async def get_community(community_id: int, db: Session = Depends(get_db)):
+    """Expand one community: its members, the links among them, and link counts to other communities."""
+    rows = (
+        db.query(Contact, ContactGraphMetrics)
+        .outerjoin(ContactGraphMetrics, ContactGraphMetrics.contact_id == Contact.id)
+        .filter(
+            or_(
+                ContactGraphMetrics.community_id == community_id,
+                # Not yet clustered: a contact is its own community
+                (ContactGraphMetrics.community_id.is_(None) & (Contact.id == community_id)),
+            )
+        )
+        .order_by(Contact.list_number)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Community not found")
+    member_ids = [c.id for c, _ in rows]
+    members = set(member_ids)
+
+    connections = (
+        db.query(ContactConnection)
+        .filter(
+            or_(
+                ContactConnection.contact_id.in_(member_ids),
+                ContactConnection.other_contact_id.in_(member_ids),
+            )
+        )
+        .all()
+    )
+    internal = [c for c in connections if c.contact_id in members and c.other_contact_id in members]
+    outside_ids = {
+        (c.other_contact_id if c.contact_id in members else c.contact_id)
         for c in connections
-    ]
-    return {"nodes": nodes, "links": links}
+    } - members
+    outside_community = {
+        m.contact_id: m.community_id
+        for m in db.query(ContactGraphMetrics).filter(ContactGraphMetrics.contact_id.in_(outside_ids)).all()
+    } if outside_ids else {}
+    external: Counter[int] = Counter()
+    for c in connections:
+        if c.contact_id in members and c.other_contact_id in members:
+            continue
+        other = c.other_contact_id if c.contact_id in members else c.contact_id
+        external[outside_community.get(other) or other] += 1
+
+    return {
+        "community_id": community_id,
+        "nodes": [_node(c, m) for c, m in rows],
+        "links": [_link(c) for c in internal],
+        "external_links": [
+            {"community_id": cid, "weight": w} for cid, w in external.most_common()
+        ],
+    }
+
+
+@router.get("/ego/{contact_id}")
+async def get_ego_network(
+    contact_id: int,
+    hops: int = Query(2, ge=1, le=3, description="Connection hops from the contact"),
+    max_nodes: int = Query(100, ge=2, le=1000, description="Cap on returned contacts; strongest connections kept first"),
+    accept: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    The neighborhood around one contact, for ContactDetail: contacts within `hops`
+    connections (each node has its "hop" distance) and all links among them.
+    "truncated" is true when max_nodes cut the neighborhood short.
+    """
+    if db.get(Contact, contact_id) is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    hop_of, truncated = ego_network(db, contact_id, hops=hops, max_nodes=max_nodes)
+    ids = list(hop_of)
+    rows = (
+        db.query(Contact, ContactGraphMetrics)
+        .outerjoin(ContactGraphMetrics, ContactGraphMetrics.contact_id == Contact.id)
+        .filter(Contact.id.in_(ids))
+        .all()
+    )
+    connections = (
+        db.query(ContactConnection)
+        .filter(ContactConnection.contact_id.in_(ids), ContactConnection.other_contact_id.in_(ids))
+        .all()
+    )
+    nodes = sorted(
+        ({**_node(c, m), "hop": hop_of[c.id]} for c, m in rows),
+        key=lambda n: (n["hop"], n["id"]),
+    )
+    return columnar_response(
+        {
+            "center_id": contact_id,
+            "hops": hops,
+            "truncated": truncated,
+            "nodes": nodes,
+            "links": [_link(c) for c in connections],
+        },
+        ("nodes", "links"), accept, interned=MAP_INTERNED,
+    )
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
 from app.models import Contact, Mention, ReplyDraft
+from app.serializers import draft_dict
 
 router = APIRouter()
 
@@ -127,25 +128,7 @@ def list_drafts(
         query = query.filter(ReplyDraft.status == status)
     drafts = query.order_by(ReplyDraft.created_at.desc()).all()
 
-    results = []
-    for d in drafts:
-        themes = []
-        if d.themes:
-            try:
-                themes = json.loads(d.themes)
-            except json.JSONDecodeError:
-                pass
-        results.append({
-            "id": d.id,
-            "contact_id": d.contact_id,
-            "contact_name": d.contact.name if d.contact else None,
-            "mention_id": d.mention_id,
-            "mention_title": d.mention.title if d.mention else None,
-            "reply_text": d.reply_text,
-            "themes": themes,
-            "status": d.status,
-            "created_at": d.created_at.isoformat() if d.created_at else None,
-        })
+    results = [draft_dict(d) for d in drafts]
     return {"total": len(results), "drafts": results}
 
 
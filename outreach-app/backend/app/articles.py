@@ -0,0 +1,219 @@
+"""Shared articles: each fetched article is stored once and linked to every contact it mentions.
+
+Fetchers return items (source_type, source_url, title, snippet, published_at).
+ingest_articles() keys them by normalize_url(source_url): a known URL reuses
+its Article row, a new one is inserted once, and either way a lightweight
+Mention (article_id, contact_id, relevance_score) is added for the contact
+it was fetched for. New articles are also linked to every other contact
+whose full name appears in their title or snippet (ContactMatcher), so a
+co-mention is fetched, stored and scored as text once. Syndicated copies
+under other URLs are caught by text fingerprint (app.near_duplicates).
+
+Mentions stored before articles carry their own text; backfill_articles()
+moves it into articles (used by the migration).
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urlparse, urlunparse
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.duplicates import full_words, name_tokens
+from app.models import Article, Contact, Mention
+from app.near_duplicates import find_near_duplicate, fingerprint, index_fingerprint
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalize_url(url: str | None) -> str | None:
+    """Canonical article key: scheme, host and path only (no query, fragment or trailing slash)."""
+    if not url or not url.strip():
+        return None
+    try:
+        p = urlparse(url.strip())
+    except ValueError:
+        return None
+    path = p.path.rstrip("/") if p.path != "/" else ""
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), path, "", "", ""))
+
+
+def parse_published(value) -> datetime | None:
+    """published_at from a fetcher: datetime, ISO string (trailing Z allowed) or None."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _text_words(text: str) -> list[str]:
+    s = "".join(c for c in unicodedata.normalize("NFKD", text or "") if not unicodedata.combining(c)).lower()
+    return _WORD_RE.findall(s)
+
+
+class ContactMatcher:
+    """Finds contacts named in a text: one dict lookup per run of consecutive words.
+
+    The whole name must appear, initials included: "John Smith" does not match a text
+    naming "John A. Smith", nor the other way round. Names need at least two full words
+    (a lone "Russell" matches nothing); honorifics and accents are ignored.
+    """
+
+    def __init__(self, contacts=()):
+        self.ids: dict[str, set[int]] = defaultdict(set)
+        self.max_words = 0
+        for cid, name in contacts:
+            tokens = name_tokens(name)
+            if len(full_words(tokens)) >= 2:
+                self.ids[" ".join(tokens)].add(cid)
+                self.max_words = max(self.max_words, len(tokens))
+
+    @classmethod
+    def from_db(cls, db: Session) -> "ContactMatcher":
+        return cls(db.execute(select(Contact.id, Contact.name)).all())
+
+    def match(self, text: str) -> set[int]:
+        words = _text_words(text)
+        found = set()
+        for i in range(len(words)):
+            for n in range(2, min(self.max_words, len(words) - i) + 1):
+                found |= self.ids.get(" ".join(words[i:i + n]), set())
+        return found
+
+
+def ingest_articles(db: Session, contact_id: int, items: list[dict], matcher: ContactMatcher | None = None) -> dict:
+    """Store items fetched for contact_id, each article once, linked to every matching contact.
+
+    An item whose text nearly matches a stored article (app.near_duplicates) is linked to
+    that article instead of being stored again. Items without a usable URL, and articles the
+    contact is already linked to, are skipped. Flushes so later calls in the same run see the
+    new rows. Does not commit.
+
+    Returns: {added, co_mentions, articles_created, near_duplicates, skipped}
+    """
+    stats = {"added": 0, "co_mentions": 0, "articles_created": 0, "near_duplicates": 0, "skipped": 0}
+    by_key: dict[str, dict] = {}
+    for item in items:
+        key = normalize_url(item.get("source_url"))
+        if not key or key in by_key:
+            stats["skipped"] += 1
+            continue
+        by_key[key] = item
+    if not by_key:
+        return stats
+
+    articles = {
+        a.url_key: a for a in db.execute(select(Article).where(Article.url_key.in_(list(by_key)))).scalars()
+    }
+    linked = set()
+    if articles:
+        linked = set(db.execute(
+            select(Mention.article_id, Mention.contact_id)
+            .where(Mention.article_id.in_([a.id for a in articles.values()]))
+        ).all())
+
+    for key, item in by_key.items():
+        article = articles.get(key)
+        others: set[int] = set()
+        if article is None:
+            fp = fingerprint(item.get("title"), item.get("snippet"))
+            copy_of = find_near_duplicate(db, fp)
+            if copy_of is not None:
+                # Same text under another URL (syndication): link the article already stored
+                article = db.get(Article, copy_of)
+                linked |= {
+                    (copy_of, cid)
+                    for cid in db.execute(select(Mention.contact_id).where(Mention.article_id == copy_of)).scalars()
+                }
+                stats["near_duplicates"] += 1
+            else:
+                article = Article(
+                    url_key=key,
+                    source_type=item["source_type"],
+                    source_url=item["source_url"],
+                    title=item.get("title"),
+                    snippet=item.get("snippet"),
+                    published_at=parse_published(item.get("published_at")),
+                )
+                db.add(article)
+                db.flush()
+                if fp is not None:
+                    index_fingerprint(db.connection(), article.id, fp)
+                stats["articles_created"] += 1
+                if matcher is not None:
+                    others = matcher.match(" ".join(filter(None, [article.title, article.snippet]))) - {contact_id}
+        if (article.id, contact_id) in linked:
+            stats["skipped"] += 1
+            continue
+        for cid in (contact_id, *sorted(others)):
+            if (article.id, cid) in linked:
+                continue
+            db.add(Mention(
+                article=article,
+                contact_id=cid,
+                source_type=article.source_type,
+                published_at=article.published_at,
+            ))
+            linked.add((article.id, cid))
+            stats["added" if cid == contact_id else "co_mentions"] += 1
+    db.flush()
+    return stats
+
+
+def backfill_articles(connection) -> int:
+    """Move the inline text of mentions that have a URL into shared articles. Does not commit.
+
+    Mentions with the same normalized URL share one article (text from the oldest).
+
+    Returns: number of mentions linked.
+    """
+    mentions = Mention.__table__
+    rows = connection.execute(
+        select(
+            mentions.c.id, mentions.c.source_url, mentions.c.title, mentions.c.snippet,
+            mentions.c.source_type, mentions.c.published_at,
+        )
+        .where(mentions.c.article_id.is_(None), mentions.c.source_url.is_not(None))
+        .order_by(mentions.c.id)
+    ).all()
+    groups: dict[str, list] = defaultdict(list)
+    for row in rows:
+        key = normalize_url(row.source_url)
+        if key:
+            groups[key].append(row)
+    if not groups:
+        return 0
+
+    article_ids = dict(connection.execute(
+        select(Article.url_key, Article.id).where(Article.url_key.in_(list(groups)))
+    ).all())
+    new = [
+        {
+            "url_key": key,
+            "source_type": first.source_type,
+            "source_url": first.source_url,
+            "title": first.title,
+            "snippet": first.snippet,
+            "published_at": first.published_at,
+        }
+        for key, (first, *_) in groups.items()
+        if key not in article_ids
+    ]
+    if new:
+        article_ids.update(
+            (key, aid) for aid, key in connection.execute(
+                insert(Article).returning(Article.id, Article.url_key, sort_by_parameter_order=True), new
+            )
+        )
+    links = [{"b_id": row.id, "b_article_id": article_ids[key]} for key, group in groups.items() for row in group]
+    connection.execute(
+        update(mentions)
+        .where(mentions.c.id == bindparam("b_id"))
+        .values(article_id=bindparam("b_article_id"), source_url=None, title=None, snippet=None),
+        links,
+    )
+    return len(links)
@@ -0,0 +1,95 @@
+"""Bulk contact edits: one set of changes applied to many contacts at once.
+
+Each change is a single set-based statement over the target ids (UPDATE for
+stage/rotation/alignment, INSERT ... SELECT / DELETE for tags; tags added
+by hand are marked as such on contacts that already had them). Work that
+depends on the changes runs once for the whole batch instead of once per
+contact:
+- warm intro tags of the neighbors of contacts that became (or stopped
+  being) intro sources,
+- stored contact method recommendations (they depend on stage),
+- the relationship map change log (stage is shown on the map).
+"""
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, String, delete, exists, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.graph_changes import record_graph_changes
+from app.models import Contact, ContactTag
+from app.recommendations import refresh_recommendations
+from app.warm_intros import WARM_INTRO_SOURCE_STAGES, neighbor_ids, sync_warm_intro_tags
+
+
+def bulk_update_contacts(
+    db: Session,
+    contact_ids: list[int],
+    relationship_stage: str | None = None,
+    in_mention_rotation: bool | None = None,
+    mission_alignment: float | None = None,
+    add_tags: list[str] | None = None,
+    remove_tags: list[str] | None = None,
+) -> dict:
+    """Apply the given changes to every contact in contact_ids.
+
+    relationship_stage "" clears the stage; None leaves a field unchanged.
+    Does not commit, so the caller decides the transaction boundary.
+
+    Returns: {matched, updated, tags_added, tags_removed, warm_intro_tags}
+    """
+    result = {"matched": len(contact_ids), "updated": 0, "tags_added": 0, "tags_removed": 0,
+              "warm_intro_tags": {"tagged": 0, "removed": 0}}
+    if not contact_ids:
+        return result
+
+    values = {}
+    flipped_sources = []
+    if relationship_stage is not None:
+        values["relationship_stage"] = relationship_stage or None
+        is_source = values["relationship_stage"] in WARM_INTRO_SOURCE_STAGES
+        was_source = Contact.relationship_stage.in_(WARM_INTRO_SOURCE_STAGES)
+        flipped_sources = db.execute(
+            select(Contact.id).where(
+                Contact.id.in_(contact_ids),
+                (~was_source | Contact.relationship_stage.is_(None)) if is_source else was_source,
+            )
+        ).scalars().all()
+    if in_mention_rotation is not None:
+        values["in_mention_rotation"] = 1 if in_mention_rotation else 0
+    if mission_alignment is not None:
+        values["mission_alignment"] = max(1.0, min(10.0, mission_alignment))
+        values["mission_alignment_manual"] = 1
+    if values:
+        result["updated"] = db.execute(
+            update(Contact).where(Contact.id.in_(contact_ids)).values(**values),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+
+    now = datetime.now(UTC)
+    for tag in dict.fromkeys(t.strip() for t in add_tags or [] if t.strip()):
+        already = select(ContactTag.id).where(ContactTag.contact_id == Contact.id, ContactTag.tag == tag)
+        to_tag = select(Contact.id, literal(tag, String), literal(now, DateTime)).where(
+            Contact.id.in_(contact_ids), ~exists(already)
+        )
+        result["tags_added"] += db.execute(
+            insert(ContactTag).from_select(["contact_id", "tag", "created_at"], to_tag)
+        ).rowcount or 0
+        db.execute(  # Chosen by hand now, as in add_tag: automatic re-tagging must not remove it
+            update(ContactTag)
+            .where(ContactTag.contact_id.in_(contact_ids), ContactTag.tag == tag, ContactTag.auto == 1)
+            .values(auto=0),
+            execution_options={"synchronize_session": False},
+        )
+    drop = [t.strip() for t in remove_tags or [] if t.strip()]
+    if drop:
+        result["tags_removed"] = db.execute(
+            delete(ContactTag).where(ContactTag.contact_id.in_(contact_ids), ContactTag.tag.in_(drop)),
+            execution_options={"synchronize_session": False},
+        ).rowcount or 0
+
+    if relationship_stage is not None:
+        if flipped_sources:
+            result["warm_intro_tags"] = sync_warm_intro_tags(db, neighbor_ids(db, flipped_sources))
+        refresh_recommendations(db, contact_ids)
+        record_graph_changes(db, "contact", contact_ids)
+    return result
@@ -0,0 +1,110 @@
+"""Opt-in columnar encoding for large list responses (relationship map, contacts, mentions).
+
+Row-oriented JSON repeats every key on every row. Clients that send
+
+    Accept: application/vnd.outreach.columnar+json   (columnar JSON)
+    Accept: application/x-msgpack                    (columnar MessagePack)
+
+get each list as parallel arrays instead:
+
+    {"length": 3,
+     "columns": {"id": [1, 2, 3], "category": [0, 1, 0], ...},
+     "dictionaries": {"category": ["Academic", "Policy"]}}
+
+Low-cardinality string fields (category, stage, ...) are interned: the column holds
+indexes into the field's dictionary (null stays null). Other response keys (total,
+skip, version, ...) are passed through unchanged. Anything else gets plain JSON.
+Every response from these URLs carries Vary: Accept.
+
+MessagePack is optional: without the msgpack package, clients asking for it get
+columnar JSON (the Content-Type says which).
+"""
+import json
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+COLUMNAR_JSON = "application/vnd.outreach.columnar+json"
+MSGPACK = "application/x-msgpack"
+
+
+def negotiate(accept: str | None) -> str | None:
+    """Columnar media type to serve for the Accept header, or None for plain JSON.
+
+    application/x-msgpack resolves to COLUMNAR_JSON when msgpack is not installed.
+    """
+    if not accept:
+        return None
+    requested = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+    if MSGPACK in requested:
+        return MSGPACK if msgpack is not None else COLUMNAR_JSON
+    if COLUMNAR_JSON in requested:
+        return COLUMNAR_JSON
+    return None
+
+
+def to_columns(rows: list[dict], interned: tuple[str, ...] = ()) -> dict:
+    """Transpose row dicts into parallel arrays, interning the given fields.
+
+    Returns: {length, columns, dictionaries}
+    """
+    fields = list(rows[0]) if rows else []
+    columns: dict[str, list] = {f: [row[f] for row in rows] for f in fields}
+    dictionaries: dict[str, list] = {}
+    for f in interned:
+        if f not in columns:
+            continue
+        index: dict = {}
+        codes = []
+        for value in columns[f]:
+            if value is None:
+                codes.append(None)
+                continue
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(index)
+            codes.append(code)
+        columns[f] = codes
+        dictionaries[f] = list(index)
+    return {"length": len(rows), "columns": columns, "dictionaries": dictionaries}
+
+
+def encode(payload: dict, media_type: str) -> bytes:
+    """Serialize an already-columnar payload as `media_type` (from negotiate())."""
+    if media_type == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def columnar_response(
+    payload: dict,
+    list_keys: tuple[str, ...],
+    accept: str | None,
+    interned: dict[str, tuple[str, ...]] | None = None,
+    headers: dict[str, str] | None = None,
+):
+    """Return `payload` as plain JSON or columnar, per the Accept header (always with Vary: Accept).
+
+    Args:
+        payload: The normal response dict.
+        list_keys: Keys of row lists to transpose (e.g. ("nodes", "links")).
+        accept: The request's Accept header.
+        interned: Per list key, the fields to intern.
+        headers: Extra response headers (e.g. ETag).
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    media_type = negotiate(accept)
+    if media_type is None:
+        return JSONResponse(jsonable_encoder(payload), headers=headers)
+    interned = interned or {}
+    body = {
+        key: to_columns(value, interned.get(key, ())) if key in list_keys else value
+        for key, value in payload.items()
+    }
+    return Response(content=encode(body, media_type), media_type=media_type, headers=headers)
@@ -26,6 +26,10 @@ class Settings(BaseSettings):
     serpapi_key: str | None = None  # SerpApi (speech/presentation search)
     serper_api_key: str | None = None  # Serper.dev (LinkedIn post search via Google)
 
+    # Daily request quotas of the mention fetch providers (one request per contact each)
+    newsapi_daily_quota: int = 100
+    serper_daily_quota: int = 100
+
     # LLM
     anthropic_model: str = "claude-haiku-4-5-20251001"
 
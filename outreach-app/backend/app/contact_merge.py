@@ -0,0 +1,234 @@
+"""Merge duplicate contacts into one.
+
+Everything the losers own is repointed to the winner with one UPDATE per
+table, inside the caller's transaction:
+- mentions, notes, outreach log, reply drafts: moved as-is (mentions of an
+  article or source_url the winner already has are dropped, their drafts
+  repointed); archived mention chunks and rollups likewise,
+- contact info and tags: moved, minus values the winner already has,
+- connections: both ends repointed, then self-links and repeated
+  (contact, other contact) pairs dropped.
+Blank winner fields are filled from the losers, then the losers are deleted.
+
+Derived data is refreshed for the winner only: its mission alignment (unless
+set by hand), recommendation, warm intro tags around it, and the relationship
+map change log. The losers' name
+keys (app.duplicates), graph metrics and rotation plan rows are deleted
+with them. The full-text indexes follow through their triggers, facet
+counts through the commit listener (app.facets).
+"""
+from sqlalchemy import and_, case, delete, exists, func, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.graph_changes import record_graph_changes
+from app.models import (
+    Contact,
+    ContactConnection,
+    ContactGraphMetrics,
+    ContactInfo,
+    ContactNameKey,
+    ContactTag,
+    Mention,
+    MentionArchiveChunk,
+    MentionRollup,
+    Note,
+    OutreachLog,
+    ReplyDraft,
+    RotationPlanEntry,
+)
+from app.recommendations import refresh_recommendations
+from app.warm_intros import ALIGNMENT_SOURCE_FIELDS, neighbor_ids, refresh_mission_alignments, sync_warm_intro_tags
+
+# Winner fields filled from the first loser (lowest id) that has a value
+MERGE_FILL_FIELDS = (
+    "list_number", "category", "subcategory", "role_org", "connection_to_solomon", "primary_interests",
+    "bio", "relationship_stage",
+)
+
+_SYNC = {"synchronize_session": False}
+
+
+class MergeError(ValueError):
+    """The merge request itself is invalid (unknown ids, winner among losers)."""
+
+
+def _fill_winner(db: Session, winner: Contact, loser_ids: list[int]) -> list[str]:
+    losers = db.execute(
+        select(Contact).where(Contact.id.in_(loser_ids)).order_by(Contact.id)
+    ).scalars().all()
+    values = {}
+    for field in MERGE_FILL_FIELDS:
+        if getattr(winner, field) is None:
+            found = next((getattr(c, field) for c in losers if getattr(c, field) is not None), None)
+            if found is not None:
+                values[field] = found
+    if any(c.in_mention_rotation for c in losers) and not winner.in_mention_rotation:
+        values["in_mention_rotation"] = 1
+    if any(c.enrichment_status == "enriched" for c in losers) and winner.enrichment_status != "enriched":
+        values["enrichment_status"] = "enriched"
+    # Mission alignment: the winner's manual score, else the first loser's manual score, else rescored
+    manual = next((c for c in losers if c.mission_alignment_manual and c.mission_alignment is not None), None)
+    if not winner.mission_alignment_manual and manual is not None:
+        values["mission_alignment"] = manual.mission_alignment
+        values["mission_alignment_manual"] = 1
+    if values:
+        db.execute(update(Contact).where(Contact.id == winner.id).values(**values), execution_options=_SYNC)
+    filled = {f for f in values if f != "mission_alignment_manual"}
+    rescore = filled & set(ALIGNMENT_SOURCE_FIELDS) or (
+        winner.mission_alignment is None and any(c.mission_alignment is not None for c in losers)
+    )
+    if rescore and refresh_mission_alignments(db, [winner.id]):
+        filled.add("mission_alignment")
+    return sorted(filled)
+
+
+def merge_contacts(db: Session, winner_id: int, loser_ids: list[int]) -> dict:
+    """Fold loser_ids into winner_id and delete them. Raises MergeError. Does not commit.
+
+    Returns: {winner_id, merged, fields_filled, moved: {mentions, notes, outreach, reply_drafts,
+              contact_info, tags, connections}, dropped_duplicates: {mentions, contact_info, tags, connections}}
+    """
+    loser_ids = sorted(set(loser_ids))
+    if not loser_ids:
+        raise MergeError("No contacts to merge")
+    if winner_id in loser_ids:
+        raise MergeError("The winner cannot also be merged away")
+    winner = db.get(Contact, winner_id)
+    found = set(db.execute(select(Contact.id).where(Contact.id.in_(loser_ids))).scalars())
+    if winner is None or len(found) != len(loser_ids):
+        missing = sorted(set(loser_ids) - found) + ([] if winner else [winner_id])
+        raise MergeError(f"Contact(s) not found: {', '.join(map(str, missing))}")
+
+    moved, dropped = {}, {}
+    fields_filled = _fill_winner(db, winner, loser_ids)
+    from_losers = ContactInfo.contact_id.in_(loser_ids)
+
+    # Contact info: drop values the winner (or an earlier loser row) already has, then move
+    other = aliased(ContactInfo)
+    dropped["contact_info"] = db.execute(
+        delete(ContactInfo).where(from_losers, exists().where(
+            func.lower(other.type) == func.lower(ContactInfo.type),
+            func.lower(other.value) == func.lower(ContactInfo.value),
+            or_(other.contact_id == winner_id, and_(other.contact_id.in_(loser_ids), other.id < ContactInfo.id)),
+        )),
+        execution_options=_SYNC,
+    ).rowcount or 0
+    primary = aliased(ContactInfo)
+    db.execute(
+        update(ContactInfo).where(from_losers, exists().where(
+            primary.contact_id == winner_id, primary.type == ContactInfo.type, primary.is_primary == 1,
+        )).values(is_primary=0),
+        execution_options=_SYNC,
+    )
+    moved["contact_info"] = db.execute(
+        update(ContactInfo).where(from_losers).values(contact_id=winner_id), execution_options=_SYNC
+    ).rowcount or 0
+
+    # Tags: same, keyed by tag text
+    other_tag = aliased(ContactTag)
+    dropped["tags"] = db.execute(
+        delete(ContactTag).where(ContactTag.contact_id.in_(loser_ids), exists().where(
+            other_tag.tag == ContactTag.tag,
+            or_(other_tag.contact_id == winner_id, and_(other_tag.contact_id.in_(loser_ids), other_tag.id < ContactTag.id)),
+        )),
+        execution_options=_SYNC,
+    ).rowcount or 0
+    moved["tags"] = db.execute(
+        update(ContactTag).where(ContactTag.contact_id.in_(loser_ids)).values(contact_id=winner_id),
+        execution_options=_SYNC,
+    ).rowcount or 0
+
+    # Mentions: move, then drop moved ones whose article/URL the winner already had (drafts follow the kept row)
+    moved_mention_ids = db.execute(select(Mention.id).where(Mention.contact_id.in_(loser_ids))).scalars().all()
+    moved["mentions"] = db.execute(
+        update(Mention).where(Mention.contact_id.in_(loser_ids)).values(contact_id=winner_id),
+        execution_options=_SYNC,
+    ).rowcount or 0
+    dropped["mentions"] = 0
+    if moved_mention_ids:
+        kept = aliased(Mention)
+        same_url = and_(
+            kept.contact_id == winner_id,
+            or_(kept.article_id == Mention.article_id, kept.source_url == Mention.source_url),
+        )
+        # The winner's own copy wins; among moved copies only, the oldest
+        keep_id = func.coalesce(
+            select(func.min(kept.id)).where(same_url, kept.id.notin_(moved_mention_ids)).scalar_subquery(),
+            select(func.min(kept.id)).where(same_url, kept.id < Mention.id).scalar_subquery(),
+        )
+        dupes = dict(db.execute(
+            select(Mention.id, keep_id).where(Mention.id.in_(moved_mention_ids), keep_id.is_not(None))
+        ).all())
+        if dupes:
+            db.execute(
+                update(ReplyDraft)
+                .where(ReplyDraft.mention_id.in_(list(dupes)))
+                .values(mention_id=case(dupes, value=ReplyDraft.mention_id)),
+                execution_options=_SYNC,
+            )
+            dropped["mentions"] = db.execute(
+                delete(Mention).where(Mention.id.in_(list(dupes))), execution_options=_SYNC
+            ).rowcount or 0
+
+    for key, model in (("notes", Note), ("outreach", OutreachLog), ("reply_drafts", ReplyDraft)):
+        moved[key] = db.execute(
+            update(model).where(model.contact_id.in_(loser_ids)).values(contact_id=winner_id),
+            execution_options=_SYNC,
+        ).rowcount or 0
+
+    # Archived mentions and their rollups (app.retention) follow the contact
+    for model in (MentionArchiveChunk, MentionRollup):
+        db.execute(
+            update(model).where(model.contact_id.in_(loser_ids)).values(contact_id=winner_id),
+            execution_options=_SYNC,
+        )
+
+    # Connections: repoint both ends, then drop self-links and repeated pairs
+    touched_connections = db.execute(
+        select(ContactConnection.id).where(or_(
+            ContactConnection.contact_id.in_(loser_ids), ContactConnection.other_contact_id.in_(loser_ids),
+        ))
+    ).scalars().all()
+    moved["connections"] = len(touched_connections)
+    for column in (ContactConnection.contact_id, ContactConnection.other_contact_id):
+        db.execute(
+            update(ContactConnection).where(column.in_(loser_ids)).values({column.key: winner_id}),
+            execution_options=_SYNC,
+        )
+    other_conn = aliased(ContactConnection)
+    dropped["connections"] = db.execute(
+        delete(ContactConnection).where(
+            ContactConnection.id.in_(touched_connections),
+            or_(
+                ContactConnection.contact_id == ContactConnection.other_contact_id,
+                exists().where(
+                    other_conn.contact_id == ContactConnection.contact_id,
+                    other_conn.other_contact_id == ContactConnection.other_contact_id,
+                    or_(other_conn.id.notin_(touched_connections), other_conn.id < ContactConnection.id),
+                ),
+            ),
+        ),
+        execution_options=_SYNC,
+    ).rowcount or 0
+
+    # Rows keyed only by the losers, then the losers themselves
+    for model in (ContactNameKey, ContactGraphMetrics, RotationPlanEntry):
+        db.execute(delete(model).where(model.contact_id.in_(loser_ids)), execution_options=_SYNC)
+    db.execute(delete(Contact).where(Contact.id.in_(loser_ids)), execution_options=_SYNC)
+    for contact_id in loser_ids:
+        loser = db.identity_map.get(db.identity_key(Contact, contact_id))
+        if loser is not None:
+            db.expunge(loser)
+    db.expire(winner)
+
+    refresh_recommendations(db, [winner_id])
+    sync_warm_intro_tags(db, [winner_id, *neighbor_ids(db, [winner_id])])
+    record_graph_changes(db, "contact", [winner_id, *loser_ids])
+    record_graph_changes(db, "connection", touched_connections)
+    return {
+        "winner_id": winner_id,
+        "merged": loser_ids,
+        "fields_filled": fields_filled,
+        "moved": moved,
+        "dropped_duplicates": dropped,
+    }
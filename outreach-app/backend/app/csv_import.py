@@ -0,0 +1,195 @@
+"""Streaming contact CSV import.
+
+Rows are parsed one at a time from a text stream, so the file never sits in
+memory as a whole. Existing contact names and contact info are preloaded in
+two column-only queries, new rows are written with bulk INSERTs, and each
+chunk of IMPORT_CHUNK_ROWS rows is committed on its own: a 50k-row file is
+about 50 short transactions instead of one long one.
+
+CSV columns: name, email, linkedin, x, phone, other
+- Matches rows to existing contacts by exact name (case-insensitive).
+- Adds new ContactInfo entries; skips duplicates.
+- Creates new contacts when no name match is found, listing any that look
+  like an existing contact ("Russell, Stuart", "Stuart J. Russell"; see
+  app.duplicates) in possible_duplicates for review and merge.
+"""
+import csv
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.duplicates import NameIndex, index_contact_names
+from app.graph_changes import record_graph_changes
+from app.models import Contact, ContactInfo
+from app.recommendations import refresh_recommendations
+
+# CSV column -> ContactInfo.type
+CSV_COLUMN_TYPE_MAP = {
+    "email": "email",
+    "linkedin": "linkedin",
+    "x": "twitter",
+    "phone": "phone",
+    "other": "other",
+}
+
+# Rows per transaction
+IMPORT_CHUNK_ROWS = 1000
+
+# Names and row errors listed in the result (counts are always exact)
+IMPORT_MAX_LISTED = 1000
+
+
+class CSVImportError(Exception):
+    """The file can't be imported at all (no header, no name column, not UTF-8)."""
+
+
+def _header(reader: csv.DictReader) -> list[str]:
+    try:
+        fieldnames = reader.fieldnames
+    except UnicodeDecodeError:
+        raise CSVImportError("File must be UTF-8 encoded")
+    except csv.Error as exc:
+        raise CSVImportError(f"Could not parse CSV header: {exc}")
+    if fieldnames is None:
+        raise CSVImportError("CSV file is empty or has no header row")
+    headers = [h.strip().lower() for h in fieldnames]
+    if "name" not in headers:
+        raise CSVImportError(f"CSV must have a 'name' column. Found columns: {', '.join(headers)}")
+    return headers
+
+
+def check_csv_header(lines: Iterable[str]) -> list[str]:
+    """Validate the header row without importing anything. Raises CSVImportError."""
+    return _header(csv.DictReader(lines))
+
+
+def _listed(items: list, item) -> None:
+    if len(items) < IMPORT_MAX_LISTED:
+        items.append(item)
+
+
+def _skip(result: dict, row: int, reason: str) -> None:
+    result["skipped"] += 1
+    _listed(result["skipped_rows"], {"row": row, "reason": reason})
+
+
+def import_contacts_csv(
+    db: Session,
+    lines: Iterable[str],
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """Import contacts and contact info from CSV text lines (a text file opened with newline="").
+
+    Raises CSVImportError before writing anything if the header is unusable. Later
+    problems are reported per row in skipped_rows; a decoding error mid-file stops
+    the import after the chunks already committed. progress(result) is called after
+    each committed chunk.
+
+    Returns: {rows, created, updated, info_added, info_skipped_duplicates, skipped, skipped_rows,
+              created_names, updated_names, possible_duplicates}
+    """
+    reader = csv.DictReader(lines)
+    _header(reader)
+
+    contacts = db.execute(select(Contact.id, Contact.name)).all()
+    name_to_id = {name.strip().lower(): cid for cid, name in contacts}
+    names = NameIndex(contacts)
+    existing_info = {
+        (cid, t.lower(), v.lower())
+        for cid, t, v in db.execute(select(ContactInfo.contact_id, ContactInfo.type, ContactInfo.value))
+    }
+
+    result = {
+        "rows": 0,
+        "created": 0,
+        "updated": 0,
+        "info_added": 0,
+        "info_skipped_duplicates": 0,
+        "skipped": 0,
+        "skipped_rows": [],
+        "created_names": [],
+        "updated_names": [],
+        "possible_duplicates": [],
+    }
+    chunk: list[tuple[int, str, dict]] = []
+
+    def flush_chunk():
+        # New contacts first (ids come back in input order), then their info rows
+        new_names: dict[str, str] = {}  # lowercased name -> first spelling seen
+        for _, name, _ in chunk:
+            if name.lower() not in name_to_id:
+                new_names.setdefault(name.lower(), name)
+        new_ids = []
+        if new_names:
+            new_ids = db.execute(
+                insert(Contact).returning(Contact.id, sort_by_parameter_order=True),
+                [{"name": name} for name in new_names.values()],
+            ).scalars().all()
+            for cid, name in zip(new_ids, new_names.values()):
+                candidates = names.candidates(name)
+                if candidates:
+                    _listed(result["possible_duplicates"], {"name": name, "contact_id": cid, "candidates": candidates})
+                names.add(cid, name)
+                name_to_id[name.lower()] = cid
+            index_contact_names(db, zip(new_ids, new_names.values()))
+        created = set(new_ids)
+
+        info_rows = []
+        touched = set()
+        for _, name, row in chunk:
+            cid = name_to_id[name.lower()]
+            touched.add(cid)
+            if cid in created:
+                created.discard(cid)
+                result["created"] += 1
+                _listed(result["created_names"], name)
+            else:
+                result["updated"] += 1
+                _listed(result["updated_names"], name)
+            for col, info_type in CSV_COLUMN_TYPE_MAP.items():
+                value = row.get(col, "").strip()
+                if not value:
+                    continue
+                key = (cid, info_type, value.lower())
+                if key in existing_info:
+                    result["info_skipped_duplicates"] += 1
+                    continue
+                existing_info.add(key)
+                info_rows.append({"contact_id": cid, "type": info_type, "value": value, "is_primary": 0})
+        if info_rows:
+            db.execute(insert(ContactInfo), info_rows)
+            result["info_added"] += len(info_rows)
+
+        refresh_recommendations(db, list(touched))
+        record_graph_changes(db, "contact", new_ids)
+        db.commit()
+        chunk.clear()
+        if progress:
+            progress(result)
+
+    row_num = 1  # row 1 = header
+    while True:
+        row_num += 1
+        try:
+            raw = next(reader)
+        except StopIteration:
+            break
+        except UnicodeDecodeError:
+            _skip(result, row_num, "Not UTF-8; import stopped here")
+            break
+        except csv.Error as exc:
+            _skip(result, row_num, f"Malformed row: {exc}")
+            continue
+        result["rows"] += 1
+        row = {(k or "").strip().lower(): (v.strip() if isinstance(v, str) else "") for k, v in raw.items()}
+        name = row.get("name", "")
+        if not name:
+            _skip(result, row_num, "Empty name")
+            continue
+        chunk.append((row_num, name, row))
+        if len(chunk) >= IMPORT_CHUNK_ROWS:
+            flush_chunk()
+    if chunk:
+        flush_chunk()
+    return result
@@ -1,5 +1,5 @@
 """Database setup and session management."""
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
@@ -40,3 +40,10 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+def analyze_tables(connection, *tables: str) -> None:
+    """Refresh query planner statistics so it can pick the right index (e.g. a date
+    range over the whole mentions table instead of a per-contact index scan)."""
+    for table in tables:
+        connection.execute(text(f"ANALYZE {table}"))
@@ -1,21 +1,23 @@
 """
 Connection discovery: find how contacts are related using existing mention text or web search.
 
-- From mentions: scan each mention's title + snippet for other contact names (same article, podcast, conference).
+- From mentions: scan each article's (or inline mention's) title + snippet for other contact names (same article,
+  podcast, conference); contacts linked to the same article are connected directly.
 - Via search: NewsAPI query "Name A" AND "Name B" to find co-mentions in news.
 - LLM: when Anthropic key is set, infer relationship type from context (co_author, same_panel, etc.).
 """
 import logging
 import time
+from collections import defaultdict
 
 import httpx
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 from app.config import settings
-from app.models import Contact, Mention, ContactConnection
+from app.models import Article, Contact, Mention, ContactConnection
 
 
 def _connection_exists(db: Session, contact_id: int, other_contact_id: int) -> bool:
@@ -34,13 +36,25 @@ def _connection_exists(db: Session, contact_id: int, other_contact_id: int) -> b
 
 def discover_from_mentions(db: Session, max_llm_calls: int = 10) -> dict:
     """
-    Scan existing mentions: for each mention, look for other contact names in title + snippet.
+    Scan stored mention text for other contact names in title + snippet. A shared article is
+    read once: the contacts linked to it are connected to each other and to every contact
+    named in it. Mentions stored with their own text (no article) are scanned one by one.
     When found, add contact_connection. If Anthropic key is set, use LLM to infer relationship type.
-    Returns { "added": N, "scanned_mentions": M, "llm_enriched": K }.
+    Returns { "added": N, "scanned_mentions": M, "scanned_articles": A, "llm_enriched": K }.
     """
     from app.llm_extract import infer_relationship
 
-    mentions = db.query(Mention).all()
+    linked = defaultdict(list)
+    for article_id, contact_id in db.execute(
+        select(Mention.article_id, Mention.contact_id).where(Mention.article_id.is_not(None)).order_by(Mention.id)
+    ):
+        linked[article_id].append(contact_id)
+    articles = db.query(Article).filter(Article.id.in_(list(linked))).all() if linked else []
+    inline = db.query(Mention).filter(Mention.article_id.is_(None)).all()
+    # (contacts the text belongs to, title, snippet, source url)
+    sources = [(linked[a.id], a.title, a.snippet, a.source_url) for a in articles]
+    sources += [([m.contact_id], m.title, m.snippet, m.source_url) for m in inline]
+
     contacts = db.query(Contact).all()
     contact_ids = {c.id for c in contacts}
     name_by_id = {c.id: c.name for c in contacts}
@@ -52,51 +66,56 @@ def discover_from_mentions(db: Session, max_llm_calls: int = 10) -> dict:
     llm_enriched = 0
     api_key = settings.anthropic_api_key
 
-    for m in mentions:
-        text = " ".join(filter(None, [m.title, m.snippet]))
+    for owners, title, snippet, source_url in sources:
+        text = " ".join(filter(None, [title, snippet]))
         text_lower = text.lower()
         if not text:
             continue
-        contact_id = m.contact_id
-        source_note = (m.source_url or m.title or "mention")[:500]
-        person_a = name_by_id.get(contact_id)
-
-        for other_id in contact_ids:
-            if other_id == contact_id:
-                continue
-            if (contact_id, other_id) in existing:
-                continue
-            name = name_by_id.get(other_id)
-            if not name or len(name) < 4:
-                continue
-            if name.lower() not in text_lower:
-                continue
-
-            rel_type = "mentioned_together"
-            notes = f"Co-mentioned in: {source_note}"
-
-            if api_key and llm_enriched < max_llm_calls and person_a:
-                result = infer_relationship(api_key, text, person_a, name)
-                if result:
-                    rel_type = result.get("relationship_type", rel_type)
-                    evidence = result.get("evidence", "")
-                    notes = f"{evidence}. Source: {source_note}"[:500]
-                    llm_enriched += 1
-                    time.sleep(0.3)  # Rate limit
+        source_note = (source_url or title or "mention")[:500]
+        named = {
+            other_id for other_id in contact_ids
+            if len(name_by_id[other_id] or "") >= 4 and name_by_id[other_id].lower() in text_lower
+        }
 
-            conn = ContactConnection(
-                contact_id=contact_id,
-                other_contact_id=other_id,
-                relationship_type=rel_type,
-                notes=notes,
-            )
-            db.add(conn)
-            existing.add((contact_id, other_id))
-            added += 1
+        for contact_id in owners:
+            person_a = name_by_id.get(contact_id)
+            for other_id in sorted(named | set(owners)):
+                if other_id == contact_id or other_id not in contact_ids:
+                    continue
+                if (contact_id, other_id) in existing:
+                    continue
+                name = name_by_id.get(other_id)
+
+                rel_type = "mentioned_together"
+                notes = f"Co-mentioned in: {source_note}"
+
+                if api_key and llm_enriched < max_llm_calls and person_a:
+                    result = infer_relationship(api_key, text, person_a, name)
+                    if result:
+                        rel_type = result.get("relationship_type", rel_type)
+                        evidence = result.get("evidence", "")
+                        notes = f"{evidence}. Source: {source_note}"[:500]
+                        llm_enriched += 1
+                        time.sleep(0.3)  # Rate limit
+
+                conn = ContactConnection(
+                    contact_id=contact_id,
+                    other_contact_id=other_id,
+                    relationship_type=rel_type,
+                    notes=notes,
+                )
+                db.add(conn)
+                existing.add((contact_id, other_id))
+                added += 1
 
     if added:
         db.commit()
-    return {"added": added, "scanned_mentions": len(mentions), "llm_enriched": llm_enriched}
+    return {
+        "added": added,
+        "scanned_mentions": len(inline) + sum(len(owners) for owners in linked.values()),
+        "scanned_articles": len(articles),
+        "llm_enriched": llm_enriched,
+    }
 
 
 def discover_via_search(
@@ -0,0 +1,249 @@
+"""Near-duplicate contact detection.
+
+"Stuart J. Russell", "Stuart Russell" and "Russell, Stuart" are one person.
+Each contact name gets a few blocking keys:
+- n: its full-word tokens, sorted (ignores order, punctuation, accents,
+  honorifics and middle initials),
+- i: last name + first initial ("S. Russell"),
+- p: Soundex of first and last name (spelling variants).
+Only contacts that share a key are compared (name_similarity), so finding
+candidates never compares every pair.
+
+Keys are stored in contact_name_keys, kept current on flush and by
+index_contact_names() for Core inserts. CSV imports build the same keys
+in memory (NameIndex) from the names they already preload.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models import Contact, ContactNameKey
+
+# Pairs scoring at least this are reported as likely duplicates
+DUPLICATE_MIN_SCORE = 0.85
+
+# Keys shared by more contacts than this are too common to be useful ("i:smith j")
+DUPLICATE_MAX_BLOCK = 50
+
+_HONORIFICS = {
+    "dr", "prof", "professor", "mr", "mrs", "ms", "miss", "sir", "dame", "hon", "rev",
+    "phd", "md", "mba", "jr", "sr", "ii", "iii", "iv", "esq",
+}
+_WORD_RE = re.compile(r"[^\W_]+")
+_SOUNDEX_CODES = {c: d for d, letters in {
+    "1": "bfpv", "2": "cgjkqsxz", "3": "dt", "4": "l", "5": "mn", "6": "r",
+}.items() for c in letters}
+
+
+def name_tokens(name: str) -> list[str]:
+    """Lowercase words of a name in first-last order, without accents, honorifics or parentheses."""
+    s = "".join(c for c in unicodedata.normalize("NFKD", name or "") if not unicodedata.combining(c)).lower()
+    s = re.sub(r"\(.*?\)", " ", s)
+    if s.count(",") == 1:
+        last, first = s.split(",")
+        first_words = _WORD_RE.findall(first)
+        # "Russell, Stuart" -> "Stuart Russell"; "Stuart Russell, PhD" stays
+        if first_words and not all(w in _HONORIFICS for w in first_words):
+            s = f"{first} {last}"
+    return [w for w in _WORD_RE.findall(s) if w not in _HONORIFICS]
+
+
+def full_words(tokens: list[str]) -> list[str]:
+    """Tokens without initials (single letters); numbers always count ("Person 1" is not "Person 2")."""
+    return [t for t in tokens if len(t) > 1 or t.isdigit()]
+
+
+def soundex(word: str) -> str:
+    """Classic four-character Soundex code (R-163 for Robert/Rupert)."""
+    word = word.lower()
+    if not word:
+        return ""
+    out, last = word[0].upper(), _SOUNDEX_CODES.get(word[0])
+    for c in word[1:]:
+        code = _SOUNDEX_CODES.get(c)
+        if code and code != last:
+            out += code
+            if len(out) == 4:
+                break
+        if c not in "hw":
+            last = code
+    return out.ljust(4, "0")
+
+
+def name_keys(name: str) -> set[str]:
+    """All blocking keys for a name (empty for names with no letters or digits)."""
+    tokens = name_tokens(name)
+    words = full_words(tokens)
+    keys = set()
+    if not words:
+        return keys
+    keys.add("n:" + " ".join(sorted(words)))
+    if len(tokens) >= 2:
+        last = words[-1]
+        keys.add(f"i:{last} {tokens[0][0]}")
+        if len(words) >= 2:
+            keys.add(f"p:{soundex(words[0])} {soundex(last)}")
+    return keys
+
+
+def name_similarity(a: str, b: str) -> float:
+    """0-1 similarity of two names (1.0 = same words in any order, initials ignored)."""
+    ta, tb = name_tokens(a), name_tokens(b)
+    wa, wb = full_words(ta), full_words(tb)
+    if not wa or not wb:
+        return 0.0
+    if sorted(wa) == sorted(wb):
+        return 1.0
+    if {w for w in wa if w.isdigit()} != {w for w in wb if w.isdigit()}:
+        return 0.0
+    score = SequenceMatcher(None, " ".join(sorted(wa)), " ".join(sorted(wb))).ratio()
+    # "S. Russell" vs "Stuart Russell": same last name, one side gives only the initial
+    if wa[-1] == wb[-1] and ta[0][0] == tb[0][0] and (len(ta[0]) == 1 or len(tb[0]) == 1):
+        score = max(score, 0.9)
+    return round(score, 3)
+
+
+class NameIndex:
+    """In-memory blocking index over (contact id, name) pairs, for batch lookups such as imports."""
+
+    def __init__(self, contacts=()):
+        self.blocks: dict[str, set[int]] = defaultdict(set)
+        self.names: dict[int, str] = {}
+        for cid, name in contacts:
+            self.add(cid, name)
+
+    def add(self, contact_id: int, name: str) -> None:
+        self.names[contact_id] = name
+        for key in name_keys(name):
+            self.blocks[key].add(contact_id)
+
+    def candidates(self, name: str, limit: int = 5) -> list[dict]:
+        """Likely duplicates of `name`: [{id, name, score}], best first."""
+        ids = set()
+        for key in name_keys(name):
+            block = self.blocks.get(key, set())
+            if len(block) <= DUPLICATE_MAX_BLOCK:
+                ids |= block
+        return _scored(name, ((cid, self.names[cid]) for cid in ids), limit)
+
+
+def _scored(name: str, contacts, limit: int) -> list[dict]:
+    scored = [
+        {"id": cid, "name": other, "score": score}
+        for cid, other in contacts
+        if (score := name_similarity(name, other)) >= DUPLICATE_MIN_SCORE
+    ]
+    scored.sort(key=lambda c: (-c["score"], c["id"]))
+    return scored[:limit]
+
+
+def index_contact_names(connection, contacts) -> None:
+    """Replace the stored blocking keys of the given (id, name) pairs. Does not commit."""
+    contacts = list(contacts)
+    if not contacts:
+        return
+    connection.execute(
+        delete(ContactNameKey).where(ContactNameKey.contact_id.in_([cid for cid, _ in contacts]))
+    )
+    rows = [{"contact_id": cid, "key": key} for cid, name in contacts for key in name_keys(name)]
+    if rows:
+        connection.execute(insert(ContactNameKey), rows)
+
+
+def find_duplicate_candidates(db: Session, name: str, exclude_id: int | None = None, limit: int = 5) -> list[dict]:
+    """Stored contacts that are likely duplicates of `name` (one indexed query). [{id, name, score}]"""
+    keys = name_keys(name)
+    if not keys:
+        return []
+    rows = db.execute(
+        select(Contact.id, Contact.name)
+        .join(ContactNameKey, ContactNameKey.contact_id == Contact.id)
+        .where(ContactNameKey.key.in_(keys))
+        .distinct()
+    ).all()
+    return _scored(name, ((cid, other) for cid, other in rows if cid != exclude_id), limit)
+
+
+def find_duplicates(db: Session) -> dict:
+    """Scan the whole table for likely duplicate contacts via shared blocking keys.
+
+    Returns: {contacts_scanned, pairs_compared, blocks_skipped, groups}; each group is
+    [{id, name}] of contacts linked by pairs scoring >= DUPLICATE_MIN_SCORE, with a
+    score for the group's weakest link.
+    """
+    sizes = (
+        select(ContactNameKey.key, func.count().label("n"))
+        .group_by(ContactNameKey.key)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    skipped = db.execute(select(func.count()).select_from(sizes).where(sizes.c.n > DUPLICATE_MAX_BLOCK)).scalar()
+    blocks: dict[str, list[int]] = defaultdict(list)
+    for key, cid in db.execute(
+        select(ContactNameKey.key, ContactNameKey.contact_id)
+        .join(sizes, sizes.c.key == ContactNameKey.key)
+        .where(sizes.c.n <= DUPLICATE_MAX_BLOCK)
+    ):
+        blocks[key].append(cid)
+
+    pairs = {(a, b) for ids in blocks.values() for i, a in enumerate(sorted(ids)) for b in sorted(ids)[i + 1:]}
+    involved = {cid for pair in pairs for cid in pair}
+    names = dict(db.execute(select(Contact.id, Contact.name).where(Contact.id.in_(involved))).all()) if involved else {}
+
+    # Union-find over pairs that score as duplicates
+    parent: dict[int, int] = {}
+
+    def root(x: int) -> int:
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    weakest: dict[int, float] = {}
+    links = []
+    for a, b in pairs:
+        if a in names and b in names:
+            score = name_similarity(names[a], names[b])
+            if score >= DUPLICATE_MIN_SCORE:
+                links.append((a, b, score))
+                parent[root(a)] = root(b)
+    members: dict[int, list[int]] = defaultdict(list)
+    for cid in parent:
+        members[root(cid)].append(cid)
+    for a, _, score in links:
+        r = root(a)
+        weakest[r] = min(weakest.get(r, 1.0), score)
+
+    groups = [
+        {"score": weakest[r], "contacts": [{"id": cid, "name": names[cid]} for cid in sorted(ids)]}
+        for r, ids in members.items()
+        if len(ids) > 1
+    ]
+    groups.sort(key=lambda g: (-g["score"], g["contacts"][0]["id"]))
+    return {
+        "contacts_scanned": db.query(func.count(Contact.id)).scalar() or 0,
+        "pairs_compared": len(pairs),
+        "blocks_skipped": skipped or 0,
+        "groups": groups,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _index_changed_names(session, flush_context):
+    """Keep contact_name_keys in step with contact inserts, renames and deletes."""
+    changed = [obj for obj in session.new if isinstance(obj, Contact)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, Contact) and inspect(obj).attrs.name.history.has_changes()
+    ]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Contact)]
+    if not changed and not deleted:
+        return
+    connection = session.connection()
+    if deleted:
+        connection.execute(delete(ContactNameKey).where(ContactNameKey.contact_id.in_(deleted)))
+    index_contact_names(connection, [(obj.id, obj.name) for obj in changed])
@@ -2,7 +2,7 @@
 import logging
 import re
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 import httpx
 
@@ -178,10 +178,11 @@ def enrich_linkedin_url(
     return d.get("linkedin") or None
 
 
-def enrich_bulk(db, api_key: str, max_contacts: int = 50) -> dict:
+def enrich_bulk(db, api_key: str, max_contacts: int = 50, progress: Callable[[dict], None] | None = None) -> dict:
     """Enrich all contacts that are missing email. Returns summary stats.
 
     Rate-limited to 1 request per second to respect Hunter API limits.
+    progress(stats) is called after each Hunter lookup.
     """
     from app.models import Contact, ContactInfo
 
@@ -243,6 +244,8 @@ def enrich_bulk(db, api_key: str, max_contacts: int = 50) -> dict:
             stats["details"].append({"name": contact.name, "email": result["email"]})
         else:
             stats["errors"] += 1
+        if progress:
+            progress(stats)
 
         # Rate limit: 1 request per second
         time.sleep(1)
@@ -0,0 +1,184 @@
+"""In-process event bus behind the live event stream (GET /api/events).
+
+Background jobs publish "job" events as they start, progress and finish, and
+every committed session publishes the mentions and connections it inserted
+("mention", "connection"). Each stream client holds a Subscription; publish()
+is thread-safe (jobs run in worker threads) and hands the event to every
+subscriber's event loop without blocking.
+
+Events get increasing ids. The last EVENT_HISTORY are kept, so a client that
+reconnects with Last-Event-ID replays what it missed. Mentions inserted by
+another process (scripts/fetch_mentions.py) are announced by
+publish_new_mentions() once they are committed; it skips the ids this
+process already announced on commit, so each mention is published once.
+
+The bus only reaches clients of this process: run the API as a single worker
+(as the scheduler already assumes).
+"""
+import asyncio
+import threading
+from collections import deque
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models import ContactConnection, Mention
+
+# Events kept for Last-Event-ID replay
+EVENT_HISTORY = 500
+
+# Events buffered per client; a client that falls further behind is disconnected (and replays on reconnect)
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Ids of mentions announced on commit remembered, so publish_new_mentions() doesn't repeat them
+PUBLISHED_MENTIONS_KEPT = 10000
+
+
+class Subscription:
+    """One stream client: a bounded queue on the client's event loop."""
+
+    def __init__(self, types: set[str] | None = None):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.types = types
+        self.overflowed = False
+
+    def _offer(self, item: dict) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, item: dict) -> None:
+        if self.types is None or item["type"] in self.types:
+            self.loop.call_soon_threadsafe(self._offer, item)
+
+
+class EventBus:
+    def __init__(self, history: int = EVENT_HISTORY):
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._history: deque[dict] = deque(maxlen=history)
+        self._last_id = 0
+
+    @property
+    def last_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+    def publish(self, type: str, data: dict) -> dict:
+        """Send an event to every subscriber. Returns the event ({id, type, data})."""
+        with self._lock:
+            self._last_id += 1
+            item = {"id": self._last_id, "type": type, "data": data}
+            self._history.append(item)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.deliver(item)
+            except RuntimeError:  # The client's loop has closed
+                self.unsubscribe(sub)
+        return item
+
+    def subscribe(self, types: set[str] | None = None, after_id: int | None = None) -> Subscription:
+        """Register a client (call from its event loop). Events after `after_id` still in the
+        history are queued first."""
+        sub = Subscription(types)
+        with self._lock:
+            if after_id is not None:
+                for item in self._history:
+                    if item["id"] > after_id and (types is None or item["type"] in types):
+                        sub._offer(item)
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def recent(self, after_id: int = 0) -> list[dict]:
+        """Events still in the history with id > after_id, oldest first."""
+        with self._lock:
+            return [item for item in self._history if item["id"] > after_id]
+
+
+bus = EventBus()
+
+_published_lock = threading.Lock()
+_published_mentions: dict[int, None] = {}  # Insertion-ordered set of mention ids announced on commit
+
+
+def _remember_published(mention_id: int) -> None:
+    with _published_lock:
+        _published_mentions[mention_id] = None
+        if len(_published_mentions) > PUBLISHED_MENTIONS_KEPT:
+            del _published_mentions[next(iter(_published_mentions))]
+
+
+def publish_job(job: str, result: dict | None) -> None:
+    """Announce a job's state: result None = running, else its status payload.
+
+    The payload matches the job's polling endpoint: {job, status, ...}, where a result
+    without a status is complete.
+    """
+    if result is None:
+        bus.publish("job", {"job": job, "status": "running"})
+    else:
+        bus.publish("job", {"job": job, "status": "complete", **result})
+
+
+def _mention_payload(mention_id, contact_id, article_id, source_type) -> dict:
+    return {"id": mention_id, "contact_id": contact_id, "article_id": article_id, "source_type": source_type}
+
+
+def _connection_payload(conn: ContactConnection) -> dict:
+    return {
+        "id": conn.id,
+        "contact_id": conn.contact_id,
+        "other_contact_id": conn.other_contact_id,
+        "relationship_type": conn.relationship_type,
+    }
+
+
+def publish_new_mentions(db: Session, after_id: int) -> int:
+    """Publish a "mention" event for each committed mention with id > after_id inserted by
+    another process (ids this process announced on commit are skipped). Returns the highest
+    mention id seen, to pass as after_id next time."""
+    rows = db.execute(
+        select(Mention.id, Mention.contact_id, Mention.article_id, Mention.source_type)
+        .where(Mention.id > after_id)
+        .order_by(Mention.id)
+    ).all()
+    with _published_lock:
+        rows_to_publish = [row for row in rows if row[0] not in _published_mentions]
+    for row in rows_to_publish:
+        bus.publish("mention", _mention_payload(*row))
+    return rows[-1][0] if rows else after_id
+
+
+def latest_mention_id(db: Session) -> int:
+    return db.execute(select(Mention.id).order_by(Mention.id.desc()).limit(1)).scalar() or 0
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_inserts(session, flush_context):
+    """Note mentions and connections inserted in this flush; they are published on commit."""
+    pending = session.info.setdefault("events_pending", [])
+    for obj in session.new:
+        if isinstance(obj, Mention):
+            pending.append(("mention", _mention_payload(obj.id, obj.contact_id, obj.article_id, obj.source_type)))
+        elif isinstance(obj, ContactConnection):
+            pending.append(("connection", _connection_payload(obj)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    for type, data in session.info.pop("events_pending", ()):
+        if type == "mention":
+            _remember_published(data["id"])
+        bus.publish(type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("events_pending", None)
@@ -0,0 +1,176 @@
+"""Streaming exports of contacts and mentions as CSV or JSONL.
+
+Rows are read through a server-side cursor (yield_per) and written out one
+chunk at a time, so memory stays flat however many rows there are and the
+first bytes go out right away. For contacts, each chunk of EXPORT_CHUNK_ROWS
+ids gets its contact info, tags and latest outreach entry from three
+batched queries.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import Contact, ContactInfo, ContactTag, Mention, OutreachLog
+
+# Rows fetched per cursor round trip (and per batch of related-row lookups)
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+CONTACT_EXPORT_FIELDS = (
+    "id", "list_number", "name", "category", "subcategory", "role_org", "connection_to_solomon",
+    "primary_interests", "bio", "relationship_stage", "mission_alignment", "in_mention_rotation",
+    "enrichment_status", "created_at", "updated_at",
+)
+# contact_info types that get their own CSV column; anything else lands in "other"
+CONTACT_INFO_CSV_TYPES = ("email", "linkedin", "twitter", "phone", "website", "other")
+CONTACT_CSV_COLUMNS = (
+    CONTACT_EXPORT_FIELDS
+    + CONTACT_INFO_CSV_TYPES
+    + ("tags", "last_outreach_method", "last_outreach_at", "last_outreach_status")
+)
+
+MENTION_EXPORT_FIELDS = (
+    "id", "contact_id", "contact_name", "source_type", "source_url", "title", "snippet",
+    "published_at", "relevance_score", "dismissed", "created_at",
+)
+
+
+def _value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
+def _contact_extras(db: Session, ids: list[int]) -> tuple[dict, dict, dict]:
+    """contact_info, tags and latest outreach entry for a chunk of contact ids."""
+    info = defaultdict(list)
+    for cid, t, v, primary in db.execute(
+        select(ContactInfo.contact_id, ContactInfo.type, ContactInfo.value, ContactInfo.is_primary)
+        .where(ContactInfo.contact_id.in_(ids))
+        .order_by(ContactInfo.contact_id, ContactInfo.is_primary.desc(), ContactInfo.id)
+    ):
+        info[cid].append({"type": t, "value": v, "is_primary": bool(primary)})
+
+    tags = defaultdict(list)
+    for cid, tag in db.execute(
+        select(ContactTag.contact_id, ContactTag.tag).where(ContactTag.contact_id.in_(ids)).order_by(ContactTag.id)
+    ):
+        tags[cid].append(tag)
+
+    rn = func.row_number().over(
+        partition_by=OutreachLog.contact_id,
+        order_by=(OutreachLog.sent_at.desc().nullslast(), OutreachLog.id.desc()),
+    ).label("rn")
+    ranked = (
+        select(OutreachLog.contact_id, OutreachLog.method, OutreachLog.sent_at, OutreachLog.response_status, rn)
+        .where(OutreachLog.contact_id.in_(ids))
+        .subquery()
+    )
+    latest = {
+        cid: {"method": method, "sent_at": _value(sent_at), "response_status": status}
+        for cid, method, sent_at, status, _ in db.execute(select(ranked).where(ranked.c.rn == 1))
+    }
+    return info, tags, latest
+
+
+def iter_contact_records(db: Session) -> Iterator[dict]:
+    """Every contact (by list number) with contact_info, tags and last_outreach."""
+    stmt = (
+        select(*(getattr(Contact, f) for f in CONTACT_EXPORT_FIELDS))
+        .order_by(Contact.list_number.asc().nullslast(), Contact.id)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    for rows in db.execute(stmt).partitions():
+        info, tags, latest = _contact_extras(db, [r.id for r in rows])
+        for r in rows:
+            record = dict(zip(CONTACT_EXPORT_FIELDS, r))
+            record["created_at"] = _value(r.created_at)
+            record["updated_at"] = _value(r.updated_at)
+            record["in_mention_rotation"] = bool(record["in_mention_rotation"])
+            record["contact_info"] = info.get(r.id, [])
+            record["tags"] = tags.get(r.id, [])
+            record["last_outreach"] = latest.get(r.id)
+            yield record
+
+
+def _contact_csv_row(record: dict) -> list:
+    by_type = defaultdict(list)
+    for ci in record["contact_info"]:
+        t = ci["type"] if ci["type"] in CONTACT_INFO_CSV_TYPES else "other"
+        by_type[t].append(ci["value"])
+    last = record["last_outreach"] or {}
+    return (
+        [record[f] for f in CONTACT_EXPORT_FIELDS]
+        + ["; ".join(by_type[t]) for t in CONTACT_INFO_CSV_TYPES]
+        + ["; ".join(record["tags"]), last.get("method"), last.get("sent_at"), last.get("response_status")]
+    )
+
+
+def iter_mention_records(
+    db: Session, contact_id: int | None = None, since: datetime | None = None, include_dismissed: bool = True
+) -> Iterator[dict]:
+    """Mentions (newest first) with their contact's name; since = published on or after."""
+    columns = [getattr(Mention, f).label(f) for f in MENTION_EXPORT_FIELDS if f != "contact_name"]
+    stmt = (
+        select(*columns, Contact.name.label("contact_name"))
+        .join(Contact, Contact.id == Mention.contact_id)
+        .order_by(Mention.published_at.desc().nullslast(), Mention.id.desc())
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    if contact_id is not None:
+        stmt = stmt.where(Mention.contact_id == contact_id)
+    if since is not None:
+        # Same rule as the mentions list: created_at stands in for an unknown publish date
+        stmt = stmt.where(or_(
+            Mention.published_at >= since,
+            and_(Mention.published_at.is_(None), Mention.created_at >= since),
+        ))
+    if not include_dismissed:
+        stmt = stmt.where(Mention.dismissed == 0)
+    for rows in db.execute(stmt).partitions():
+        for r in rows:
+            record = r._asdict()
+            record["published_at"] = _value(r.published_at)
+            record["created_at"] = _value(r.created_at)
+            record["dismissed"] = bool(record["dismissed"])
+            yield record
+
+
+def encode_records(records: Iterator[dict], fmt: str, columns=None, to_row=None) -> Iterator[bytes]:
+    """Serialize records as CSV (header first; to_row flattens a record) or JSONL, a chunk at a time."""
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    n = 0
+    for record in records:
+        if writer:
+            writer.writerow(to_row(record) if to_row else [record[c] for c in columns])
+        else:
+            buf.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            buf.write("\n")
+        n += 1
+        if n % EXPORT_CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def export_contacts(db: Session, fmt: str) -> Iterator[bytes]:
+    """Byte chunks of the contacts export (CSV flattens contact info per type and tags with "; ")."""
+    return encode_records(iter_contact_records(db), fmt, CONTACT_CSV_COLUMNS, _contact_csv_row)
+
+
+def export_mentions(db: Session, fmt: str, **filters) -> Iterator[bytes]:
+    """Byte chunks of the mentions export; filters as in iter_mention_records()."""
+    return encode_records(iter_mention_records(db, **filters), fmt, MENTION_EXPORT_FIELDS)
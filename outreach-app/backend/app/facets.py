@@ -0,0 +1,167 @@
+"""Facet counts for the contacts list filter sidebar.
+
+One GROUP BY per facet (category, stage, tag, rotation, enrichment status)
+over the contacts matching the list's current filters. A facet ignores its
+own filter, so picking a category still shows counts for the other
+categories.
+
+Results are cached per engine and filter combination. Any committed write
+to a faceted contact column or to contact tags bumps a generation counter
+and so invalidates every cached entry; a TTL covers writes made by other
+processes or outside the ORM.
+"""
+import threading
+import time
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import distinct, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models import Contact, ContactTag
+from app.search import contact_search_subquery
+
+# Contact columns that feed a facet or a facet filter
+FACET_CONTACT_FIELDS = ("category", "relationship_stage", "in_mention_rotation", "enrichment_status")
+
+# Cached counts are recomputed after this long even without a local write
+FACET_CACHE_TTL_SECONDS = 300
+
+# Filter combinations kept per engine (oldest dropped first)
+FACET_CACHE_MAX_ENTRIES = 256
+
+_cache_lock = threading.Lock()
+_cache: "WeakKeyDictionary[object, dict]" = WeakKeyDictionary()
+_generation = 0
+
+
+def invalidate_contact_facets() -> None:
+    """Drop all cached facet counts (called after commits that touch faceted data)."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _cache.clear()
+
+
+def contact_filter_clauses(db: Session, q: str | None, category: str | None, in_rotation: bool | None) -> dict:
+    """WHERE clauses of the contacts list filters, keyed by the facet each one narrows."""
+    clauses = {}
+    if q:
+        hits = contact_search_subquery(db, q)
+        if hits is not None:
+            clauses["q"] = Contact.id.in_(select(hits.c.contact_id))
+        else:
+            clauses["q"] = Contact.name.ilike(f"%{q}%") | Contact.category.ilike(f"%{q}%")
+    if category:
+        clauses["category"] = Contact.category.ilike(f"%{category}%")
+    if in_rotation:
+        clauses["in_mention_rotation"] = Contact.in_mention_rotation == 1
+    return clauses
+
+
+def _counts(db: Session, stmt) -> list[dict]:
+    rows = db.execute(stmt).all()
+    counts = [{"value": value, "count": count} for value, count in rows]
+    counts.sort(key=lambda c: (-c["count"], str(c["value"])))
+    return counts
+
+
+def compute_contact_facets(
+    db: Session, q: str | None = None, category: str | None = None, in_rotation: bool | None = None
+) -> dict:
+    """Facet counts over contacts matching the filters (uncached).
+
+    Returns: {total, category, relationship_stage, tag, in_mention_rotation, enrichment_status};
+    each facet is [{value, count}] sorted by count, highest first.
+    """
+    clauses = contact_filter_clauses(db, q, category, in_rotation)
+
+    def where(facet: str) -> list:
+        return [clause for key, clause in clauses.items() if key != facet]
+
+    def grouped(column, facet: str):
+        return select(column, func.count()).where(*where(facet)).group_by(column)
+
+    rotation = func.coalesce(Contact.in_mention_rotation, 0)
+    facets = {
+        "total": db.execute(select(func.count(Contact.id)).where(*clauses.values())).scalar() or 0,
+        "category": _counts(db, grouped(Contact.category, "category")),
+        "relationship_stage": _counts(db, grouped(Contact.relationship_stage, "relationship_stage")),
+        "tag": _counts(
+            db,
+            select(ContactTag.tag, func.count(distinct(ContactTag.contact_id)))
+            .join(Contact, Contact.id == ContactTag.contact_id)
+            .where(*where("tag"))
+            .group_by(ContactTag.tag),
+        ),
+        "in_mention_rotation": [
+            {"value": bool(c["value"]), "count": c["count"]}
+            for c in _counts(db, grouped(rotation, "in_mention_rotation"))
+        ],
+        "enrichment_status": _counts(
+            db, grouped(func.coalesce(Contact.enrichment_status, "pending"), "enrichment_status")
+        ),
+    }
+    return facets
+
+
+def contact_facets(
+    db: Session, q: str | None = None, category: str | None = None, in_rotation: bool | None = None
+) -> dict:
+    """compute_contact_facets() through the cache. Returns the same dict plus cached (bool)."""
+    engine = db.get_bind()
+    key = ((q or "").strip().lower(), (category or "").strip().lower(), bool(in_rotation))
+    now = time.monotonic()
+    with _cache_lock:
+        generation = _generation
+        entry = _cache.get(engine, {}).get(key)
+    if entry is not None and entry[0] > now:
+        return {**entry[1], "cached": True}
+
+    facets = compute_contact_facets(db, q, category, in_rotation)
+    with _cache_lock:
+        if generation == _generation:
+            entries = _cache.setdefault(engine, {})
+            entries.pop(key, None)
+            entries[key] = (now + FACET_CACHE_TTL_SECONDS, facets)
+            while len(entries) > FACET_CACHE_MAX_ENTRIES:
+                entries.pop(next(iter(entries)))
+    return {**facets, "cached": False}
+
+
+def _facet_fields_changed(contact: Contact) -> bool:
+    state = inspect(contact)
+    return any(state.attrs[f].history.has_changes() for f in FACET_CONTACT_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_facet_writes(session, flush_context):
+    """Note flushed contact/tag changes; the cache is invalidated when they commit."""
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (Contact, ContactTag)):
+            session.info["facets_stale"] = True
+            return
+    for obj in session.dirty:
+        if isinstance(obj, ContactTag) or (isinstance(obj, Contact) and _facet_fields_changed(obj)):
+            session.info["facets_stale"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_facet_bulk_writes(orm_execute_state):
+    """Same for ORM bulk INSERT/UPDATE/DELETE statements, which skip the flush."""
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Contact, ContactTag):
+        orm_execute_state.session.info["facets_stale"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("facets_stale", False):
+        invalidate_contact_facets()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("facets_stale", None)
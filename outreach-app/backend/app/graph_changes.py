@@ -0,0 +1,113 @@
+"""Relationship map versioning: a change log of contacts and connections.
+
+Every flush that adds, edits or removes a connection, or changes a contact
+field shown on the map, appends (entity, entity_id) rows to graph_changes.
+The newest row id is the graph version: clients send it back as
+If-None-Match / since= and only receive what changed after it.
+
+Connections removed by ON DELETE CASCADE when a contact is deleted are
+looked up before the flush and logged with it. Writes that bypass the ORM
+(bulk updates of graph metrics, merges) call record_graph_changes() explicitly.
+"""
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import Contact, ContactConnection, GraphChange
+
+# Contact columns that appear on relationship map nodes
+MAP_CONTACT_FIELDS = ("name", "category", "relationship_stage", "list_number")
+
+# Change log rows older than this are pruned; clients further behind get the full graph
+GRAPH_CHANGE_RETENTION_DAYS = 30
+
+
+def current_graph_version(db: Session) -> int:
+    """Latest graph version (0 = nothing recorded yet)."""
+    return db.query(func.max(GraphChange.id)).scalar() or 0
+
+
+def record_graph_changes(db: Session, entity: str, entity_ids) -> None:
+    """Append change log rows for writes that don't go through ORM flushes. Does not commit."""
+    now = datetime.now(UTC)
+    rows = [{"entity": entity, "entity_id": eid, "created_at": now} for eid in entity_ids]
+    if rows:
+        db.execute(insert(GraphChange), rows)
+
+
+def changes_since(db: Session, version: int) -> dict[str, set[int]] | None:
+    """Entity ids changed after `version`, by entity type.
+
+    Returns None when the log no longer reaches back that far (pruned) or `version` is
+    from the future (database reset), meaning the caller must send the full graph instead.
+    """
+    oldest, latest = db.query(func.min(GraphChange.id), func.max(GraphChange.id)).one()
+    latest = latest or 0
+    if version > latest or (version < latest and oldest > version + 1):
+        return None
+    changed: dict[str, set[int]] = {"contact": set(), "connection": set()}
+    rows = (
+        db.query(GraphChange.entity, GraphChange.entity_id)
+        .filter(GraphChange.id > version)
+        .distinct()
+        .all()
+    )
+    for entity, entity_id in rows:
+        changed.setdefault(entity, set()).add(entity_id)
+    return changed
+
+
+def prune_graph_changes(db: Session, days: int = GRAPH_CHANGE_RETENTION_DAYS) -> int:
+    """Delete change log rows older than `days`, always keeping the newest (the version)."""
+    cutoff = datetime.now(UTC) - timedelta(days=days)
+    latest = current_graph_version(db)
+    deleted = (
+        db.query(GraphChange)
+        .filter(GraphChange.created_at < cutoff, GraphChange.id < latest)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+def _map_fields_changed(contact: Contact) -> bool:
+    state = inspect(contact)
+    return any(state.attrs[f].history.has_changes() for f in MAP_CONTACT_FIELDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _note_cascaded_connections(session, flush_context, instances):
+    """Connections the database will drop with contacts deleted in this flush (logged after it)."""
+    contact_ids = [obj.id for obj in session.deleted if isinstance(obj, Contact)]
+    if not contact_ids:
+        return
+    session.info.setdefault("graph_cascaded_connections", set()).update(session.execute(
+        select(ContactConnection.id).where(or_(
+            ContactConnection.contact_id.in_(contact_ids),
+            ContactConnection.other_contact_id.in_(contact_ids),
+        ))
+    ).scalars())
+
+
+@event.listens_for(Session, "after_flush")
+def _log_graph_changes(session, flush_context):
+    """Bump the graph version for contact/connection writes in this flush."""
+    rows = [("connection", cid) for cid in session.info.pop("graph_cascaded_connections", ())]
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Contact):
+            rows.append(("contact", obj.id))
+        elif isinstance(obj, ContactConnection):
+            rows.append(("connection", obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, Contact) and _map_fields_changed(obj):
+            rows.append(("contact", obj.id))
+        elif isinstance(obj, ContactConnection) and session.is_modified(obj):
+            rows.append(("connection", obj.id))
+    if not rows:
+        return
+    now = datetime.now(UTC)
+    session.connection().execute(
+        GraphChange.__table__.insert(),
+        [{"entity": entity, "entity_id": eid, "created_at": now} for entity, eid in rows],
+    )
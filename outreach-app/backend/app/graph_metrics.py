@@ -0,0 +1,528 @@
+"""Network centrality over the contact connection graph.
+
+The graph is undirected: a contact_connections row links both contacts,
+whichever side it was recorded on. Adjacency is held in CSR form
+(indptr / indices arrays) so every metric is a sparse pass over the edge
+list instead of a dense n x n matrix.
+
+  - Degree:      number of distinct connected contacts
+  - PageRank:    power iteration of the random-surfer matrix (damping 0.85)
+  - Betweenness: Brandes' algorithm from a random sample of source nodes,
+                 scaled up to estimate the exact (normalized) value
+  - Communities: label propagation; each cluster is identified by its
+                 smallest member contact id so ids stay stable across runs
+  - Layout:      Fruchterman-Reingold force-directed coordinates for the
+                 relationship map, with grid-bucketed repulsion. Updated
+                 incrementally: only contacts touched by new connections
+                 (and their neighbors) move, starting from cached positions
+  - Ego network: bounded BFS from one contact over the indexed connection
+                 columns (no full-graph load), strongest edges kept first
+
+Results are stored per contact in contact_graph_metrics by a nightly job
+(see app.scheduler) so list/detail/map endpoints only read them.
+"""
+import math
+import random
+from collections import Counter, deque
+from datetime import UTC, datetime
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.graph_changes import record_graph_changes
+from app.models import Contact, ContactConnection, ContactGraphMetrics
+from app.warm_intros import CONNECTION_TYPE_STRENGTH
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6  # Stop when the L1 change per node drops below this
+PAGERANK_MAX_ITER = 100
+
+# Source nodes sampled for approximate betweenness; exact when the graph is this small
+BETWEENNESS_SAMPLES = 64
+
+LABEL_PROPAGATION_MAX_ITER = 50
+
+# Force layout (coordinates are in map pixels at zoom 1)
+LAYOUT_EDGE_LENGTH = 30.0  # Ideal distance between connected contacts
+LAYOUT_FULL_ITERATIONS = 80
+LAYOUT_INCREMENTAL_ITERATIONS = 30
+LAYOUT_COARSE_CELLS = 4  # Far-field cell size, in fine grid cells
+# Incremental runs also free neighbors of changed contacts, except hubs above this degree
+# (moving a hub would drag half the map along with it)
+LAYOUT_NEIGHBOR_MAX_DEGREE = 10
+
+
+class Graph:
+    """Undirected graph in CSR form. Node i is contact node_ids[i]."""
+
+    def __init__(self, node_ids: list[int], edges):
+        self.node_ids = list(node_ids)
+        index = {cid: i for i, cid in enumerate(self.node_ids)}
+        neighbors: list[set[int]] = [set() for _ in self.node_ids]
+        for a, b in edges:
+            ia, ib = index.get(a), index.get(b)
+            if ia is None or ib is None or ia == ib:
+                continue
+            neighbors[ia].add(ib)
+            neighbors[ib].add(ia)
+        self.indptr = [0]
+        self.indices: list[int] = []
+        for nbrs in neighbors:
+            self.indices.extend(sorted(nbrs))
+            self.indptr.append(len(self.indices))
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def degree(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def neighbors(self, i: int) -> list[int]:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+
+def load_graph(db: Session) -> Graph:
+    """Build the contact graph with two column-only queries."""
+    node_ids = [r[0] for r in db.execute(select(Contact.id).order_by(Contact.id)).all()]
+    edges = db.execute(select(ContactConnection.contact_id, ContactConnection.other_contact_id)).all()
+    return Graph(node_ids, edges)
+
+
+def pagerank(
+    graph: Graph,
+    damping: float = PAGERANK_DAMPING,
+    tol: float = PAGERANK_TOLERANCE,
+    max_iter: int = PAGERANK_MAX_ITER,
+) -> list[float]:
+    """PageRank by power iteration. Isolated contacts spread their rank uniformly."""
+    n = len(graph)
+    if n == 0:
+        return []
+    indptr, indices = graph.indptr, graph.indices
+    rank = [1.0 / n] * n
+    for _ in range(max_iter):
+        dangling = sum(rank[i] for i in range(n) if indptr[i + 1] == indptr[i])
+        base = (1.0 - damping) / n + damping * dangling / n
+        new = [base] * n
+        for i in range(n):
+            start, end = indptr[i], indptr[i + 1]
+            if start == end:
+                continue
+            share = damping * rank[i] / (end - start)
+            for j in indices[start:end]:
+                new[j] += share
+        delta = sum(abs(new[i] - rank[i]) for i in range(n))
+        rank = new
+        if delta < n * tol:
+            break
+    return rank
+
+
+def approximate_betweenness(
+    graph: Graph,
+    samples: int = BETWEENNESS_SAMPLES,
+    seed: int | None = 0,
+) -> list[float]:
+    """Normalized betweenness via Brandes' algorithm from `samples` random sources.
+
+    Exact when samples >= number of nodes. Seeded by default so nightly runs are stable.
+    """
+    n = len(graph)
+    if n < 3:
+        return [0.0] * n
+    indptr, indices = graph.indptr, graph.indices
+    if samples >= n:
+        sources = range(n)
+        k = n
+    else:
+        sources = random.Random(seed).sample(range(n), samples)
+        k = samples
+
+    bc = [0.0] * n
+    for s in sources:
+        # Single-source shortest paths (BFS, unweighted)
+        order: list[int] = []
+        preds: list[list[int]] = [[] for _ in range(n)]
+        sigma = [0] * n
+        dist = [-1] * n
+        sigma[s] = 1
+        dist[s] = 0
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            dv = dist[v] + 1
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if dist[w] < 0:
+                    dist[w] = dv
+                    queue.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        # Accumulate dependencies in reverse BFS order
+        delta = [0.0] * n
+        for w in reversed(order):
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += delta[w]
+
+    # Undirected pairs are counted from both ends; scale sample up to all n sources
+    scale = (n / k) / ((n - 1) * (n - 2))
+    return [b * scale for b in bc]
+
+
+def label_propagation(
+    graph: Graph,
+    max_iter: int = LABEL_PROPAGATION_MAX_ITER,
+    seed: int | None = 0,
+) -> list[int]:
+    """Community per node: each node repeatedly adopts its neighbors' most common label.
+
+    Nodes are visited in a seeded random order; ties go to the smallest label so runs
+    are reproducible. Returns the community id (smallest member contact id) per node.
+    Isolated contacts form their own singleton community.
+    """
+    n = len(graph)
+    indptr, indices = graph.indptr, graph.indices
+    labels = list(range(n))
+    rng = random.Random(seed)
+    order = list(range(n))
+    for _ in range(max_iter):
+        rng.shuffle(order)
+        changed = 0
+        for i in order:
+            start, end = indptr[i], indptr[i + 1]
+            if start == end:
+                continue
+            counts = Counter(labels[j] for j in indices[start:end])
+            best = max(counts.values())
+            candidates = [label for label, c in counts.items() if c == best]
+            if labels[i] in candidates:
+                continue
+            labels[i] = min(candidates)
+            changed += 1
+        if not changed:
+            break
+
+    # Relabel each community by its smallest contact id
+    community_of_label: dict[int, int] = {}
+    for i, label in enumerate(labels):
+        cid = graph.node_ids[i]
+        if label not in community_of_label or cid < community_of_label[label]:
+            community_of_label[label] = cid
+    return [community_of_label[label] for label in labels]
+
+
+def force_layout(
+    graph: Graph,
+    initial: list[tuple[float, float] | None] | None = None,
+    mobile: set[int] | None = None,
+    iterations: int = LAYOUT_FULL_ITERATIONS,
+    seed: int | None = 0,
+) -> list[tuple[float, float]]:
+    """Fruchterman-Reingold layout. Returns (x, y) per node.
+
+    Args:
+        initial: Previous position per node (None = place near its positioned
+            neighbors, or randomly when it has none).
+        mobile: Node indices allowed to move; the rest stay fixed but still push
+            and pull. None = every node moves (full layout).
+
+    Repulsion is exact only between nodes in adjacent grid cells (cell = 2 x ideal edge
+    length); distant nodes are summarized per coarse cell. Each iteration stays roughly
+    linear in nodes + edges.
+    """
+    n = len(graph)
+    if n == 0:
+        return []
+    k = LAYOUT_EDGE_LENGTH
+    side = k * math.sqrt(n)
+    rng = random.Random(seed)
+    indptr, indices = graph.indptr, graph.indices
+    initial = initial or [None] * n
+
+    xs = [0.0] * n
+    ys = [0.0] * n
+    unplaced = []
+    for i, pos in enumerate(initial):
+        if pos is None:
+            unplaced.append(i)
+        else:
+            xs[i], ys[i] = pos
+    placed = [pos is not None for pos in initial]
+    for i in unplaced:
+        anchors = [j for j in indices[indptr[i]:indptr[i + 1]] if placed[j]]
+        if anchors:
+            xs[i] = sum(xs[j] for j in anchors) / len(anchors) + rng.uniform(-k, k)
+            ys[i] = sum(ys[j] for j in anchors) / len(anchors) + rng.uniform(-k, k)
+        else:
+            xs[i] = rng.uniform(-side / 2, side / 2)
+            ys[i] = rng.uniform(-side / 2, side / 2)
+        placed[i] = True
+
+    movers = list(range(n)) if mobile is None else sorted(mobile)
+    if not movers:
+        return list(zip(xs, ys))
+    is_mobile = [mobile is None] * n
+    if mobile is not None:
+        for i in movers:
+            is_mobile[i] = True
+
+    cell = 2 * k
+    coarse = LAYOUT_COARSE_CELLS * cell
+    k2 = k * k
+    temperature = side / 10 if mobile is None else 2 * k
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        grid: dict[tuple[int, int], list[int]] = {}
+        far: dict[tuple[int, int], list[float]] = {}  # coarse cell -> [count, sum_x, sum_y]
+        for i in range(n):
+            grid.setdefault((int(xs[i] // cell), int(ys[i] // cell)), []).append(i)
+            acc = far.setdefault((int(xs[i] // coarse), int(ys[i] // coarse)), [0, 0.0, 0.0])
+            acc[0] += 1
+            acc[1] += xs[i]
+            acc[2] += ys[i]
+        far_cells = [(key, c, sx / c, sy / c) for key, (c, sx, sy) in far.items()]
+
+        dx = [0.0] * n
+        dy = [0.0] * n
+        for v in movers:
+            xv, yv = xs[v], ys[v]
+            # Near field: exact repulsion from nodes in the 3x3 fine cells around v
+            gx, gy = int(xv // cell), int(yv // cell)
+            for cx in (gx - 1, gx, gx + 1):
+                for cy in (gy - 1, gy, gy + 1):
+                    for u in grid.get((cx, cy), ()):
+                        if u == v:
+                            continue
+                        ddx, ddy = xv - xs[u], yv - ys[u]
+                        d2 = ddx * ddx + ddy * ddy
+                        if d2 == 0.0:
+                            ddx, ddy, d2 = rng.uniform(-0.1, 0.1), rng.uniform(-0.1, 0.1), 0.01
+                        if d2 < cell * cell:
+                            f = k2 / d2  # (k^2 / d) / d, applied to the unnormalized vector
+                            dx[v] += ddx * f
+                            dy[v] += ddy * f
+            # Far field: each distant coarse cell pushes as one weighted node at its centroid,
+            # which keeps the layout from collapsing into a few dense cells
+            home = (int(xv // coarse), int(yv // coarse))
+            for key, count, mx, my in far_cells:
+                if key == home:
+                    continue
+                ddx, ddy = xv - mx, yv - my
+                f = count * k2 / (ddx * ddx + ddy * ddy)
+                dx[v] += ddx * f
+                dy[v] += ddy * f
+        for v in range(n):
+            for u in indices[indptr[v]:indptr[v + 1]]:
+                if u <= v or not (is_mobile[v] or is_mobile[u]):
+                    continue
+                ddx, ddy = xs[v] - xs[u], ys[v] - ys[u]
+                d = math.sqrt(ddx * ddx + ddy * ddy) or 0.01
+                f = d / k  # (d^2 / k) / d
+                dx[v] -= ddx * f
+                dy[v] -= ddy * f
+                dx[u] += ddx * f
+                dy[u] += ddy * f
+        for v in movers:
+            d = math.sqrt(dx[v] * dx[v] + dy[v] * dy[v])
+            if d > 0:
+                step = min(d, temperature) / d
+                xs[v] += dx[v] * step
+                ys[v] += dy[v] * step
+        temperature -= cooling
+    return list(zip(xs, ys))
+
+
+def upsert_graph_metrics(db: Session, rows: list[dict]) -> None:
+    """Write per-contact metric columns, inserting rows for contacts that have none yet.
+
+    Each row needs contact_id plus the columns to set; other columns are left untouched.
+    Contacts whose map-visible values changed are recorded in the graph change log.
+    Does not commit.
+    """
+    if not rows:
+        return
+    fields = [k for k in rows[0] if k not in ("contact_id", "computed_at", "layout_at")]
+    columns = [getattr(ContactGraphMetrics, k) for k in fields]
+    existing = {
+        r[0]: tuple(r[1:])
+        for r in db.execute(select(ContactGraphMetrics.contact_id, *columns)).all()
+    }
+    to_update = [r for r in rows if r["contact_id"] in existing]
+    to_insert = [r for r in rows if r["contact_id"] not in existing]
+    changed = [r["contact_id"] for r in to_insert] + [
+        r["contact_id"] for r in to_update
+        if tuple(r[k] for k in fields) != existing[r["contact_id"]]
+    ]
+    record_graph_changes(db, "contact", changed)
+    if to_update:
+        db.execute(update(ContactGraphMetrics), to_update)
+    if to_insert:
+        db.execute(insert(ContactGraphMetrics), to_insert)
+
+
+def compute_centrality(db: Session, betweenness_samples: int = BETWEENNESS_SAMPLES) -> dict:
+    """Recompute degree, PageRank and approximate betweenness for every contact. Stores in DB.
+
+    Returns: {contacts, edges, betweenness_samples}
+    """
+    graph = load_graph(db)
+    ranks = pagerank(graph)
+    between = approximate_betweenness(graph, samples=betweenness_samples)
+    now = datetime.now(UTC)
+    upsert_graph_metrics(db, [
+        {
+            "contact_id": cid,
+            "degree": graph.degree(i),
+            "pagerank": round(ranks[i], 8),
+            "betweenness": round(between[i], 8),
+            "computed_at": now,
+        }
+        for i, cid in enumerate(graph.node_ids)
+    ])
+    db.commit()
+    return {
+        "contacts": len(graph),
+        "edges": len(graph.indices) // 2,
+        "betweenness_samples": min(betweenness_samples, len(graph)),
+    }
+
+
+def detect_communities(db: Session) -> dict:
+    """Assign every contact a community_id by label propagation. Stores in DB.
+
+    Returns: {contacts, communities, largest}
+    """
+    graph = load_graph(db)
+    communities = label_propagation(graph)
+    upsert_graph_metrics(db, [
+        {"contact_id": cid, "degree": graph.degree(i), "community_id": communities[i]}
+        for i, cid in enumerate(graph.node_ids)
+    ])
+    db.commit()
+    sizes = Counter(communities)
+    return {
+        "contacts": len(graph),
+        "communities": len(sizes),
+        "largest": max(sizes.values(), default=0),
+    }
+
+
+def update_layout(db: Session, full: bool = False) -> dict:
+    """Refresh cached relationship-map coordinates. Stores in DB.
+
+    Incremental by default: contacts without a position and endpoints of connections
+    added since the last layout run, plus their non-hub neighbors, settle from the cached
+    positions; everyone else stays put. Runs a full layout when nothing is cached yet
+    or full=True.
+
+    Returns: {mode, contacts, moved}
+    """
+    # Watermark taken before the graph is read: connections added while this run computes
+    # are newer than it, so the next incremental run still settles their endpoints
+    now = datetime.now(UTC)
+    graph = load_graph(db)
+    cached = db.query(
+        ContactGraphMetrics.contact_id, ContactGraphMetrics.layout_x, ContactGraphMetrics.layout_y
+    ).filter(ContactGraphMetrics.layout_x.isnot(None), ContactGraphMetrics.layout_y.isnot(None)).all()
+    positions = {cid: (x, y) for cid, x, y in cached}
+    index = {cid: i for i, cid in enumerate(graph.node_ids)}
+
+    if full or not positions:
+        mode = "full"
+        mobile = None
+        coords = force_layout(graph, iterations=LAYOUT_FULL_ITERATIONS)
+    else:
+        mode = "incremental"
+        last_run = db.query(func.max(ContactGraphMetrics.layout_at)).scalar()
+        new_edges = (
+            db.query(ContactConnection.contact_id, ContactConnection.other_contact_id)
+            .filter(ContactConnection.created_at > last_run)
+            .all()
+            if last_run else []
+        )
+        changed = {index[cid] for cid in graph.node_ids if cid not in positions}
+        changed |= {index[cid] for edge in new_edges for cid in edge if cid in index}
+        if not changed:
+            return {"mode": "cached", "contacts": len(graph), "moved": 0}
+        mobile = set(changed)
+        for i in changed:
+            mobile.update(j for j in graph.neighbors(i) if graph.degree(j) <= LAYOUT_NEIGHBOR_MAX_DEGREE)
+        coords = force_layout(
+            graph,
+            initial=[positions.get(cid) for cid in graph.node_ids],
+            mobile=mobile,
+            iterations=LAYOUT_INCREMENTAL_ITERATIONS,
+        )
+
+    moved = range(len(graph)) if mobile is None else sorted(mobile)
+    upsert_graph_metrics(db, [
+        {
+            "contact_id": graph.node_ids[i],
+            "layout_x": round(coords[i][0], 2),
+            "layout_y": round(coords[i][1], 2),
+            "layout_at": now,
+        }
+        for i in moved
+    ])
+    # Stamp fixed contacts too so the next incremental run only sees newer connections
+    db.query(ContactGraphMetrics).update({ContactGraphMetrics.layout_at: now}, synchronize_session=False)
+    db.commit()
+    return {"mode": mode, "contacts": len(graph), "moved": len(moved)}
+
+
+def ego_network(db: Session, contact_id: int, hops: int = 2, max_nodes: int = 100) -> tuple[dict[int, int], bool]:
+    """Contacts within `hops` connections of `contact_id`, at most `max_nodes` (including it).
+
+    Each BFS level is one indexed query for the frontier's connections, so cost depends
+    on the neighborhood, not the whole graph. When a level would exceed max_nodes, the
+    candidates reached by the strongest connection (CONNECTION_TYPE_STRENGTH) are kept,
+    then those with more links into the kept set, then lowest id.
+
+    Returns: ({contact_id: hop}, truncated)
+    """
+    hop_of = {contact_id: 0}
+    frontier = [contact_id]
+    truncated = False
+    for hop in range(1, hops + 1):
+        if not frontier:
+            break
+        rows = db.execute(
+            select(ContactConnection.contact_id, ContactConnection.other_contact_id, ContactConnection.relationship_type)
+            .where(or_(ContactConnection.contact_id.in_(frontier), ContactConnection.other_contact_id.in_(frontier)))
+        ).all()
+        reached = set(frontier)
+        strength: dict[int, int] = {}
+        links: Counter[int] = Counter()
+        for a, b, rel_type in rows:
+            for src, dst in ((a, b), (b, a)):
+                if src in reached and dst not in hop_of:
+                    score = CONNECTION_TYPE_STRENGTH.get(rel_type, 1)
+                    strength[dst] = max(strength.get(dst, 0), score)
+                    links[dst] += 1
+        candidates = sorted(strength, key=lambda cid: (-strength[cid], -links[cid], cid))
+        budget = max_nodes - len(hop_of)
+        if len(candidates) > budget:
+            candidates = candidates[:budget]
+            truncated = True
+        for cid in candidates:
+            hop_of[cid] = hop
+        frontier = candidates
+        if truncated:
+            break
+    return hop_of, truncated
+
+
+def serialize_centrality(metrics: ContactGraphMetrics | None) -> dict | None:
+    """API shape for a contact's stored centrality (None until the job has run)."""
+    if metrics is None:
+        return None
+    return {
+        "degree": metrics.degree,
+        "pagerank": metrics.pagerank,
+        "betweenness": metrics.betweenness,
+        "computed_at": metrics.computed_at.isoformat() if metrics.computed_at else None,
+    }
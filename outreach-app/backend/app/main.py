@@ -9,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 logger = logging.getLogger(__name__)
 
-from app.api import contacts, mentions, outreach, jobs, names_file, relationship_map, digest, reply_drafts
+from app.api import contacts, mentions, outreach, jobs, names_file, relationship_map, digest, reply_drafts, export, events
 from app.scheduler import get_scheduler
 
 
@@ -53,6 +53,8 @@ app.include_router(names_file.router, prefix="/api/names-file", tags=["names-fil
 app.include_router(relationship_map.router, prefix="/api/relationship-map", tags=["relationship-map"])
 app.include_router(digest.router, prefix="/api/digest", tags=["digest"])
 app.include_router(reply_drafts.router, prefix="/api/reply-drafts", tags=["reply-drafts"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
 
 
 @app.get("/")
@@ -6,7 +6,7 @@ Each fetcher returns a list of dicts with keys:
 import logging
 import time
 from datetime import UTC, datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 import httpx
 
@@ -208,14 +208,17 @@ def fetch_media_for_contacts(
     serpapi_key: Optional[str] = None,
     max_per_source: int = 2,
     max_contacts: int = 25,
+    progress: Callable[[dict], None] | None = None,
 ) -> dict:
-    """Batch-fetch media mentions for multiple contacts. Stores in DB.
+    """Batch-fetch media mentions for multiple contacts. Stores in DB, committing after each contact.
 
-    Returns stats: {attempted, added, skipped, sources_used}
-    """
-    from urllib.parse import urlparse, urlunparse
+    Each episode/video/page is stored once (app.articles) and linked to every contact named in it.
+    progress(stats) is called after each contact is committed.
 
-    from app.models import Contact, Mention
+    Returns stats: {attempted, added, co_mentions, skipped, sources_used}
+    """
+    from app.articles import ContactMatcher, ingest_articles
+    from app.models import Contact
 
     if not any([listennotes_key, youtube_key, serpapi_key]):
         return {"attempted": 0, "added": 0, "skipped": 0, "sources_used": [], "message": "No media API keys configured."}
@@ -239,20 +242,8 @@ def fetch_media_for_contacts(
             query = query.filter(Contact.in_mention_rotation == 1)
     contacts = query.order_by(Contact.list_number).limit(max_contacts).all()
 
-    # Build existing URL set for dedup
-    all_contact_ids = [c.id for c in contacts]
-    existing = db.query(Mention).filter(Mention.contact_id.in_(all_contact_ids)).all()
-    seen_urls: set[tuple[int, str]] = set()
-    for m in existing:
-        if m.source_url:
-            try:
-                p = urlparse(m.source_url.strip())
-                norm = urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
-                seen_urls.add((m.contact_id, norm))
-            except ValueError:
-                pass
-
-    stats = {"attempted": 0, "added": 0, "skipped": 0, "sources_used": sources_used}
+    matcher = ContactMatcher.from_db(db)
+    stats = {"attempted": 0, "added": 0, "co_mentions": 0, "skipped": 0, "sources_used": sources_used}
 
     for contact in contacts:
         stats["attempted"] += 1
@@ -264,40 +255,14 @@ def fetch_media_for_contacts(
             serpapi_key=serpapi_key,
             max_per_source=max_per_source,
         )
-
-        for item in results:
-            raw_url = item.get("source_url")
-            if not raw_url:
-                continue
-            try:
-                p = urlparse(raw_url.strip())
-                norm = urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
-            except ValueError:
-                continue
-            if (contact.id, norm) in seen_urls:
-                continue
-            seen_urls.add((contact.id, norm))
-
-            pub = None
-            if item.get("published_at"):
-                try:
-                    pub = datetime.fromisoformat(item["published_at"].replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    pass
-
-            mention = Mention(
-                contact_id=contact.id,
-                source_type=item["source_type"],
-                source_url=raw_url,
-                title=item.get("title", ""),
-                snippet=item.get("snippet", ""),
-                published_at=pub,
-            )
-            db.add(mention)
-            stats["added"] += 1
+        stored = ingest_articles(db, contact.id, results, matcher)
+        for key in ("added", "co_mentions", "skipped"):
+            stats[key] += stored[key]
+        db.commit()
+        if progress:
+            progress({**stats, "total": len(contacts)})
 
         # Rate limit between contacts
         time.sleep(1)
 
-    db.commit()
     return stats
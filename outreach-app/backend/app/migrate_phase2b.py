@@ -6,9 +6,15 @@ from pathlib import Path
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from sqlalchemy import text
-from app.database import engine
-from app.models import Base, Note, ContactConnection, ReplyDraft  # noqa: F401 - register models
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+from app.articles import backfill_articles
+from app.database import analyze_tables, engine
+from app.duplicates import index_contact_names
+from app.near_duplicates import collapse_near_duplicates
+from app.recommendations import refresh_recommendations
+from app.search import install_search_indexes
+from app.models import Base, Mention, Note, ContactConnection, ReplyDraft, ContactGraphMetrics, GraphChange  # noqa: F401 - register models
 
 
 def run():
@@ -76,13 +82,119 @@ def run():
                 pass
             else:
                 raise
+    # Community cluster id on graph metrics (relationship map collapsed view)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE contact_graph_metrics ADD COLUMN community_id INTEGER"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_contact_graph_metrics_community_id "
+                "ON contact_graph_metrics (community_id)"
+            ))
+    except Exception as e:
+        err = str(e).lower()
+        if "duplicate column" in err or "already exists" in err or "no such table" in err:
+            pass
+        else:
+            raise
+    # Cached force-layout coordinates for the relationship map
+    for col_sql in [
+        "ALTER TABLE contact_graph_metrics ADD COLUMN layout_x FLOAT",
+        "ALTER TABLE contact_graph_metrics ADD COLUMN layout_y FLOAT",
+        "ALTER TABLE contact_graph_metrics ADD COLUMN layout_at TIMESTAMP",
+    ]:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(col_sql))
+        except Exception as e:
+            err = str(e).lower()
+            if "duplicate column" in err or "already exists" in err or "no such table" in err:
+                pass
+            else:
+                raise
+    # Marks tags added by warm intro tagging; until now that tag was always automatic
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE contact_tags ADD COLUMN auto INTEGER DEFAULT 0"))
+            conn.execute(text("UPDATE contact_tags SET auto = 1 WHERE tag = 'Warm intro available'"))
+    except Exception as e:
+        err = str(e).lower()
+        if "duplicate column" in err or "already exists" in err or "no such table" in err:
+            pass
+        else:
+            raise
+    # Marks mission_alignment scores set by the user
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE contacts ADD COLUMN mission_alignment_manual INTEGER DEFAULT 0"))
+    except Exception as e:
+        err = str(e).lower()
+        if "duplicate column" in err or "already exists" in err or "no such table" in err:
+            pass
+        else:
+            raise
+    # Materialized recommended contact method (backfilled below)
+    for col_sql in [
+        "ALTER TABLE contacts ADD COLUMN recommended_method VARCHAR(50)",
+        "ALTER TABLE contacts ADD COLUMN recommended_value VARCHAR(500)",
+        "ALTER TABLE contacts ADD COLUMN recommended_available INTEGER",
+        "ALTER TABLE contacts ADD COLUMN recommended_reason VARCHAR(500)",
+    ]:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(col_sql))
+        except Exception as e:
+            err = str(e).lower()
+            if "duplicate column" in err or "already exists" in err or "no such table" in err:
+                pass
+            else:
+                raise
     # Create new tables if they don't exist
     Base.metadata.tables["notes"].create(engine, checkfirst=True)
     Base.metadata.tables["contact_connections"].create(engine, checkfirst=True)
     # Phase 3/4 tables
-    for table_name in ("contact_info", "contact_tags", "reply_drafts"):
+    for table_name in ("contact_info", "contact_tags", "reply_drafts", "contact_graph_metrics", "graph_changes", "contact_name_keys",
+                       "rotation_plan_entries", "articles",
+                       "article_fingerprint_bands", "mention_archive_chunks", "mention_rollups"):
         if table_name in Base.metadata.tables:
             Base.metadata.tables[table_name].create(engine, checkfirst=True)
+    # Mentions link to shared articles (after the articles table exists; backfilled below)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE mentions ADD COLUMN article_id INTEGER REFERENCES articles (id) ON DELETE CASCADE"))
+    except Exception as e:
+        err = str(e).lower()
+        if "duplicate column" in err or "already exists" in err or "no such table" in err:
+            pass
+        else:
+            raise
+    # Full-text search index + sync triggers (backfilled on first run)
+    with engine.begin() as conn:
+        install_search_indexes(conn)
+    # Contacts never given a recommendation (new column, or created outside the ORM)
+    with engine.begin() as conn:
+        missing = [r[0] for r in conn.execute(text("SELECT id FROM contacts WHERE recommended_method IS NULL"))]
+        if missing:
+            refresh_recommendations(conn, missing)
+    # Mention access-path indexes (partial on dismissed = 0); planner statistics once they exist
+    with engine.begin() as conn:
+        existing = {ix["name"] for ix in inspect(conn).get_indexes("mentions")}
+        created = [ix for ix in Mention.__table__.indexes if ix.name not in existing]
+        for index in created:
+            index.create(conn)
+        if created:
+            analyze_tables(conn, "mentions")
+    # Duplicate-detection name keys for contacts that have none yet
+    with engine.begin() as conn:
+        missing = conn.execute(text(
+            "SELECT id, name FROM contacts WHERE id NOT IN (SELECT contact_id FROM contact_name_keys)"
+        )).all()
+        index_contact_names(conn, missing)
+    # Inline mention text moves into shared articles, one per normalized URL
+    with engine.begin() as conn:
+        backfill_articles(conn)
+    # Near-duplicate fingerprints for articles that have none; syndicated copies folded together
+    with engine.begin() as conn, Session(bind=conn) as db:
+        collapse_near_duplicates(db)
     print("Phase 2B+ migration done.")
 
 
@@ -1,7 +1,8 @@
 """SQLAlchemy models for Phase 1 data model."""
 from datetime import UTC, datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Date, Index, Integer, LargeBinary, String, Text, DateTime, ForeignKey, Float, func, select, text
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import column_property, relationship
 
 from app.database import Base
 
@@ -22,7 +23,13 @@ class Contact(Base):
     enrichment_status = Column(String(20), default="pending")  # pending, enriched, failed
     relationship_stage = Column(String(50), nullable=True)  # Cold, Warm, Engaged, Partner-Advocate
     mission_alignment = Column(Float, nullable=True)  # 1-10 score; auto-set from category, user-overridable
+    mission_alignment_manual = Column(Integer, default=0)  # 1 = set by the user; rescoring leaves it alone
     in_mention_rotation = Column(Integer, default=0)  # 1 = include in daily mention fetch (tagged core group)
+    # Recommended contact method, kept in sync by app.recommendations
+    recommended_method = Column(String(50), nullable=True)
+    recommended_value = Column(String(500), nullable=True)
+    recommended_available = Column(Integer, nullable=True)  # 0 or 1
+    recommended_reason = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
@@ -39,6 +46,13 @@ class Contact(Base):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+    graph_metrics = relationship(
+        "ContactGraphMetrics",
+        back_populates="contact",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class ContactInfo(Base):
@@ -46,7 +60,11 @@ class ContactInfo(Base):
     __tablename__ = "contact_info"
 
     id = Column(Integer, primary_key=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    # active_history: moving a row to another contact must also refresh the old one (app.recommendations)
+    contact_id = column_property(
+        Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True),
+        active_history=True,
+    )
     type = Column(String(50), nullable=False)  # email, linkedin, twitter, phone, etc.
     value = Column(String(500), nullable=False)
     is_primary = Column(Integer, default=0)  # 0 or 1
@@ -55,32 +73,137 @@ class ContactInfo(Base):
     contact = relationship("Contact", back_populates="contact_info")
 
 
+# Mention queries almost always skip dismissed rows
+_ACTIVE_MENTIONS = text("dismissed = 0")
+
+
+class Article(Base):
+    """A fetched article, episode or post, stored once however many contacts it mentions."""
+    __tablename__ = "articles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_key = Column(String(1000), nullable=False, unique=True)  # app.articles.normalize_url(source_url)
+    source_type = Column(String(50), nullable=False)
+    source_url = Column(String(1000), nullable=True)
+    title = Column(String(500), nullable=True)
+    snippet = Column(Text, nullable=True)
+    published_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+
+    mentions = relationship("Mention", back_populates="article", passive_deletes=True)
+
+
+class ArticleFingerprintBand(Base):
+    """MinHash LSH bands of an article's text (app.near_duplicates): sharing one makes a near-duplicate candidate."""
+    __tablename__ = "article_fingerprint_bands"
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    band_key = Column(BigInteger, nullable=False, index=True)  # hash of (band number, that band's minhashes)
+
+
+def _article_text(field: str) -> hybrid_property:
+    """Mention text read through its article; mentions stored before articles keep their own copy."""
+    inline = f"_{field}"
+
+    def fget(self):
+        value = getattr(self, inline)
+        return getattr(self.article, field) if value is None and self.article is not None else value
+
+    def fset(self, value):
+        setattr(self, inline, value)
+
+    def expr(cls):
+        shared = select(getattr(Article, field)).where(Article.id == cls.article_id).scalar_subquery()
+        return func.coalesce(getattr(cls, inline), shared)
+
+    def bulk_dml(cls, mapping, value):
+        mapping[inline] = value
+
+    return hybrid_property(fget, fset, expr=expr, bulk_dml_setter=bulk_dml)
+
+
 class Mention(Base):
-    """News/media mention of a contact."""
+    """News/media mention of a contact: a link to a shared Article with this contact's score.
+
+    source_type and published_at are copied from the article (filters and sort keys);
+    title, snippet and source_url read through it.
+    """
     __tablename__ = "mentions"
+    __table_args__ = (
+        # One contact's recent mentions (contact page, per-contact list)
+        Index(
+            "ix_mentions_contact_published_active", "contact_id", "published_at",
+            sqlite_where=_ACTIVE_MENTIONS, postgresql_where=_ACTIVE_MENTIONS,
+        ),
+        # Dashboard window: published_at >= cutoff, or published_at IS NULL and created_at >= cutoff
+        Index(
+            "ix_mentions_published_created_active", "published_at", "created_at",
+            sqlite_where=_ACTIVE_MENTIONS, postgresql_where=_ACTIVE_MENTIONS,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=True, index=True)
     source_type = Column(String(50), nullable=False)  # news, podcast, etc.
-    source_url = Column(String(1000), nullable=True)
-    title = Column(String(500), nullable=True)
-    snippet = Column(Text, nullable=True)
+    # Inline text: only for mentions without an article (NULL on article links)
+    _source_url = Column("source_url", String(1000), nullable=True)
+    _title = Column("title", String(500), nullable=True)
+    _snippet = Column("snippet", Text, nullable=True)
     published_at = Column(DateTime, nullable=True, index=True)
     relevance_score = Column(Float, nullable=True)  # Phase 3
     dismissed = Column(Integer, default=0)  # 1 = dismissed as "not this person"
     dismissed_reason = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), index=True)  # Digest: new since cutoff
+
+    source_url = _article_text("source_url")
+    title = _article_text("title")
+    snippet = _article_text("snippet")
 
     contact = relationship("Contact", back_populates="mentions")
+    article = relationship("Article", back_populates="mentions", lazy="selectin")
     reply_drafts = relationship("ReplyDraft", back_populates="mention", cascade="all, delete-orphan", passive_deletes=True)
 
 
+class MentionArchiveChunk(Base):
+    """Mentions of one contact and month moved out of `mentions` by the retention job (app.retention)."""
+    __tablename__ = "mention_archive_chunks"
+    __table_args__ = (Index("ix_mention_archive_chunks_contact_month", "contact_id", "month"),)
+
+    id = Column(Integer, primary_key=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False, index=True)  # First day of the month the mentions were published in
+    mention_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON lines, one per mention (text included)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+
+
+class MentionRollup(Base):
+    """Counts of archived mentions per contact, month and source type (one row per archive run; sum them)."""
+    __tablename__ = "mention_rollups"
+    __table_args__ = (Index("ix_mention_rollups_contact_month", "contact_id", "month"),)
+
+    id = Column(Integer, primary_key=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False, index=True)
+    source_type = Column(String(50), nullable=False)
+    mentions = Column(Integer, nullable=False, default=0)
+    dismissed = Column(Integer, nullable=False, default=0)
+    scored = Column(Integer, nullable=False, default=0)  # Mentions with a relevance score
+    score_sum = Column(Float, nullable=False, default=0.0)  # Sum of those scores (average = score_sum / scored)
+
+
 class OutreachLog(Base):
     """Log of outreach attempts."""
     __tablename__ = "outreach_log"
 
     id = Column(Integer, primary_key=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    # active_history: moving a row to another contact must also refresh the old one (app.recommendations)
+    contact_id = column_property(
+        Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True),
+        active_history=True,
+    )
     method = Column(String(50), nullable=False)  # email, linkedin, etc.
     subject = Column(String(500), nullable=True)
     content = Column(Text, nullable=True)
@@ -143,6 +266,59 @@ class ContactTag(Base):
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
     tag = Column(String(100), nullable=False, index=True)
+    auto = Column(Integer, default=0)  # 1 = added by warm intro tagging, which may also remove it
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
 
     contact = relationship("Contact", back_populates="tags")
+
+
+class ContactGraphMetrics(Base):
+    """Precomputed network position of a contact in the connection graph (refreshed by nightly job)."""
+    __tablename__ = "contact_graph_metrics"
+
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), primary_key=True)
+    degree = Column(Integer, nullable=False, default=0)  # Distinct connected contacts (either direction)
+    pagerank = Column(Float, nullable=True)  # Sums to 1.0 over all contacts
+    betweenness = Column(Float, nullable=True)  # Normalized 0-1, approximated by source sampling
+    community_id = Column(Integer, nullable=True, index=True)  # Label-propagation cluster; = smallest member contact id
+    layout_x = Column(Float, nullable=True)  # Cached relationship-map position
+    layout_y = Column(Float, nullable=True)
+    layout_at = Column(DateTime, nullable=True)  # Last layout run that covered this contact
+    computed_at = Column(DateTime, default=lambda: datetime.now(UTC))
+
+    contact = relationship("Contact", back_populates="graph_metrics")
+
+
+class GraphChange(Base):
+    """Change log for the relationship map graph. The latest id is the current graph version."""
+    __tablename__ = "graph_changes"
+
+    id = Column(Integer, primary_key=True)  # Graph version after this change
+    entity = Column(String(20), nullable=False)  # contact, connection
+    entity_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), index=True)
+
+
+class ContactNameKey(Base):
+    """Blocking keys for near-duplicate contact lookup (normalized, initial and phonetic name keys)."""
+    __tablename__ = "contact_name_keys"
+
+    id = Column(Integer, primary_key=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    key = Column(String(255), nullable=False, index=True)
+
+
+class RotationPlanEntry(Base):
+    """One contact picked for a day's mention fetch by the rotation planner (app.rotation)."""
+    __tablename__ = "rotation_plan_entries"
+
+    id = Column(Integer, primary_key=True)
+    plan_date = Column(Date, nullable=False, index=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # Fetch order within the day
+    reason = Column(String(20), nullable=False)  # pinned, hot, due
+    score = Column(Float, nullable=True)  # Priority among equally stale contacts
+    heat = Column(Float, nullable=True)  # Heat score when planned
+    days_since_visit = Column(Integer, nullable=True)  # None = never planned before
+    fetched_at = Column(DateTime, nullable=True)  # Set once the fetch for this contact ran
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
@@ -0,0 +1,183 @@
+"""Near-duplicate articles: the same syndicated text under different URLs.
+
+An article's title + snippet is reduced to its set of word 3-grams. Copies
+of one story share most of them (Jaccard similarity 0.8+ even with a
+different headline suffix or source tag); rewrites and other stories share
+few. A MinHash signature (MINHASH_BANDS x MINHASH_ROWS values) estimates
+that similarity, and each band of it is hashed into one LSH key stored in
+article_fingerprint_bands. Texts at NEAR_DUPLICATE_MIN_SIMILARITY almost
+always agree on a whole band, unrelated texts almost never, so a lookup is
+one indexed query for MINHASH_BANDS keys followed by an exact Jaccard check
+of the few articles it returns.
+
+Ingest (app.articles) looks up each new article and links a near-duplicate
+to the stored one instead of storing it again, so every cluster keeps one
+representative: the first article fingerprinted. Articles without bands
+(stored before this, or too short to judge) are picked up by
+collapse_near_duplicates(), which folds their copies the same way.
+"""
+import hashlib
+import random
+import re
+import unicodedata
+from typing import NamedTuple
+
+from sqlalchemy import case, delete, exists, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleFingerprintBand, Mention, ReplyDraft
+
+# Articles sharing at least this share of their word 3-grams are copies
+NEAR_DUPLICATE_MIN_SIMILARITY = 0.6
+
+# Texts shorter than this many words are not fingerprinted (too little to tell copies apart)
+NEAR_DUPLICATE_MIN_WORDS = 8
+
+# 12 bands of 3 minhashes: ~95% of pairs at 0.6 similarity share a band, ~1% at 0.1
+MINHASH_BANDS = 12
+MINHASH_ROWS = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+_SYNC = {"synchronize_session": False}
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+class Fingerprint(NamedTuple):
+    shingles: frozenset[str]
+    bands: list[int]  # LSH keys, one per band
+
+
+def shingles(text: str) -> frozenset[str]:
+    """Word 3-grams of a text (lowercase, accents and punctuation dropped)."""
+    s = "".join(c for c in unicodedata.normalize("NFKD", text or "") if not unicodedata.combining(c)).lower()
+    words = _WORD_RE.findall(s)
+    return frozenset(" ".join(words[i:i + 3]) for i in range(len(words) - 2))
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def fingerprint(title: str | None, snippet: str | None) -> Fingerprint | None:
+    """Shingles and LSH band keys of an article's text (None below NEAR_DUPLICATE_MIN_WORDS words)."""
+    grams = shingles(" ".join(filter(None, [title, snippet])))
+    if len(grams) < NEAR_DUPLICATE_MIN_WORDS - 2:
+        return None
+    hashed = [_hash64(g) & ((1 << 64) - 1) for g in grams]
+    signature = [min((a * h + b) % _PRIME for h in hashed) for a, b in _PERMUTATIONS]
+    bands = [
+        _hash64(f"{band}:" + ",".join(map(str, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])))
+        for band in range(MINHASH_BANDS)
+    ]
+    return Fingerprint(grams, bands)
+
+
+def find_near_duplicate(db: Session, fp: Fingerprint | None) -> int | None:
+    """Id of the oldest fingerprinted article with at least NEAR_DUPLICATE_MIN_SIMILARITY to `fp`, if any."""
+    if fp is None:
+        return None
+    candidates = db.execute(
+        select(Article.id, Article.title, Article.snippet)
+        .where(Article.id.in_(
+            select(ArticleFingerprintBand.article_id).where(ArticleFingerprintBand.band_key.in_(fp.bands))
+        ))
+        .order_by(Article.id)
+    ).all()
+    for aid, title, snippet in candidates:
+        if similarity(fp.shingles, shingles(" ".join(filter(None, [title, snippet])))) >= NEAR_DUPLICATE_MIN_SIMILARITY:
+            return aid
+    return None
+
+
+def index_fingerprint(connection, article_id: int, fp: Fingerprint) -> None:
+    """Store an article's LSH band keys. Does not commit."""
+    connection.execute(
+        ArticleFingerprintBand.__table__.insert(),
+        [{"article_id": article_id, "band_key": key} for key in fp.bands],
+    )
+
+
+def fold_articles(db: Session, duplicates: dict[int, int]) -> int:
+    """Relink mentions of each duplicate article to its representative and delete the duplicates.
+
+    duplicates maps article id -> representative id. A contact already linked to the
+    representative keeps that link (reply drafts follow it). Does not commit.
+
+    Returns: number of mention links dropped.
+    """
+    if not duplicates:
+        return 0
+    targets = set(duplicates.values())
+    links = db.execute(
+        select(Mention.id, Mention.article_id, Mention.contact_id)
+        .where(Mention.article_id.in_([*duplicates, *targets]))
+        .order_by(Mention.id)
+    ).all()
+    kept = {(article_id, contact_id): mid for mid, article_id, contact_id in links if article_id in targets}
+    moves, drops = {}, {}
+    for mid, article_id, contact_id in links:
+        if article_id not in duplicates:
+            continue
+        key = (duplicates[article_id], contact_id)
+        if key in kept:
+            drops[mid] = kept[key]
+        else:
+            kept[key] = mid
+            moves[mid] = duplicates[article_id]
+    if moves:
+        db.execute(
+            update(Mention).where(Mention.id.in_(list(moves))).values(article_id=case(moves, value=Mention.id)),
+            execution_options=_SYNC,
+        )
+    if drops:
+        db.execute(
+            update(ReplyDraft).where(ReplyDraft.mention_id.in_(list(drops)))
+            .values(mention_id=case(drops, value=ReplyDraft.mention_id)),
+            execution_options=_SYNC,
+        )
+        db.execute(delete(Mention).where(Mention.id.in_(list(drops))), execution_options=_SYNC)
+    db.execute(
+        delete(ArticleFingerprintBand).where(ArticleFingerprintBand.article_id.in_(list(duplicates))),
+        execution_options=_SYNC,
+    )
+    db.execute(delete(Article).where(Article.id.in_(list(duplicates))), execution_options=_SYNC)
+    return len(drops)
+
+
+def collapse_near_duplicates(db: Session) -> dict:
+    """Fingerprint articles that have no bands yet (oldest first) and fold their near-duplicates.
+
+    Articles too short to fingerprint are left as they are. Does not commit.
+
+    Returns: {fingerprinted, collapsed, links_dropped}
+    """
+    pending = db.execute(
+        select(Article.id, Article.title, Article.snippet)
+        .where(~exists().where(ArticleFingerprintBand.article_id == Article.id))
+        .order_by(Article.id)
+    ).all()
+    fingerprinted, duplicates = 0, {}
+    for aid, title, snippet in pending:
+        fp = fingerprint(title, snippet)
+        if fp is None:
+            continue
+        fingerprinted += 1
+        representative = find_near_duplicate(db, fp)
+        if representative is not None:
+            duplicates[aid] = representative
+        else:
+            index_fingerprint(db.connection(), aid, fp)
+    return {
+        "fingerprinted": fingerprinted,
+        "collapsed": len(duplicates),
+        "links_dropped": fold_articles(db, duplicates),
+    }
@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Instead of OFFSET, which scans and discards every earlier row, a page
+starts right after the last row of the previous page: WHERE (key, id) is
+past (last_key, last_id), using the index on the sort key. Page N costs
+the same as page 1.
+
+The cursor is opaque to clients: url-safe base64 of [last_key, last_id].
+Sort keys may be NULL; NULLs sort last in both directions.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(key, row_id: int) -> str:
+    """Opaque cursor pointing just past a row with sort key `key` and id `row_id`."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([key, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: type = int) -> tuple:
+    """(key, id) from a cursor; key_type is int or datetime. 400 on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, row_id = json.loads(raw)
+        if key is not None:
+            key = datetime.fromisoformat(key) if key_type is datetime else key_type(key)
+        return key, int(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_order(key_col, id_col, descending: bool = False) -> list:
+    """ORDER BY for keyset pages: key (NULLs last), then id, in the same direction."""
+    if descending:
+        return [key_col.desc().nullslast(), id_col.desc()]
+    return [key_col.asc().nullslast(), id_col.asc()]
+
+
+def keyset_after(key_col, id_col, key, row_id: int, descending: bool = False):
+    """WHERE clause selecting rows after (key, row_id) in keyset_order()."""
+    id_past = id_col < row_id if descending else id_col > row_id
+    if key is None:
+        # Already in the NULL tail
+        return and_(key_col.is_(None), id_past)
+    key_past = key_col < key if descending else key_col > key
+    return or_(key_past, and_(key_col == key, id_past), key_col.is_(None))
+
+
+def keyset_page(
+    query,
+    key_col,
+    id_col,
+    cursor: str | None,
+    limit: int,
+    key_type: type = int,
+    descending: bool = False,
+    skip: int = 0,
+):
+    """Fetch one page of `query` after `cursor` (or at offset `skip`, for old clients).
+
+    Returns: (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        key, row_id = decode_cursor(cursor, key_type)
+        query = query.filter(keyset_after(key_col, id_col, key, row_id, descending))
+    query = query.order_by(*keyset_order(key_col, id_col, descending))
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, key_col.key), getattr(last, id_col.key))
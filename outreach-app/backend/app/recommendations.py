@@ -0,0 +1,240 @@
+"""Recommended contact method per contact, materialized on the contacts row.
+
+get_recommended_method() weighs available contact info, outreach history and
+relationship stage. Its result is stored in Contact.recommended_* columns so
+list endpoints read it without loading contact_info or outreach_log. A Session
+after_flush listener recomputes it only for contacts whose ContactInfo,
+OutreachLog or relationship_stage changed in that flush.
+"""
+from collections import Counter
+
+from sqlalchemy import bindparam, event, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Contact, ContactInfo, OutreachLog
+
+# Priority order for first-contact recommendations
+CONTACT_METHOD_PRIORITY = ["email", "linkedin", "twitter", "website", "other"]
+
+# Stage-specific priority adjustments
+STAGE_PRIORITY = {
+    "Cold": ["email", "linkedin", "twitter", "website", "other"],
+    "Warm": ["linkedin", "email", "twitter", "website", "other"],
+    "Engaged": None,  # Use outreach history to determine
+    "Partner-Advocate": ["email", "linkedin", "twitter", "website", "other"],
+}
+
+
+def get_recommended_method(
+    contact_infos: list,
+    outreach_logs: list | None = None,
+    relationship_stage: str | None = None,
+) -> dict:
+    """Return recommended contact method factoring in availability, outreach history, and relationship stage.
+
+    Priority logic:
+    - Cold contacts: email first (formal, low-pressure)
+    - Warm contacts: LinkedIn preferred (more personal)
+    - Engaged contacts: use whatever method got replies; fall back to most-used
+    - Partner-Advocate: email first (established relationship)
+    - If a method was tried and got a reply, boost it
+    - If a method was tried with no response, deprioritize it
+    """
+    types_present = {ci.type.lower() for ci in contact_infos}
+    outreach_logs = outreach_logs or []
+
+    # Analyze outreach history
+    replied_methods: set[str] = set()
+    no_response_methods: set[str] = set()
+    method_counts: Counter[str] = Counter()
+    for log in outreach_logs:
+        m = (log.method or "").lower()
+        method_counts[m] += 1
+        if log.response_status == "replied":
+            replied_methods.add(m)
+        elif log.response_status in ("no_response", "bounced"):
+            no_response_methods.add(m)
+
+    # Determine base priority order from relationship stage
+    stage = (relationship_stage or "").strip()
+    if stage == "Engaged" and replied_methods:
+        # For engaged contacts, prefer whatever method got replies
+        priority = list(replied_methods) + [m for m in CONTACT_METHOD_PRIORITY if m not in replied_methods]
+    elif stage in STAGE_PRIORITY and STAGE_PRIORITY[stage] is not None:
+        priority = STAGE_PRIORITY[stage]
+    else:
+        priority = list(CONTACT_METHOD_PRIORITY)
+
+    # Boost methods that got replies to the front
+    if replied_methods:
+        boosted = [m for m in priority if m in replied_methods]
+        rest = [m for m in priority if m not in replied_methods]
+        priority = boosted + rest
+
+    # Deprioritize methods that got no response (push to end, but keep available)
+    if no_response_methods and not replied_methods:
+        good = [m for m in priority if m not in no_response_methods]
+        bad = [m for m in priority if m in no_response_methods]
+        priority = good + bad
+
+    # Find the best available method
+    for method in priority:
+        if method in types_present:
+            reason = _build_reason(method, stage, replied_methods, no_response_methods, method_counts)
+            return {"method": method, "value": _best_value(contact_infos, method), "available": True, "reason": reason}
+
+    # Nothing available — suggest based on stage
+    if stage in ("Warm", "Engaged"):
+        return {
+            "method": "linkedin",
+            "value": None,
+            "available": False,
+            "reason": "LinkedIn (not found — add LinkedIn URL to contact info)",
+        }
+    return {
+        "method": "email",
+        "value": None,
+        "available": False,
+        "reason": "Email (not found — add contact info or try enrichment)",
+    }
+
+
+def _best_value(contact_infos: list, method: str) -> str | None:
+    """The contact's primary value for `method`, else the first one."""
+    matches = [ci for ci in contact_infos if ci.type.lower() == method]
+    matches.sort(key=lambda ci: not ci.is_primary)
+    return matches[0].value if matches else None
+
+
+def _build_reason(
+    method: str,
+    stage: str,
+    replied_methods: set[str],
+    no_response_methods: set[str],
+    method_counts: Counter,
+) -> str:
+    """Build a human-readable reason string for the recommendation."""
+    label = method.capitalize()
+    parts: list[str] = []
+
+    if method in replied_methods:
+        parts.append("previously got a reply")
+    elif method_counts.get(method, 0) > 0 and method not in no_response_methods:
+        parts.append(f"used {method_counts[method]}x")
+
+    if stage == "Cold":
+        parts.append("good for cold outreach")
+    elif stage == "Warm" and method == "linkedin":
+        parts.append("personal touch for warm contacts")
+    elif stage == "Engaged" and method in replied_methods:
+        parts.append("proven channel")
+    elif stage == "Partner-Advocate":
+        parts.append("established relationship")
+
+    # Note if other methods were tried without success
+    tried_no_reply = no_response_methods - {method}
+    if tried_no_reply:
+        tried_label = ", ".join(m.capitalize() for m in sorted(tried_no_reply))
+        parts.append(f"{tried_label} tried without reply")
+
+    if parts:
+        return f"{label} ({'; '.join(parts)})"
+    return f"{label} (available)"
+
+
+# --- Materialized recommendation ---
+
+_STORED_FIELDS = ("recommended_method", "recommended_value", "recommended_available", "recommended_reason")
+
+
+def refresh_recommendations(connection, contact_ids=None) -> int:
+    """Recompute and store recommendations for the given contacts (all when None).
+
+    Works on a Connection (or Session) with three set-based reads and one batched UPDATE.
+    Does not commit.
+
+    Returns: number of contacts updated
+    """
+    return len(_store_recommendations(connection, contact_ids))
+
+
+def _store_recommendations(connection, contact_ids=None) -> list[dict]:
+    """refresh_recommendations(), returning the stored rows (b_id + recommended_* columns)."""
+    contacts = Contact.__table__
+    infos = ContactInfo.__table__
+    logs = OutreachLog.__table__
+    stage_q = select(contacts.c.id, contacts.c.relationship_stage)
+    info_q = select(infos.c.contact_id, infos.c.type, infos.c.value, infos.c.is_primary)
+    log_q = select(logs.c.contact_id, logs.c.method, logs.c.response_status)
+    if contact_ids is not None:
+        ids = list(set(contact_ids))
+        if not ids:
+            return []
+        stage_q = stage_q.where(contacts.c.id.in_(ids))
+        info_q = info_q.where(infos.c.contact_id.in_(ids))
+        log_q = log_q.where(logs.c.contact_id.in_(ids))
+
+    infos_by_contact: dict[int, list] = {}
+    for row in connection.execute(info_q):
+        infos_by_contact.setdefault(row.contact_id, []).append(row)
+    logs_by_contact: dict[int, list] = {}
+    for row in connection.execute(log_q):
+        logs_by_contact.setdefault(row.contact_id, []).append(row)
+
+    rows = []
+    for cid, stage in connection.execute(stage_q):
+        rec = get_recommended_method(infos_by_contact.get(cid, []), logs_by_contact.get(cid), stage)
+        rows.append({
+            "b_id": cid,
+            "recommended_method": rec["method"],
+            "recommended_value": rec["value"],
+            "recommended_available": 1 if rec["available"] else 0,
+            "recommended_reason": rec["reason"],
+        })
+    if rows:
+        stmt = (
+            update(contacts)
+            .where(contacts.c.id == bindparam("b_id"))
+            # Not a user edit: leave updated_at alone
+            .values({**{k: bindparam(k) for k in rows[0] if k != "b_id"}, "updated_at": contacts.c.updated_at})
+        )
+        connection.execute(stmt, rows)
+    return rows
+
+
+def serialize_recommendation(contact: Contact) -> dict | None:
+    """API shape of the stored recommendation (None if never computed)."""
+    if contact.recommended_method is None:
+        return None
+    return {
+        "method": contact.recommended_method,
+        "value": contact.recommended_value,
+        "available": bool(contact.recommended_available),
+        "reason": contact.recommended_reason,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_changed_recommendations(session, flush_context):
+    """Recompute recommendations for contacts whose inputs changed in this flush."""
+    changed: set[int] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (ContactInfo, OutreachLog)):
+            changed.add(obj.contact_id)
+            # Moved to another contact: the old one loses this input
+            changed.update(inspect(obj).attrs.contact_id.history.deleted)
+        elif isinstance(obj, Contact):
+            if obj in session.new or inspect(obj).attrs.relationship_stage.history.has_changes():
+                changed.add(obj.id)
+    changed.discard(None)
+    if not changed:
+        return
+    rows = _store_recommendations(session.connection(), changed)
+    # Keep already-loaded contacts consistent with the new column values
+    for row in rows:
+        obj = session.identity_map.get(Session.identity_key(Contact, row["b_id"]))
+        if obj is None:
+            continue
+        for column in _STORED_FIELDS:
+            set_committed_value(obj, column, row[column])
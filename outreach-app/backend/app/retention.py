@@ -0,0 +1,297 @@
+"""Mention retention: old, dismissed and low-score mentions move to a compressed archive.
+
+Mention queries look at the last 7-90 days (dashboard, contact page, hot
+leads, digest), yet `mentions` only ever grew. archive_mentions() moves out:
+- every mention older than MENTION_RETENTION_DAYS,
+- dismissed mentions older than DISMISSED_RETENTION_DAYS,
+- mentions scored below LOW_SCORE_MAX older than LOW_SCORE_RETENTION_DAYS,
+where age is published_at (created_at when unknown). Mentions with reply
+drafts stay. A contact's archived mentions for one month become one
+mention_archive_chunks row: JSON lines, text resolved from the article,
+zlib-compressed together. Articles left without mentions are deleted with
+their fingerprints, so `mentions`, `articles`, their indexes and the
+full-text tables only hold the hot window (SQLite reuses the freed pages).
+
+Each run also adds mention_rollups rows (per contact, month and source type:
+mentions, dismissed, scored, score_sum); mention_history() adds them to the
+live counts, so totals still cover archived mentions.
+
+search_archive() is the slow, on-demand path: it decompresses the chunks in
+range and matches them in Python, each query word as a prefix like the
+full-text search.
+"""
+import json
+import unicodedata
+import zlib
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import and_, delete, exists, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import analyze_tables
+from app.models import (
+    Article,
+    ArticleFingerprintBand,
+    Contact,
+    Mention,
+    MentionArchiveChunk,
+    MentionRollup,
+    ReplyDraft,
+)
+from app.search import search_terms
+
+# Every mention older than this is archived (the longest hot query window is 90 days)
+MENTION_RETENTION_DAYS = 180
+
+# Dismissed ("not this person") and low-score mentions are archived sooner
+DISMISSED_RETENTION_DAYS = 30
+LOW_SCORE_RETENTION_DAYS = 30
+LOW_SCORE_MAX = 0.3  # Below the digest's low-confidence flag
+
+# Mentions moved per transaction
+ARCHIVE_BATCH_SIZE = 2000
+
+_SYNC = {"synchronize_session": False}
+
+_ARCHIVE_COLUMNS = (
+    Mention.id,
+    Mention.contact_id,
+    Mention.article_id,
+    Mention.source_type,
+    func.coalesce(Mention._source_url, Article.source_url).label("source_url"),
+    func.coalesce(Mention._title, Article.title).label("title"),
+    func.coalesce(Mention._snippet, Article.snippet).label("snippet"),
+    Mention.published_at,
+    Mention.created_at,
+    Mention.relevance_score,
+    Mention.dismissed,
+    Mention.dismissed_reason,
+)
+
+
+def _older_than(cutoff: datetime):
+    return or_(
+        Mention.published_at < cutoff,
+        and_(Mention.published_at.is_(None), Mention.created_at < cutoff),
+    )
+
+
+def retention_filter(now: datetime):
+    """WHERE clause for mentions due for the archive at `now`."""
+    return and_(
+        or_(
+            _older_than(now - timedelta(days=MENTION_RETENTION_DAYS)),
+            and_(Mention.dismissed == 1, _older_than(now - timedelta(days=DISMISSED_RETENTION_DAYS))),
+            and_(Mention.relevance_score < LOW_SCORE_MAX, _older_than(now - timedelta(days=LOW_SCORE_RETENTION_DAYS))),
+        ),
+        ~exists().where(ReplyDraft.mention_id == Mention.id),
+    )
+
+
+def _month(when: datetime) -> date:
+    return date(when.year, when.month, 1)
+
+
+def _isoformat(when: datetime | None) -> str | None:
+    return when.isoformat() if when else None
+
+
+def _archive_batch(db: Session, rows: list) -> dict:
+    chunks: dict[tuple, list[str]] = defaultdict(list)
+    rollups: dict[tuple, list] = defaultdict(lambda: [0, 0, 0, 0.0])
+    for row in rows:
+        month = _month(row.published_at or row.created_at)
+        chunks[(row.contact_id, month)].append(json.dumps({
+            **row._asdict(),
+            "published_at": _isoformat(row.published_at),
+            "created_at": _isoformat(row.created_at),
+            "dismissed": bool(row.dismissed),
+        }))
+        counts = rollups[(row.contact_id, month, row.source_type)]
+        counts[0] += 1
+        counts[1] += bool(row.dismissed)
+        if row.relevance_score is not None:
+            counts[2] += 1
+            counts[3] += row.relevance_score
+
+    db.execute(insert(MentionArchiveChunk), [
+        {
+            "contact_id": contact_id,
+            "month": month,
+            "mention_count": len(lines),
+            "payload": zlib.compress("\n".join(lines).encode(), 9),
+        }
+        for (contact_id, month), lines in chunks.items()
+    ])
+    db.execute(insert(MentionRollup), [
+        {
+            "contact_id": contact_id, "month": month, "source_type": source_type,
+            "mentions": n, "dismissed": dismissed, "scored": scored, "score_sum": score_sum,
+        }
+        for (contact_id, month, source_type), (n, dismissed, scored, score_sum) in rollups.items()
+    ])
+    db.execute(delete(Mention).where(Mention.id.in_([row.id for row in rows])), execution_options=_SYNC)
+
+    article_ids = {row.article_id for row in rows if row.article_id is not None}
+    orphans = db.execute(
+        select(Article.id).where(Article.id.in_(article_ids), ~exists().where(Mention.article_id == Article.id))
+    ).scalars().all() if article_ids else []
+    if orphans:
+        db.execute(
+            delete(ArticleFingerprintBand).where(ArticleFingerprintBand.article_id.in_(orphans)),
+            execution_options=_SYNC,
+        )
+        db.execute(delete(Article).where(Article.id.in_(orphans)), execution_options=_SYNC)
+    return {"chunks": len(chunks), "articles_deleted": len(orphans)}
+
+
+def archive_mentions(db: Session, now: datetime | None = None) -> dict:
+    """Move mentions due under the retention policy into the archive and rollups.
+
+    Works in batches of ARCHIVE_BATCH_SIZE, committing after each; refreshes the
+    mentions planner statistics when anything moved.
+
+    Returns: {archived, chunks, articles_deleted}
+    """
+    now = now or datetime.now(UTC)
+    stats = {"archived": 0, "chunks": 0, "articles_deleted": 0}
+    while True:
+        rows = db.execute(
+            select(*_ARCHIVE_COLUMNS)
+            .outerjoin(Article, Article.id == Mention.article_id)
+            .where(retention_filter(now))
+            .order_by(Mention.id)
+            .limit(ARCHIVE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        batch = _archive_batch(db, rows)
+        db.commit()
+        stats["archived"] += len(rows)
+        stats["chunks"] += batch["chunks"]
+        stats["articles_deleted"] += batch["articles_deleted"]
+    if stats["archived"]:
+        analyze_tables(db.connection(), "mentions", "articles")
+        db.commit()
+    return stats
+
+
+def _fold(text: str | None) -> str:
+    s = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+
+def _matches(terms: list[str], text: str) -> bool:
+    words = search_terms(text)
+    return all(any(w.startswith(t) for w in words) for t in terms)
+
+
+def search_archive(
+    db: Session,
+    q: str,
+    days: int | None = None,
+    contact_id: int | None = None,
+    include_dismissed: bool = False,
+    skip: int = 0,
+    limit: int = 50,
+) -> dict:
+    """Keyword search over archived mentions: every word of `q` as a prefix of a title/snippet word.
+
+    Slow: every chunk in range (by contact and month) is decompressed. Title matches
+    rank first, then newest.
+
+    Returns: {total, mentions}; mentions carry the mentions API fields plus archived=True.
+    """
+    terms = [_fold(t) for t in search_terms(q)]
+    if not terms:
+        return {"total": 0, "mentions": []}
+    query = select(MentionArchiveChunk.contact_id, MentionArchiveChunk.payload)
+    cutoff = None
+    if days is not None:
+        cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
+        query = query.where(MentionArchiveChunk.month >= _month(cutoff))
+    if contact_id is not None:
+        query = query.where(MentionArchiveChunk.contact_id == contact_id)
+
+    hits = []
+    for chunk_contact_id, payload in db.execute(query).yield_per(100):
+        for line in zlib.decompress(payload).decode().splitlines():
+            m = json.loads(line)
+            if m["dismissed"] and not include_dismissed:
+                continue
+            when = m["published_at"] or m["created_at"]
+            if cutoff is not None and when and datetime.fromisoformat(when).replace(tzinfo=None) < cutoff:
+                continue
+            title, snippet = _fold(m["title"]), _fold(m["snippet"])
+            if not _matches(terms, f"{title} {snippet}"):
+                continue
+            m["contact_id"] = chunk_contact_id  # Chunks follow contact merges; the line keeps the old id
+            hits.append((_matches(terms, title), when or "", m))
+    hits.sort(key=lambda h: (h[0], h[1]), reverse=True)
+
+    page = [m for _, _, m in hits[skip:skip + limit]]
+    names = dict(db.execute(
+        select(Contact.id, Contact.name).where(Contact.id.in_({m["contact_id"] for m in page}))
+    ).all())
+    fields = ("id", "contact_id", "source_type", "source_url", "title", "snippet", "published_at",
+              "created_at", "relevance_score")
+    return {
+        "total": len(hits),
+        "mentions": [
+            {**{f: m[f] for f in fields}, "contact_name": names.get(m["contact_id"]), "archived": True}
+            for m in page
+        ],
+    }
+
+
+def mention_history(db: Session, contact_id: int | None = None, months: int = 12) -> list[dict]:
+    """Monthly mention counts over the last `months` months, live and archived together.
+
+    Returns: [{month, mentions, dismissed, archived, avg_relevance}] oldest first (months with mentions only).
+    """
+    today = datetime.now(UTC).date()
+    first = date(today.year, today.month, 1)
+    for _ in range(months - 1):
+        first = _month(first - timedelta(days=1))
+    since = datetime(first.year, first.month, 1, tzinfo=UTC)
+
+    totals: dict[date, list] = defaultdict(lambda: [0, 0, 0, 0, 0.0])  # mentions, dismissed, archived, scored, sum
+    live = select(Mention.published_at, Mention.created_at, Mention.dismissed, Mention.relevance_score).where(
+        or_(Mention.published_at >= since, and_(Mention.published_at.is_(None), Mention.created_at >= since))
+    )
+    rolled = select(
+        MentionRollup.month,
+        func.sum(MentionRollup.mentions),
+        func.sum(MentionRollup.dismissed),
+        func.sum(MentionRollup.scored),
+        func.sum(MentionRollup.score_sum),
+    ).where(MentionRollup.month >= first).group_by(MentionRollup.month)
+    if contact_id is not None:
+        live = live.where(Mention.contact_id == contact_id)
+        rolled = rolled.where(MentionRollup.contact_id == contact_id)
+
+    for published_at, created_at, dismissed, score in db.execute(live):
+        t = totals[_month(published_at or created_at)]
+        t[0] += 1
+        t[1] += bool(dismissed)
+        if score is not None:
+            t[3] += 1
+            t[4] += score
+    for month, n, dismissed, scored, score_sum in db.execute(rolled):
+        t = totals[month]
+        t[0] += n
+        t[1] += dismissed
+        t[2] += n
+        t[3] += scored
+        t[4] += score_sum
+    return [
+        {
+            "month": month.isoformat(),
+            "mentions": n,
+            "dismissed": dismissed,
+            "archived": archived,
+            "avg_relevance": round(score_sum / scored, 3) if scored else None,
+        }
+        for month, (n, dismissed, archived, scored, score_sum) in sorted(totals.items())
+    ]
@@ -0,0 +1,222 @@
+"""Automatic mention rotation: which contacts get a mention fetch each day.
+
+The daily budget is what the fetch providers' quotas still allow today (one
+request per contact per configured provider). Slots are filled in order:
+1. pinned: contacts flagged in_mention_rotation (the manual core group),
+2. hot: up to ROTATION_HOT_SHARE of the budget for contacts with recent
+   mention activity, unless visited in the last ROTATION_HOT_MIN_GAP_DAYS,
+3. due: everyone else. Contacts not visited for a full cycle (or never)
+   come first, least recently visited first; the rest by priority
+   (staleness, heat, mission alignment).
+With D due slots a day a cycle is ceil(contacts / D) days, so the whole list
+is covered round-robin while hot contacts come back more often.
+
+Contacts already reached out to are left out, as in scripts/fetch_mentions.py.
+Plans are stored in rotation_plan_entries; the fetch marks rows fetched_at
+as it goes, and only fetched rows count as visits.
+"""
+import math
+from datetime import UTC, date, datetime
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Contact, OutreachLog, RotationPlanEntry
+from app.scoring import contact_heat
+
+# Share of the daily budget reserved for hot contacts
+ROTATION_HOT_SHARE = 0.25
+
+# Heat score from which a contact counts as hot (see app.scoring.contact_heat)
+ROTATION_HOT_MIN_HEAT = 0.3
+
+# Hot contacts are revisited at most this often
+ROTATION_HOT_MIN_GAP_DAYS = 2
+
+# Mention window the heat score is computed over
+ROTATION_HEAT_DAYS = 7
+
+# Priority weights for due contacts (staleness is relative to the cycle length)
+ROTATION_WEIGHTS = {"staleness": 0.5, "heat": 0.3, "alignment": 0.2}
+
+
+def _today() -> date:
+    return datetime.now(UTC).date()
+
+
+def _fetched_on(day: date):
+    return (RotationPlanEntry.plan_date == day) & RotationPlanEntry.fetched_at.is_not(None)
+
+
+def remaining_quota(db: Session, day: date | None = None) -> int:
+    """Contacts that can still be fetched on `day` within the configured providers' daily quotas."""
+    day = day or _today()
+    quotas = [
+        quota
+        for key, quota in (
+            (settings.newsapi_key, settings.newsapi_daily_quota),
+            (settings.serper_api_key, settings.serper_daily_quota),
+        )
+        if key
+    ]
+    quota = min(quotas) if quotas else settings.newsapi_daily_quota
+    used = db.query(func.count(RotationPlanEntry.id)).filter(_fetched_on(day)).scalar() or 0
+    return max(0, quota - used)
+
+
+def plan_rotation(db: Session, day: date | None = None, budget: int | None = None) -> dict:
+    """Pick and store the contacts to fetch on `day` (default today), replacing its unfetched entries.
+
+    budget defaults to remaining_quota(). Contacts already fetched that day are kept and skipped.
+    Does not commit.
+
+    Returns: {date, budget, cycle_days, candidates, planned: {pinned, hot, due}, entries}
+    """
+    day = day or _today()
+    budget = remaining_quota(db, day) if budget is None else max(0, budget)
+
+    db.execute(delete(RotationPlanEntry).where(
+        RotationPlanEntry.plan_date == day, RotationPlanEntry.fetched_at.is_(None),
+    ))
+    done_today = set(db.execute(select(RotationPlanEntry.contact_id).where(_fetched_on(day))).scalars())
+    next_position = (
+        db.query(func.max(RotationPlanEntry.position)).filter(RotationPlanEntry.plan_date == day).scalar() or 0
+    ) + 1
+
+    last_visit = (
+        select(RotationPlanEntry.contact_id, func.max(RotationPlanEntry.plan_date).label("visited"))
+        .where(RotationPlanEntry.fetched_at.is_not(None), RotationPlanEntry.plan_date < day)
+        .group_by(RotationPlanEntry.contact_id)
+        .subquery()
+    )
+    contacted = select(OutreachLog.contact_id).distinct()
+    rows = db.execute(
+        select(Contact.id, Contact.list_number, Contact.mission_alignment, Contact.in_mention_rotation, last_visit.c.visited)
+        .outerjoin(last_visit, last_visit.c.contact_id == Contact.id)
+        .where(Contact.id.notin_(contacted))
+        .order_by(Contact.list_number.asc().nullslast(), Contact.id)
+    ).all()
+    heat = {cid: h["heat_score"] for cid, h in contact_heat(db, ROTATION_HEAT_DAYS).items()}
+
+    candidates = []
+    for cid, _, alignment, pinned, visited in rows:
+        if cid in done_today:
+            continue
+        candidates.append({
+            "contact_id": cid,
+            "pinned": bool(pinned),
+            "heat": heat.get(cid, 0.0),
+            "alignment": (alignment or 5.0) / 10,
+            "days_since_visit": (day - visited).days if visited else None,
+        })
+
+    picked: list[tuple[dict, str, float | None]] = []
+    pinned = [c for c in candidates if c["pinned"]][:budget]
+    picked += [(c, "pinned", None) for c in pinned]
+
+    hot_slots = min(budget - len(picked), math.ceil(budget * ROTATION_HOT_SHARE))
+    hot = sorted(
+        (
+            c for c in candidates
+            if not c["pinned"] and c["heat"] >= ROTATION_HOT_MIN_HEAT
+            and (c["days_since_visit"] is None or c["days_since_visit"] >= ROTATION_HOT_MIN_GAP_DAYS)
+        ),
+        key=lambda c: -c["heat"],
+    )[:hot_slots]
+    picked += [(c, "hot", None) for c in hot]
+
+    taken = {c["contact_id"] for c, _, _ in picked}
+    rest = [c for c in candidates if c["contact_id"] not in taken and not c["pinned"]]
+    due_slots = budget - len(picked)
+    cycle_days = math.ceil(len(rest) / due_slots) if due_slots > 0 and rest else None
+
+    def priority(c: dict) -> float:
+        days = c["days_since_visit"]
+        staleness = 1.0 if days is None or not cycle_days else min(1.0, days / cycle_days)
+        return round(
+            ROTATION_WEIGHTS["staleness"] * staleness
+            + ROTATION_WEIGHTS["heat"] * c["heat"]
+            + ROTATION_WEIGHTS["alignment"] * c["alignment"],
+            3,
+        )
+
+    def due_order(c: dict):
+        days = c["days_since_visit"]
+        overdue = days is None or (cycle_days is not None and days >= cycle_days)
+        # Overdue: least recently visited first (never = first); then by priority. sorted() is stable,
+        # so list order breaks the remaining ties.
+        return (not overdue, -(days if days is not None else math.inf) if overdue else 0, -priority(c))
+
+    picked += [(c, "due", priority(c)) for c in sorted(rest, key=due_order)[:max(0, due_slots)]]
+
+    entries = [
+        {
+            "plan_date": day,
+            "contact_id": c["contact_id"],
+            "position": next_position + i,
+            "reason": reason,
+            "score": score,
+            "heat": c["heat"],
+            "days_since_visit": c["days_since_visit"],
+        }
+        for i, (c, reason, score) in enumerate(picked)
+    ]
+    if entries:
+        db.execute(RotationPlanEntry.__table__.insert(), entries)
+    return {
+        "date": day.isoformat(),
+        "budget": budget,
+        "cycle_days": cycle_days,
+        "candidates": len(candidates),
+        "planned": {reason: sum(1 for _, r, _ in picked if r == reason) for reason in ("pinned", "hot", "due")},
+        "entries": get_rotation_plan(db, day)["entries"],
+    }
+
+
+def get_rotation_plan(db: Session, day: date | None = None) -> dict:
+    """The stored plan for `day` (default today), in fetch order.
+
+    Returns: {date, count, fetched, entries: [{contact_id, name, position, reason, score, heat,
+              days_since_visit, fetched_at}]}
+    """
+    day = day or _today()
+    rows = db.execute(
+        select(RotationPlanEntry, Contact.name)
+        .join(Contact, Contact.id == RotationPlanEntry.contact_id)
+        .where(RotationPlanEntry.plan_date == day)
+        .order_by(RotationPlanEntry.position)
+    ).all()
+    entries = [
+        {
+            "contact_id": e.contact_id,
+            "name": name,
+            "position": e.position,
+            "reason": e.reason,
+            "score": e.score,
+            "heat": e.heat,
+            "days_since_visit": e.days_since_visit,
+            "fetched_at": e.fetched_at.isoformat() if e.fetched_at else None,
+        }
+        for e, name in rows
+    ]
+    return {
+        "date": day.isoformat(),
+        "count": len(entries),
+        "fetched": sum(1 for e in entries if e["fetched_at"]),
+        "entries": entries,
+    }
+
+
+def mark_fetched(db: Session, contact_ids: list[int], day: date | None = None) -> int:
+    """Record that the planned fetch ran for these contacts. Does not commit."""
+    return db.execute(
+        update(RotationPlanEntry)
+        .where(
+            RotationPlanEntry.plan_date == (day or _today()),
+            RotationPlanEntry.contact_id.in_(contact_ids),
+            RotationPlanEntry.fetched_at.is_(None),
+        )
+        .values(fetched_at=datetime.now(UTC)),
+        execution_options={"synchronize_session": False},
+    ).rowcount or 0
@@ -6,36 +6,68 @@ from pathlib import Path
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.database import SessionLocal
+from app.database import SessionLocal, analyze_tables
 from app.discovery import discover_from_mentions
+from app.events import latest_mention_id, publish_new_mentions
+from app.graph_changes import prune_graph_changes
+from app.graph_metrics import compute_centrality, detect_communities, update_layout
+from app.retention import archive_mentions
 from app.scoring import score_all_mentions
 
 
 def run_fetch_mentions():
-    """Run the fetch_mentions script as a subprocess, then auto-discover connections from new mentions."""
+    """Run the fetch_mentions script over today's rotation plan (app.rotation) as a subprocess,
+    announce its mentions on the event stream, then auto-discover connections from new mentions."""
     base = Path(__file__).resolve().parent.parent.parent  # outreach-app/
     script = base / "scripts" / "fetch_mentions.py"
-    if script.exists():
-        env = {"PYTHONPATH": str(base / "backend")}
-        subprocess.run(
-            [sys.executable, str(script), "--limit", "50", "--days", "3", "--max-per-contact", "2"],
-            cwd=str(base),
-            env={**__import__("os").environ, **env},
-            capture_output=True,
-            timeout=600,  # 10 min max
-        )
-    # Agentic: auto-discover connections from mention text (no extra API calls)
     db = SessionLocal()
     try:
+        seen = latest_mention_id(db)
+        db.rollback()
+        if script.exists():
+            env = {"PYTHONPATH": str(base / "backend")}
+            subprocess.run(
+                [sys.executable, str(script), "--plan", "--days", "3", "--max-per-contact", "2"],
+                cwd=str(base),
+                env={**__import__("os").environ, **env},
+                capture_output=True,
+                timeout=600,  # 10 min max
+            )
+        publish_new_mentions(db, seen)
+        # Agentic: auto-discover connections from mention text (no extra API calls)
         result = discover_from_mentions(db)
         if result.get("added", 0) > 0:
-            pass  # Logged via discovery
+            update_layout(db)  # Settle only the part of the map the new connections touch
         # Auto-score any unscored mentions
         score_all_mentions(db)
     finally:
         db.close()
 
 
+def run_compute_centrality():
+    """Nightly: recompute network centrality (degree, PageRank, betweenness), communities and map layout.
+    Also prunes old relationship map change log rows and refreshes mention query planner statistics."""
+    db = SessionLocal()
+    try:
+        compute_centrality(db)
+        detect_communities(db)
+        update_layout(db)
+        prune_graph_changes(db)
+        analyze_tables(db.connection(), "mentions")
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_archive_mentions():
+    """Nightly: move mentions past their retention window to the compressed archive (app.retention)."""
+    db = SessionLocal()
+    try:
+        archive_mentions(db)
+    finally:
+        db.close()
+
+
 def get_scheduler() -> BackgroundScheduler:
     """Create and configure the scheduler."""
     scheduler = BackgroundScheduler()
@@ -46,4 +78,18 @@ def get_scheduler() -> BackgroundScheduler:
         id="fetch_mentions",
         replace_existing=True,
     )
+    # Nightly at 2:00 AM, after the day's connection discovery has settled
+    scheduler.add_job(
+        run_compute_centrality,
+        CronTrigger(hour=2, minute=0),
+        id="compute_centrality",
+        replace_existing=True,
+    )
+    # Nightly at 3:00 AM, after the metrics run
+    scheduler.add_job(
+        run_archive_mentions,
+        CronTrigger(hour=3, minute=0),
+        id="archive_mentions",
+        replace_existing=True,
+    )
     return scheduler
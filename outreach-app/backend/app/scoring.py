@@ -164,21 +164,10 @@ def score_all_mentions(db: Session, contact_id: int | None = None, rescore: bool
 
 # --- Hot lead detection ---
 
-def get_hot_leads(
-    db: Session,
-    days: int = 7,
-    min_mentions: int = 2,
-    min_avg_score: float = 0.4,
-    limit: int = 10,
-) -> list[dict]:
-    """Identify contacts with unusual recent activity (hot leads).
-
-    Criteria (any of):
-      - >= min_mentions in the last `days` days
-      - Average relevance_score >= min_avg_score
-      - Mentions across 2+ source types (cross-platform visibility)
+def contact_heat(db: Session, days: int = 7) -> dict[int, dict]:
+    """Mention activity of every contact mentioned in the last `days` days.
 
-    Returns list sorted by heat_score (composite).
+    Returns: {contact_id: {mention_count, avg_relevance, source_type_count, heat_score}}
     """
     cutoff = datetime.now(UTC) - timedelta(days=days)
 
@@ -197,9 +186,8 @@ def get_hot_leads(
         .all()
     )
 
-    hot = []
-    for row in stats:
-        cid, count, avg_sc, src_types = row
+    heat = {}
+    for cid, count, avg_sc, src_types in stats:
         avg_sc = avg_sc or 0.0
 
         # Heat score: weighted combination
@@ -207,21 +195,39 @@ def get_hot_leads(
         quality_score = avg_sc
         diversity_score = min(1.0, src_types / HOT_LEAD_DIVERSITY_CAP)
 
-        heat = round(
-            0.40 * volume_score + 0.35 * quality_score + 0.25 * diversity_score,
-            3,
-        )
+        heat[cid] = {
+            "mention_count": count,
+            "avg_relevance": round(avg_sc, 3),
+            "source_type_count": src_types,
+            "heat_score": round(0.40 * volume_score + 0.35 * quality_score + 0.25 * diversity_score, 3),
+        }
+    return heat
 
+
+def get_hot_leads(
+    db: Session,
+    days: int = 7,
+    min_mentions: int = 2,
+    min_avg_score: float = 0.4,
+    limit: int = 10,
+) -> list[dict]:
+    """Identify contacts with unusual recent activity (hot leads).
+
+    Criteria (any of):
+      - >= min_mentions in the last `days` days
+      - Average relevance_score >= min_avg_score
+      - Mentions across 2+ source types (cross-platform visibility)
+
+    Returns list sorted by heat_score (composite).
+    """
+    hot = [
+        {"contact_id": cid, **stats}
+        for cid, stats in contact_heat(db, days).items()
         # Only flag if meaningful activity
-        is_hot = count >= min_mentions or avg_sc >= min_avg_score or src_types >= 2
-        if is_hot:
-            hot.append({
-                "contact_id": cid,
-                "mention_count": count,
-                "avg_relevance": round(avg_sc, 3),
-                "source_type_count": src_types,
-                "heat_score": heat,
-            })
+        if stats["mention_count"] >= min_mentions
+        or stats["avg_relevance"] >= min_avg_score
+        or stats["source_type_count"] >= 2
+    ]
 
     # Sort by heat score descending
     hot.sort(key=lambda x: x["heat_score"], reverse=True)
@@ -0,0 +1,314 @@
+"""Full-text search indexes, kept in sync by database triggers.
+
+Contacts -- SQLite: an FTS5 table with rowid = contacts.id, ranked with
+bm25() (column weights favor name, then role/org). Postgres: a
+contact_search side table holding a weighted tsvector with a GIN index,
+ranked with ts_rank_cd(). Indexed fields: name, category, bio, role_org,
+primary_interests, plus the text of all the contact's notes. Triggers on
+contacts and notes refresh a contact's row on every write, including bulk
+UPDATEs that bypass the ORM.
+
+Mentions -- SQLite: external-content FTS5 tables over articles.title and
+snippet, and over the inline text of mentions stored without an article (no
+second copy of the text), synced by triggers. Postgres: generated tsvector
+columns on both tables with GIN indexes. A mention matches through its
+article or its own text. Title matches weigh more than snippet matches.
+
+Queries match every word, each as a prefix ("comp gov" finds "compute
+governance").
+
+The indexes are created after Base.metadata.create_all (and by the
+migration for existing databases) and backfilled when first created.
+Databases without FTS support fall back to ILIKE search.
+"""
+import logging
+import re
+
+from sqlalchemy import Float, Integer, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import Base
+from app.models import Mention
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights, in contacts_fts column order
+CONTACT_FTS_WEIGHTS = {"name": 10.0, "category": 2.0, "bio": 1.0, "role_org": 3.0, "interests": 2.0, "notes": 1.0}
+
+_NOTES_TEXT = "(SELECT group_concat(note_text, ' ') FROM notes WHERE contact_id = {cid})"
+
+_SQLITE_CONTACT_ROW = (
+    "INSERT INTO contacts_fts (rowid, name, category, bio, role_org, interests, notes) "
+    "SELECT id, name, category, bio, role_org, primary_interests, " + _NOTES_TEXT.format(cid="contacts.id") + " "
+    "FROM contacts WHERE id = {cid};"
+)
+
+SQLITE_CONTACT_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5("
+    "name, category, bio, role_org, interests, notes, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+    + _SQLITE_CONTACT_ROW.format(cid="new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_au "
+    "AFTER UPDATE OF name, category, bio, role_org, primary_interests ON contacts BEGIN "
+    "DELETE FROM contacts_fts WHERE rowid = old.id; "
+    + _SQLITE_CONTACT_ROW.format(cid="new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+    "DELETE FROM contacts_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN "
+    "UPDATE contacts_fts SET notes = " + _NOTES_TEXT.format(cid="new.contact_id")
+    + " WHERE rowid = new.contact_id; END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE ON notes BEGIN "
+    "UPDATE contacts_fts SET notes = " + _NOTES_TEXT.format(cid="old.contact_id")
+    + " WHERE rowid = old.contact_id; "
+    "UPDATE contacts_fts SET notes = " + _NOTES_TEXT.format(cid="new.contact_id")
+    + " WHERE rowid = new.contact_id; END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN "
+    "UPDATE contacts_fts SET notes = " + _NOTES_TEXT.format(cid="old.contact_id")
+    + " WHERE rowid = old.contact_id; END",
+]
+
+SQLITE_CONTACT_SEARCH_REBUILD = [
+    "DELETE FROM contacts_fts",
+    _SQLITE_CONTACT_ROW.replace(" WHERE id = {cid};", ""),
+]
+
+POSTGRES_CONTACT_SEARCH_DDL = [
+    "CREATE TABLE IF NOT EXISTS contact_search ("
+    "contact_id INTEGER PRIMARY KEY REFERENCES contacts(id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_contact_search_document ON contact_search USING GIN (document)",
+    """CREATE OR REPLACE FUNCTION contact_search_refresh(cid INTEGER) RETURNS void AS $$
+        INSERT INTO contact_search (contact_id, document)
+        SELECT c.id,
+            setweight(to_tsvector('simple', coalesce(c.name, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(c.role_org, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(c.category, '') || ' ' || coalesce(c.primary_interests, '')), 'C')
+            || setweight(to_tsvector('simple', coalesce(c.bio, '') || ' ' || coalesce(
+                (SELECT string_agg(n.note_text, ' ') FROM notes n WHERE n.contact_id = c.id), '')), 'D')
+        FROM contacts c WHERE c.id = cid
+        ON CONFLICT (contact_id) DO UPDATE SET document = EXCLUDED.document;
+    $$ LANGUAGE sql""",
+    """CREATE OR REPLACE FUNCTION contacts_search_sync() RETURNS trigger AS $$
+    BEGIN
+        PERFORM contact_search_refresh(NEW.id);
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION notes_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN PERFORM contact_search_refresh(OLD.contact_id); END IF;
+        IF TG_OP <> 'DELETE' THEN PERFORM contact_search_refresh(NEW.contact_id); END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS contacts_search_sync ON contacts",
+    "CREATE TRIGGER contacts_search_sync AFTER INSERT OR UPDATE OF name, category, bio, role_org, primary_interests "
+    "ON contacts FOR EACH ROW EXECUTE FUNCTION contacts_search_sync()",
+    "DROP TRIGGER IF EXISTS notes_search_sync ON notes",
+    "CREATE TRIGGER notes_search_sync AFTER INSERT OR UPDATE OR DELETE "
+    "ON notes FOR EACH ROW EXECUTE FUNCTION notes_search_sync()",
+]
+
+POSTGRES_CONTACT_SEARCH_REBUILD = [
+    "SELECT contact_search_refresh(id) FROM contacts",
+]
+
+# bm25 column weights, in mentions_fts column order
+MENTION_FTS_WEIGHTS = {"title": 3.0, "snippet": 1.0}
+
+SQLITE_MENTION_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mentions_fts USING fts5("
+    "title, snippet, content = 'mentions', content_rowid = 'id', "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS mentions_fts_ai AFTER INSERT ON mentions BEGIN "
+    "INSERT INTO mentions_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS mentions_fts_au AFTER UPDATE OF title, snippet ON mentions BEGIN "
+    "INSERT INTO mentions_fts (mentions_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet); "
+    "INSERT INTO mentions_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS mentions_fts_ad AFTER DELETE ON mentions BEGIN "
+    "INSERT INTO mentions_fts (mentions_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet); END",
+]
+
+SQLITE_MENTION_SEARCH_REBUILD = [
+    "INSERT INTO mentions_fts (mentions_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_MENTION_SEARCH_DDL = [
+    "ALTER TABLE mentions ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(snippet, '')), 'D')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_mentions_search_vector ON mentions USING GIN (search_vector)",
+]
+
+SQLITE_ARTICLE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, snippet, content = 'articles', content_rowid = 'id', "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, snippet ON articles BEGIN "
+    "INSERT INTO articles_fts (articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet); "
+    "INSERT INTO articles_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts (articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet); END",
+]
+
+SQLITE_ARTICLE_SEARCH_REBUILD = [
+    "INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_ARTICLE_SEARCH_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(snippet, '')), 'D')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+
+# Index name -> dialect -> (table whose existence marks the index installed, DDL, rebuild)
+SEARCH_INDEXES = {
+    "contacts": {
+        "sqlite": ("contacts_fts", SQLITE_CONTACT_SEARCH_DDL, SQLITE_CONTACT_SEARCH_REBUILD),
+        "postgresql": ("contact_search", POSTGRES_CONTACT_SEARCH_DDL, POSTGRES_CONTACT_SEARCH_REBUILD),
+    },
+    "mentions": {
+        "sqlite": ("mentions_fts", SQLITE_MENTION_SEARCH_DDL, SQLITE_MENTION_SEARCH_REBUILD),
+        # Generated column: computed for existing rows when added, nothing to rebuild
+        "postgresql": ("ix_mentions_search_vector", POSTGRES_MENTION_SEARCH_DDL, []),
+    },
+    "articles": {
+        "sqlite": ("articles_fts", SQLITE_ARTICLE_SEARCH_DDL, SQLITE_ARTICLE_SEARCH_REBUILD),
+        "postgresql": ("ix_articles_search_vector", POSTGRES_ARTICLE_SEARCH_DDL, []),
+    },
+}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _relation_exists(connection, name: str) -> bool:
+    """Whether a table or index named `name` exists."""
+    if connection.dialect.name == "sqlite":
+        sql = "SELECT 1 FROM sqlite_master WHERE name = :name"
+    else:
+        sql = "SELECT 1 FROM pg_class WHERE relname = :name"
+    return connection.execute(text(sql), {"name": name}).first() is not None
+
+
+def search_available(connection, index: str) -> bool:
+    """Whether the named search index (contacts, mentions, articles) is installed on this database."""
+    spec = SEARCH_INDEXES[index].get(connection.dialect.name)
+    return spec is not None and _relation_exists(connection, spec[0])
+
+
+def install_search_indexes(connection) -> bool:
+    """Create search tables and triggers if missing, backfilling newly created indexes.
+
+    Returns: True if full-text search is available on this database.
+    """
+    dialect = connection.dialect.name
+    specs = [index[dialect] for index in SEARCH_INDEXES.values() if dialect in index]
+    if not specs:
+        return False
+    try:
+        for marker, ddl, rebuild in specs:
+            created = not _relation_exists(connection, marker)
+            for sql in ddl:
+                connection.exec_driver_sql(sql)
+            if created:
+                for sql in rebuild:
+                    connection.exec_driver_sql(sql)
+    except OperationalError as exc:  # e.g. SQLite built without FTS5
+        logger.warning("Full-text search unavailable, falling back to ILIKE: %s", exc)
+        return False
+    return True
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install_search_indexes(connection)
+
+
+def search_terms(q: str) -> list[str]:
+    """Words of a user query (punctuation and FTS operators dropped)."""
+    return _WORD_RE.findall(q)
+
+
+def match_expression(dialect: str, terms: list[str]) -> str:
+    """FTS5 MATCH / to_tsquery string requiring every term as a prefix."""
+    if dialect == "sqlite":
+        return " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+    return " & ".join(f"{t}:*" for t in terms)
+
+
+def contact_search_subquery(db, q: str):
+    """Subquery of (contact_id, rank) for contacts matching every word of `q` as a prefix.
+
+    Lower rank = better match. Returns None when the query has no words or the database
+    has no full-text index (callers fall back to ILIKE).
+    """
+    terms = search_terms(q)
+    if not terms or not search_available(db.connection(), "contacts"):
+        return None
+    match = match_expression(db.get_bind().dialect.name, terms)
+    if db.get_bind().dialect.name == "sqlite":
+        weights = ", ".join(str(w) for w in CONTACT_FTS_WEIGHTS.values())
+        sql = (
+            f"SELECT rowid AS contact_id, bm25(contacts_fts, {weights}) AS rank "
+            "FROM contacts_fts WHERE contacts_fts MATCH :match"
+        )
+    else:
+        sql = (
+            "SELECT contact_id, -ts_rank_cd(document, query) AS rank "
+            "FROM contact_search, to_tsquery('simple', :match) query WHERE document @@ query"
+        )
+    return (
+        text(sql)
+        .bindparams(match=match)
+        .columns(contact_id=Integer, rank=Float)
+        .subquery("contact_search_hits")
+    )
+
+
+def mention_search(query, q: str):
+    """Restrict an ORM query over Mention to rows matching `q`, with a rank expression.
+
+    Matches come from the article index (one entry per shared article, joined to
+    its mentions) and the index over inline mention text; existing filters on
+    `query` (date, contact, dismissed) still apply.
+
+    Returns: (query, rank) with lower rank = better match, or None when the query has
+    no words or the database has no full-text index.
+    """
+    db = query.session
+    terms = search_terms(q)
+    connection = db.connection()
+    if not terms or not search_available(connection, "mentions"):
+        return None
+    dialect = db.get_bind().dialect.name
+    match = match_expression(dialect, terms)
+    if dialect == "sqlite":
+        weights = ", ".join(str(w) for w in MENTION_FTS_WEIGHTS.values())
+        parts = [
+            f"SELECT rowid AS mention_id, bm25(mentions_fts, {weights}) AS rank "
+            "FROM mentions_fts WHERE mentions_fts MATCH :match"
+        ]
+        if search_available(connection, "articles"):
+            parts.append(
+                f"SELECT mentions.id, bm25(articles_fts, {weights}) FROM articles_fts "
+                "JOIN mentions ON mentions.article_id = articles_fts.rowid WHERE articles_fts MATCH :match"
+            )
+    else:
+        parts = [
+            "SELECT id AS mention_id, -ts_rank_cd(search_vector, query) AS rank "
+            "FROM mentions, to_tsquery('simple', :match) query WHERE search_vector @@ query"
+        ]
+        if search_available(connection, "articles"):
+            parts.append(
+                "SELECT mentions.id, -ts_rank_cd(articles.search_vector, query) "
+                "FROM articles JOIN mentions ON mentions.article_id = articles.id, "
+                "to_tsquery('simple', :match) query WHERE articles.search_vector @@ query"
+            )
+    hits = (
+        text(" UNION ALL ".join(parts))
+        .bindparams(match=match)
+        .columns(mention_id=Integer, rank=Float)
+        .subquery("mention_search_hits")
+    )
+    return query.join(hits, hits.c.mention_id == Mention.id), hits.c.rank
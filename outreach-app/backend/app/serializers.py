@@ -0,0 +1,68 @@
+"""JSON shapes of mentions, outreach entries and reply drafts, shared by the API routers.
+
+The contact detail endpoint embeds all three, so they live here rather than in
+one router.
+"""
+import json
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, or_
+
+from app.models import Mention, OutreachLog, ReplyDraft
+
+
+def mention_dict(m: Mention) -> dict:
+    return {
+        "id": m.id,
+        "contact_id": m.contact_id,
+        "contact_name": m.contact.name if m.contact else None,
+        "source_type": m.source_type,
+        "source_url": m.source_url,
+        "title": m.title,
+        "snippet": m.snippet,
+        "published_at": m.published_at.isoformat() if m.published_at else None,
+        "created_at": m.created_at.isoformat() if m.created_at else None,
+        "relevance_score": m.relevance_score,
+    }
+
+
+def recent_filter(days: int):
+    """Published in the last `days` days (created_at when the publish date is unknown)."""
+    cutoff = datetime.now(UTC) - timedelta(days=days)
+    return or_(
+        Mention.published_at >= cutoff,
+        and_(Mention.published_at.is_(None), Mention.created_at >= cutoff),
+    )
+
+
+def outreach_dict(e: OutreachLog) -> dict:
+    return {
+        "id": e.id,
+        "contact_id": e.contact_id,
+        "method": e.method,
+        "subject": e.subject,
+        "content": e.content,
+        "sent_at": e.sent_at.isoformat() if e.sent_at else None,
+        "response_status": e.response_status,
+        "created_at": e.created_at.isoformat() if e.created_at else None,
+    }
+
+
+def draft_dict(d: ReplyDraft) -> dict:
+    themes = []
+    if d.themes:
+        try:
+            themes = json.loads(d.themes)
+        except json.JSONDecodeError:
+            pass
+    return {
+        "id": d.id,
+        "contact_id": d.contact_id,
+        "contact_name": d.contact.name if d.contact else None,
+        "mention_id": d.mention_id,
+        "mention_title": d.mention.title if d.mention else None,
+        "reply_text": d.reply_text,
+        "themes": themes,
+        "status": d.status,
+        "created_at": d.created_at.isoformat() if d.created_at else None,
+    }
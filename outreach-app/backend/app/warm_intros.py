@@ -5,9 +5,12 @@ can introduce you (because they have a connection to the target
 AND are in an engaged/partner stage with you).
 
 Mission alignment: auto-score contacts 1-10 based on category
-keywords, with user override support.
+keywords, with user override support (mission_alignment_manual).
 """
-from sqlalchemy import or_
+import re
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, String, exists, func, insert, literal, or_, select, union, update
 from sqlalchemy.orm import Session
 
 from app.models import Contact, ContactConnection, ContactTag, OutreachLog
@@ -41,61 +44,128 @@ CATEGORY_ALIGNMENT: dict[str, float] = {
 }
 
 
-def compute_mission_alignment(contact: Contact) -> float:
-    """Compute mission alignment score (1-10) from category and connection_to_solomon.
+# Keywords in connection_to_solomon that signal a strong tie (+1.0); any other text = +0.5
+STRONG_CONNECTION_SIGNALS = ["direct", "advisor", "board", "funder", "partner", "collaborat"]
 
-    Higher = more aligned with Solomon's AI safety mission.
-    """
+# Topics in primary_interests that earn a +1.0 boost
+RELEVANT_INTERESTS = ["ai safety", "alignment", "existential risk", "x-risk", "effective altruism"]
+
+# Fields that feed compute_mission_alignment; code changing any of them calls refresh_mission_alignments()
+ALIGNMENT_SOURCE_FIELDS = ("category", "connection_to_solomon", "primary_interests")
+
+
+def _alternation(keywords) -> re.Pattern:
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# One pass over the category text. The lookahead reports a match at every position (so
+# overlapping keywords are not swallowed) and alternatives are ordered best-score-first,
+# so the first alternative that matches at a position is the highest-scoring one there.
+_CATEGORY_RE = re.compile(
+    "(?=("
+    + _alternation(sorted(CATEGORY_ALIGNMENT, key=lambda k: (-CATEGORY_ALIGNMENT[k], -len(k)))).pattern
+    + "))"
+)
+_STRONG_CONNECTION_RE = _alternation(STRONG_CONNECTION_SIGNALS)
+_RELEVANT_INTERESTS_RE = _alternation(RELEVANT_INTERESTS)
+
+
+def alignment_from_fields(
+    category: str | None,
+    connection_to_solomon: str | None,
+    primary_interests: str | None,
+) -> float:
+    """Mission alignment score (1-10) from the raw contact fields. See compute_mission_alignment."""
     score = 5.0  # Default middle score
 
-    # Check category
-    if contact.category:
-        cat_lower = contact.category.lower()
-        for keyword, alignment in CATEGORY_ALIGNMENT.items():
-            if keyword in cat_lower:
-                score = max(score, alignment)
-                break
+    # Best-scoring category keyword
+    if category:
+        best = max(
+            (CATEGORY_ALIGNMENT[m.group(1)] for m in _CATEGORY_RE.finditer(category.lower())),
+            default=None,
+        )
+        if best is not None:
+            score = max(score, best)
 
     # Boost if connection_to_solomon field has strong keywords
-    if contact.connection_to_solomon:
-        conn_lower = contact.connection_to_solomon.lower()
-        strong_signals = ["direct", "advisor", "board", "funder", "partner", "collaborat"]
-        if any(s in conn_lower for s in strong_signals):
+    if connection_to_solomon:
+        conn_lower = connection_to_solomon.lower()
+        if _STRONG_CONNECTION_RE.search(conn_lower):
             score = min(10.0, score + 1.0)
         # Mild boost for any documented connection
         elif conn_lower.strip():
             score = min(10.0, score + 0.5)
 
     # Boost if primary_interests mention relevant topics
-    if contact.primary_interests:
-        interests_lower = contact.primary_interests.lower()
-        relevant = ["ai safety", "alignment", "existential risk", "x-risk", "effective altruism"]
-        if any(r in interests_lower for r in relevant):
-            score = min(10.0, score + 1.0)
+    if primary_interests and _RELEVANT_INTERESTS_RE.search(primary_interests.lower()):
+        score = min(10.0, score + 1.0)
 
     return round(score, 1)
 
 
+def compute_mission_alignment(contact: Contact) -> float:
+    """Compute mission alignment score (1-10) from category and connection_to_solomon.
+
+    Higher = more aligned with Solomon's AI safety mission.
+    """
+    return alignment_from_fields(contact.category, contact.connection_to_solomon, contact.primary_interests)
+
+
+# Contacts whose score was not set by the user
+_AUTO_ALIGNMENT = or_(Contact.mission_alignment_manual.is_(None), Contact.mission_alignment_manual == 0)
+
+
+def _store_alignments(db: Session, query) -> int:
+    """Score the contacts `query` selects (id + ALIGNMENT_SOURCE_FIELDS) in one bulk UPDATE."""
+    rows = [
+        {"id": cid, "mission_alignment": alignment_from_fields(category, connection, interests)}
+        for cid, category, connection, interests in query.all()
+    ]
+    if rows:
+        db.execute(update(Contact), rows)
+    return len(rows)
+
+
+def refresh_mission_alignments(db: Session, contact_ids: list[int]) -> int:
+    """Rescore the given contacts after their category / connection / interests changed.
+
+    Call this from any write path that changes ALIGNMENT_SOURCE_FIELDS (merges,
+    imports, scripts). Scores the user set (mission_alignment_manual) are kept.
+    Does not commit.
+
+    Returns: number of contacts rescored
+    """
+    if not contact_ids:
+        return 0
+    query = db.query(Contact.id, *(getattr(Contact, f) for f in ALIGNMENT_SOURCE_FIELDS)).filter(
+        Contact.id.in_(contact_ids), _AUTO_ALIGNMENT
+    )
+    return _store_alignments(db, query)
+
+
 def score_all_alignments(db: Session, overwrite: bool = False) -> dict:
     """Compute mission alignment for all contacts. Stores in DB.
 
+    Reads only the source columns (no ORM objects) and writes every score back
+    in one bulk UPDATE by primary key.
+
     Args:
-        overwrite: If True, overwrite existing scores. If False, only score unscored contacts.
+        overwrite: If True, overwrite existing auto scores (scores the user set are kept).
+            If False, only score unscored contacts.
 
     Returns: {scored, skipped}
     """
-    query = db.query(Contact)
-    if not overwrite:
+    query = db.query(Contact.id, *(getattr(Contact, f) for f in ALIGNMENT_SOURCE_FIELDS))
+    if overwrite:
+        query = query.filter(_AUTO_ALIGNMENT)
+        skipped = db.query(func.count(Contact.id)).filter(Contact.mission_alignment_manual == 1).scalar()
+    else:
         query = query.filter(Contact.mission_alignment.is_(None))
+        skipped = 0
 
-    contacts = query.all()
-    scored = 0
-    for c in contacts:
-        c.mission_alignment = compute_mission_alignment(c)
-        scored += 1
-
+    scored = _store_alignments(db, query)
     db.commit()
-    return {"scored": scored, "skipped": 0}
+    return {"scored": scored, "skipped": skipped}
 
 
 # --- Warm intro path finding ---
@@ -108,6 +178,17 @@ STAGE_PRIORITY = {
     "Cold": 1,
 }
 
+# Connection type strength (1-3); unknown types count as 1
+CONNECTION_TYPE_STRENGTH = {
+    "first_degree": 3,
+    "co_author": 3,
+    "same_org": 2,
+    "co_mentioned_news": 1,
+    "mentioned_together": 1,
+    "same_panel": 2,
+    "advisor": 3,
+}
+
 
 def find_warm_intro_paths(
     db: Session,
@@ -187,16 +268,7 @@ def find_warm_intro_paths(
         has_replied = cid in replied_ids
         reply_bonus = 2 if has_replied else 0
 
-        # Connection type strength
-        type_score = {
-            "first_degree": 3,
-            "co_author": 3,
-            "same_org": 2,
-            "co_mentioned_news": 1,
-            "mentioned_together": 1,
-            "same_panel": 2,
-            "advisor": 3,
-        }.get(rel_type, 1)
+        type_score = CONNECTION_TYPE_STRENGTH.get(rel_type, 1)
 
         intro_strength = round((stage_score + reply_bonus + type_score) / 9.0, 2)
 
@@ -226,50 +298,103 @@ PRESET_TAGS = [
 ]
 
 
-def auto_tag_warm_intro(db: Session) -> dict:
-    """Auto-tag contacts that have warm intro paths available.
+WARM_INTRO_TAG = "Warm intro available"
 
-    Adds "Warm intro available" tag to contacts that have at least one
-    connected contact in Engaged or Partner-Advocate stage.
-    Returns: {tagged, already_tagged}
+# Stages that make a contact a usable intro source for their neighbors
+WARM_INTRO_SOURCE_STAGES = ("Engaged", "Partner-Advocate")
+
+
+def _warm_intro_eligible_ids():
+    """Select ids of contacts connected (either direction) to an Engaged/Partner-Advocate contact."""
+    engaged = select(Contact.id).where(Contact.relationship_stage.in_(WARM_INTRO_SOURCE_STAGES))
+    return union(
+        select(ContactConnection.contact_id.label("contact_id"))
+        .where(ContactConnection.other_contact_id.in_(engaged)),
+        select(ContactConnection.other_contact_id.label("contact_id"))
+        .where(ContactConnection.contact_id.in_(engaged)),
+    ).subquery()
+
+
+def sync_warm_intro_tags(db: Session, contact_ids: list[int] | None = None) -> dict:
+    """Add/remove the warm intro tag with set-based INSERT ... SELECT and DELETE statements.
+
+    Tags it adds are marked auto; only those are removed again. A user-added tag stays.
+
+    Args:
+        contact_ids: If set, only these contacts are re-tagged (incremental path).
+            None = the whole table.
+
+    Does not commit. Returns: {tagged, removed}
     """
-    tag_name = "Warm intro available"
+    if contact_ids is not None and not contact_ids:
+        return {"tagged": 0, "removed": 0}
 
-    # Find contacts who already have this tag
-    existing = (
-        db.query(ContactTag.contact_id)
-        .filter(ContactTag.tag == tag_name)
-        .all()
+    eligible = _warm_intro_eligible_ids()
+    already = select(ContactTag.id).where(
+        ContactTag.contact_id == eligible.c.contact_id,
+        ContactTag.tag == WARM_INTRO_TAG,
+    )
+    to_tag = select(
+        eligible.c.contact_id,
+        literal(WARM_INTRO_TAG, String),
+        literal(1),
+        literal(datetime.now(UTC), DateTime),
+    ).where(~exists(already))
+    if contact_ids is not None:
+        to_tag = to_tag.where(eligible.c.contact_id.in_(contact_ids))
+    inserted = db.execute(
+        insert(ContactTag).from_select(["contact_id", "tag", "auto", "created_at"], to_tag)
     )
-    already_tagged = {r[0] for r in existing}
-
-    # Find all connections
-    all_connections = db.query(ContactConnection).all()
-
-    # Build adjacency: contact_id -> set of connected contact_ids
-    adjacency: dict[int, set[int]] = {}
-    for conn in all_connections:
-        adjacency.setdefault(conn.contact_id, set()).add(conn.other_contact_id)
-        adjacency.setdefault(conn.other_contact_id, set()).add(conn.contact_id)
-
-    # Find contacts in Engaged or Partner-Advocate stage
-    engaged_ids = {
-        c.id
-        for c in db.query(Contact)
-        .filter(Contact.relationship_stage.in_(["Engaged", "Partner-Advocate"]))
-        .all()
-    }
 
-    # For each contact, if they're connected to someone engaged with us, tag them
-    tagged = 0
-    all_contacts = db.query(Contact).all()
-    for contact in all_contacts:
-        if contact.id in already_tagged:
-            continue
-        neighbors = adjacency.get(contact.id, set())
-        if neighbors & engaged_ids:
-            db.add(ContactTag(contact_id=contact.id, tag=tag_name))
-            tagged += 1
+    # Stale tags: contact no longer has an engaged neighbor (stage dropped back or connection removed)
+    stale = db.query(ContactTag).filter(
+        ContactTag.tag == WARM_INTRO_TAG,
+        ContactTag.auto == 1,
+        ContactTag.contact_id.notin_(select(eligible.c.contact_id)),
+    )
+    if contact_ids is not None:
+        stale = stale.filter(ContactTag.contact_id.in_(contact_ids))
+    removed = stale.delete(synchronize_session=False)
+
+    return {"tagged": inserted.rowcount or 0, "removed": removed or 0}
+
+
+def neighbor_ids(db: Session, contact_ids: list[int]) -> list[int]:
+    """Ids of contacts directly connected to any of contact_ids (either direction)."""
+    rows = db.execute(
+        union(
+            select(ContactConnection.other_contact_id).where(ContactConnection.contact_id.in_(contact_ids)),
+            select(ContactConnection.contact_id).where(ContactConnection.other_contact_id.in_(contact_ids)),
+        )
+    ).all()
+    return [r[0] for r in rows]
+
+
+def retag_warm_intro_neighbors(db: Session, contact_id: int) -> dict:
+    """Incremental re-tag after one contact's relationship_stage changes.
+
+    Only that contact's direct neighbors can gain or lose the tag. Does not commit.
+    """
+    return sync_warm_intro_tags(db, neighbor_ids(db, [contact_id]))
+
+
+def auto_tag_warm_intro(db: Session) -> dict:
+    """Auto-tag contacts that have warm intro paths available.
 
+    Adds "Warm intro available" tag to contacts that have at least one
+    connected contact in Engaged or Partner-Advocate stage, and removes it
+    from contacts that no longer do.
+    Returns: {tagged, already_tagged, removed}
+    """
+    already_tagged = (
+        db.query(func.count(ContactTag.id))
+        .filter(ContactTag.tag == WARM_INTRO_TAG)
+        .scalar()
+    ) or 0
+    result = sync_warm_intro_tags(db)
     db.commit()
-    return {"tagged": tagged, "already_tagged": len(already_tagged)}
+    return {
+        "tagged": result["tagged"],
+        "already_tagged": already_tagged - result["removed"],
+        "removed": result["removed"],
+    }
@@ -0,0 +1,106 @@
+"""Tests for shared articles (app.articles): ingest, read-through text, backfill, search and discovery."""
+from datetime import UTC, datetime
+
+from app.articles import ContactMatcher, backfill_articles, ingest_articles, normalize_url
+from app.config import settings
+from app.discovery import discover_from_mentions
+from app.models import Article, Contact, ContactConnection, Mention
+
+
+def _contacts(db, *names):
+    contacts = [Contact(name=n) for n in names]
+    db.add_all(contacts)
+    db.commit()
+    return contacts
+
+
+def _item(url, title, snippet="", source_type="news"):
+    return {
+        "source_type": source_type, "source_url": url, "title": title, "snippet": snippet,
+        "published_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+    }
+
+
+def test_normalize_url_and_matcher():
+    assert normalize_url("HTTPS://Example.com/a/b/?utm_source=x#top") == "https://example.com/a/b"
+    assert normalize_url("  ") is None
+    matcher = ContactMatcher([(1, "Stuart J. Russell"), (2, "Russell"), (3, "Dr. Ada Lovelace"), (4, "John Smith")])
+    assert matcher.match("Interview: Stuart J. Russell and Ada Lovelace on AI") == {1, 3}
+    assert matcher.match("Russell said") == set()
+    # Initials are part of the name: different middle initials are different people
+    assert matcher.match("Stuart Russell and John A. Smith") == set()
+    assert matcher.match("Prof. John Smith") == {4}
+
+
+def test_ingest_stores_article_once_and_links_co_mentions(client, db_session):
+    russell, bengio, ada = _contacts(db_session, "Stuart Russell", "Yoshua Bengio", "Ada Lovelace")
+    matcher = ContactMatcher.from_db(db_session)
+    item = _item("https://news.test/ai-safety?utm=rss", "Stuart Russell and Yoshua Bengio on AI safety", "Panel recap")
+
+    stats = ingest_articles(db_session, russell.id, [item, _item("https://news.test/ai-safety/", "Copy")], matcher)
+    assert stats == {"added": 1, "co_mentions": 1, "articles_created": 1, "near_duplicates": 0, "skipped": 1}
+    # Fetched again for either contact: already linked
+    assert ingest_articles(db_session, bengio.id, [item], matcher)["skipped"] == 1
+    # Found for a contact it does not name: linked to the same article
+    assert ingest_articles(db_session, ada.id, [item], matcher)["added"] == 1
+    db_session.commit()
+
+    assert db_session.query(Article).count() == 1
+    mentions = db_session.query(Mention).order_by(Mention.contact_id).all()
+    assert [m.contact_id for m in mentions] == [russell.id, bengio.id, ada.id]
+    assert {m.title for m in mentions} == {item["title"]}
+    assert all(m._title is None and m.article_id for m in mentions)
+    assert db_session.query(Mention).filter(Mention.snippet == "Panel recap").count() == 3
+
+    data = client.get("/api/mentions/search", params={"q": "safety"}).json()
+    assert data["total"] == 3 and data["mentions"][0]["title"] == item["title"]
+    assert client.get(f"/api/mentions/{mentions[0].id}").json()["source_url"] == item["source_url"]
+
+
+def test_backfill_moves_inline_text_into_articles(client, db_session):
+    a, b = _contacts(db_session, "Ada Lovelace", "Alan Turing")
+    db_session.add_all([
+        Mention(contact_id=a.id, source_type="news", source_url="https://x.test/p?ref=1", title="Engines", snippet="s"),
+        Mention(contact_id=b.id, source_type="news", source_url="https://x.test/p", title="Engines", snippet="s"),
+        Mention(contact_id=b.id, source_type="news", title="No URL"),
+    ])
+    db_session.commit()
+
+    assert backfill_articles(db_session.connection()) == 2
+    db_session.commit()
+    db_session.expire_all()
+    article = db_session.query(Article).one()
+    assert article.url_key == "https://x.test/p" and article.source_url == "https://x.test/p?ref=1"
+    linked = db_session.query(Mention).filter(Mention.article_id == article.id).all()
+    assert len(linked) == 2 and all(m._title is None and m.title == "Engines" for m in linked)
+    assert db_session.query(Mention).filter(Mention.article_id.is_(None)).one().title == "No URL"
+    # Searchable through the article index only now
+    assert client.get("/api/mentions/search", params={"q": "engines"}).json()["total"] == 2
+    assert backfill_articles(db_session.connection()) == 0
+
+
+def test_discovery_reads_each_article_once(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+    a, b, c = _contacts(db_session, "Ada Lovelace", "Alan Turing", "Grace Hopper")
+    db_session.add(Article(url_key="https://x.test/1", source_type="news", title="Computing pioneers",
+                           snippet="Featuring Grace Hopper"))
+    db_session.flush()
+    article = db_session.query(Article).one()
+    db_session.add_all([Mention(article_id=article.id, contact_id=cid, source_type="news") for cid in (a.id, b.id)])
+    db_session.commit()
+
+    result = discover_from_mentions(db_session)
+    assert result["scanned_articles"] == 1 and result["scanned_mentions"] == 2
+    pairs = {(r.contact_id, r.other_contact_id) for r in db_session.query(ContactConnection)}
+    assert pairs == {(a.id, b.id), (b.id, a.id), (a.id, c.id), (b.id, c.id)}
+
+
+def test_merge_drops_second_link_to_same_article(client, db_session):
+    winner, loser = _contacts(db_session, "Ada Lovelace", "A. Lovelace")
+    ingest_articles(db_session, winner.id, [_item("https://x.test/e", "Engines")])
+    ingest_articles(db_session, loser.id, [_item("https://x.test/e?ref=2", "Engines")])
+    db_session.commit()
+
+    data = client.post(f"/api/contacts/{winner.id}/merge", json={"loser_ids": [loser.id]}).json()
+    assert data["dropped_duplicates"]["mentions"] == 1
+    assert db_session.query(Mention).count() == 1
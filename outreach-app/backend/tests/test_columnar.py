@@ -0,0 +1,96 @@
+"""Tests for columnar response encoding (app.columnar)."""
+import json
+
+import pytest
+
+from app.columnar import COLUMNAR_JSON, MSGPACK, negotiate, to_columns
+from app.models import Contact, ContactConnection
+
+
+def _decode(table: dict) -> list[dict]:
+    """Rebuild row dicts from a columnar table."""
+    cols = table["columns"]
+    rows = []
+    for i in range(table["length"]):
+        row = {}
+        for field, values in cols.items():
+            value = values[i]
+            if field in table["dictionaries"] and value is not None:
+                value = table["dictionaries"][field][value]
+            row[field] = value
+        rows.append(row)
+    return rows
+
+
+def test_negotiate():
+    assert negotiate(None) is None
+    assert negotiate("application/json") is None
+    assert negotiate(f"{COLUMNAR_JSON}, application/json;q=0.9") == COLUMNAR_JSON
+    assert negotiate(f"{MSGPACK};q=1, {COLUMNAR_JSON}") == MSGPACK
+
+
+def test_to_columns_interns_and_round_trips():
+    rows = [
+        {"id": 1, "category": "Academic", "tags": ["a"]},
+        {"id": 2, "category": None, "tags": []},
+        {"id": 3, "category": "Academic", "tags": []},
+    ]
+    table = to_columns(rows, interned=("category",))
+    assert table["columns"]["category"] == [0, None, 0]
+    assert table["dictionaries"] == {"category": ["Academic"]}
+    assert _decode(table) == rows
+    assert to_columns([]) == {"length": 0, "columns": {}, "dictionaries": {}}
+
+
+def test_contacts_columnar_matches_rows(client, db_session):
+    db_session.add_all([
+        Contact(name="A", list_number=1, category="Policy", relationship_stage="Cold"),
+        Contact(name="B", list_number=2, category="Policy", relationship_stage="Engaged"),
+    ])
+    db_session.commit()
+    rows = client.get("/api/contacts").json()
+
+    r = client.get("/api/contacts", headers={"Accept": COLUMNAR_JSON})
+    assert r.headers["content-type"].startswith(COLUMNAR_JSON)
+    data = r.json()
+    assert data["total"] == rows["total"]
+    assert data["contacts"]["dictionaries"]["category"] == ["Policy"]
+    assert _decode(data["contacts"]) == rows["contacts"]
+
+
+def test_map_columnar_has_own_etag(client, db_session):
+    a = Contact(name="A", list_number=1, category="Policy")
+    b = Contact(name="B", list_number=2, category="Academic")
+    db_session.add_all([a, b])
+    db_session.commit()
+    db_session.add(ContactConnection(contact_id=a.id, other_contact_id=b.id, relationship_type="same_org"))
+    db_session.commit()
+    plain = client.get("/api/relationship-map")
+    assert "Accept" in plain.headers["vary"]
+
+    r = client.get("/api/relationship-map", headers={"Accept": COLUMNAR_JSON})
+    assert r.headers["etag"] != plain.headers["etag"]
+    assert "Accept" in r.headers["vary"]
+    data = json.loads(r.content)
+    assert data["version"] == plain.json()["version"]
+    assert _decode(data["nodes"]) == plain.json()["nodes"]
+    assert _decode(data["links"]) == plain.json()["links"]
+
+    # The ETag names the encoding actually served (msgpack falls back to columnar JSON)
+    packed = client.get("/api/relationship-map", headers={"Accept": MSGPACK})
+    served_msgpack = packed.headers["content-type"] == MSGPACK
+    assert (packed.headers["etag"] != r.headers["etag"]) == served_msgpack
+
+    columnar_etag = r.headers["etag"]
+    r = client.get("/api/relationship-map", headers={"Accept": COLUMNAR_JSON, "If-None-Match": columnar_etag})
+    assert r.status_code == 304
+    r = client.get("/api/relationship-map", headers={"Accept": MSGPACK, "If-None-Match": columnar_etag})
+    assert r.status_code == (200 if served_msgpack else 304)
+
+
+def test_mentions_msgpack(client, db_session):
+    msgpack = pytest.importorskip("msgpack")
+    r = client.get("/api/mentions", headers={"Accept": MSGPACK})
+    assert r.headers["content-type"] == MSGPACK
+    data = msgpack.unpackb(r.content)
+    assert data["mentions"]["length"] == 0
@@ -1,6 +1,13 @@
 """Tests for contacts and rotation API."""
+from datetime import UTC, datetime, timedelta
+
 import pytest
-from app.models import Contact
+from sqlalchemy import event
+
+from app.graph_changes import current_graph_version
+from app.models import (
+    Contact, ContactConnection, ContactInfo, ContactNameKey, ContactTag, Mention, Note, OutreachLog, ReplyDraft,
+)
 
 
 def test_list_contacts_empty(client):
@@ -76,3 +83,220 @@ def test_patch_in_mention_rotation(client, db_session):
     client.patch(f"/api/contacts/{contact_id}", json={"in_mention_rotation": False})
     r3 = client.get("/api/contacts?in_rotation=1")
     assert r3.json()["total"] == 0
+
+
+def _seed_detail(db, contact, n):
+    """n of each related row for `contact`, plus one connection to a fresh contact."""
+    now = datetime.now(UTC)
+    other = Contact(name=f"Friend of {contact.name}", relationship_stage="Engaged")
+    db.add(other)
+    db.flush()
+    db.add(ContactConnection(contact_id=contact.id, other_contact_id=other.id, relationship_type="colleague"))
+    for i in range(n):
+        db.add(Note(contact_id=contact.id, note_text=f"note {i}", note_date=now - timedelta(days=i)))
+        db.add(ContactTag(contact_id=contact.id, tag=f"tag {i}"))
+        db.add(OutreachLog(contact_id=contact.id, method="email", sent_at=now - timedelta(days=i)))
+        mention = Mention(contact_id=contact.id, source_type="news", title=f"m {i}", published_at=now - timedelta(hours=i))
+        db.add(mention)
+        db.flush()
+        db.add(ReplyDraft(contact_id=contact.id, mention_id=mention.id, reply_text="hi", themes='["safety"]'))
+    db.commit()
+
+
+def test_contact_full_returns_all_sections(client, db_session):
+    c = Contact(name="Full", category="Policy")
+    db_session.add(c)
+    db_session.commit()
+    _seed_detail(db_session, c, 2)
+
+    r = client.get(f"/api/contacts/{c.id}/full")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["contact"]["name"] == "Full"
+    assert data["contact"] == client.get(f"/api/contacts/{c.id}").json()
+    assert [n["note_text"] for n in data["notes"]] == ["note 0", "note 1"]
+    assert data["connections"][0]["other_contact_name"] == "Friend of Full"
+    assert {t["tag"] for t in data["tags"]} >= {"tag 0", "tag 1"}
+    assert data["warm_intros"][0]["connector_name"] == "Friend of Full"
+    assert [m["title"] for m in data["mentions"]] == ["m 0", "m 1"]
+    assert len(data["outreach"]) == 2
+    assert data["reply_drafts"][0]["themes"] == ["safety"]
+    assert data["reply_drafts"][0]["mention_title"] in ("m 0", "m 1")
+
+
+def test_contact_full_include_sections(client, db_session):
+    c = Contact(name="Some")
+    db_session.add(c)
+    db_session.commit()
+
+    r = client.get(f"/api/contacts/{c.id}/full?include=notes,tags")
+    assert r.status_code == 200
+    assert set(r.json()) == {"notes", "tags"}
+    assert client.get(f"/api/contacts/{c.id}/full?include=notes,bogus").status_code == 400
+    assert client.get("/api/contacts/99999/full").status_code == 404
+
+
+def test_contact_full_query_count_is_fixed(client, db_session, test_engine):
+    small, large = Contact(name="Small"), Contact(name="Large")
+    db_session.add_all([small, large])
+    db_session.commit()
+    _seed_detail(db_session, small, 1)
+    _seed_detail(db_session, large, 20)
+
+    def count_queries(contact_id):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", record)
+        try:
+            assert client.get(f"/api/contacts/{contact_id}/full").status_code == 200
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record)
+        return len(statements)
+
+    assert count_queries(small.id) == count_queries(large.id) <= 16
+
+
+def test_bulk_update_by_ids(client, db_session):
+    a, b, c = Contact(name="A"), Contact(name="B"), Contact(name="C", relationship_stage="Cold")
+    neighbor = Contact(name="N")
+    db_session.add_all([a, b, c, neighbor])
+    db_session.flush()
+    db_session.add(ContactConnection(contact_id=a.id, other_contact_id=neighbor.id, relationship_type="colleague"))
+    db_session.add(ContactTag(contact_id=a.id, tag="Prioritize"))
+    db_session.commit()
+    version = current_graph_version(db_session)
+
+    r = client.post("/api/contacts/bulk", json={
+        "contact_ids": [a.id, b.id, 99999],
+        "changes": {"relationship_stage": "Engaged", "mission_alignment": 12, "add_tags": ["Prioritize", "Conference"]},
+    })
+    assert r.status_code == 200
+    data = r.json()
+    assert data["matched"] == 2 and data["updated"] == 2
+    assert data["tags_added"] == 3  # Prioritize already on A
+    assert data["warm_intro_tags"]["tagged"] == 1  # A became an intro source for N
+
+    db_session.expire_all()
+    rows = {x.name: x for x in db_session.query(Contact).all()}
+    assert rows["A"].relationship_stage == rows["B"].relationship_stage == "Engaged"
+    assert rows["A"].mission_alignment == 10.0
+    assert rows["C"].relationship_stage == "Cold"
+    assert {t.tag for t in rows["B"].tags} == {"Prioritize", "Conference"}
+    assert "Warm intro available" in {t.tag for t in rows["N"].tags}
+    assert current_graph_version(db_session) > version
+
+
+def test_bulk_update_by_filter_and_validation(client, db_session):
+    db_session.add_all([
+        Contact(name="P1", category="Policy", in_mention_rotation=1),
+        Contact(name="P2", category="Policy"),
+        Contact(name="T1", category="Tech", in_mention_rotation=1),
+    ])
+    db_session.flush()
+    for contact in db_session.query(Contact).all():
+        db_session.add(ContactTag(contact_id=contact.id, tag="Old"))
+    db_session.commit()
+
+    r = client.post("/api/contacts/bulk", json={
+        "filter": {"category": "Policy"},
+        "changes": {"in_mention_rotation": True, "remove_tags": ["Old"]},
+    })
+    assert r.status_code == 200
+    assert r.json()["matched"] == 2 and r.json()["tags_removed"] == 2
+    assert client.get("/api/contacts?in_rotation=1").json()["total"] == 3
+    assert db_session.query(ContactTag).count() == 1
+
+    changes = {"relationship_stage": "Warm"}
+    assert client.post("/api/contacts/bulk", json={"changes": changes}).status_code == 400
+    assert client.post("/api/contacts/bulk", json={"contact_ids": [1], "filter": {}, "changes": changes}).status_code == 400
+    # An empty filter would hit every contact unless asked for explicitly
+    assert client.post("/api/contacts/bulk", json={"filter": {}, "changes": changes}).status_code == 400
+    assert client.post("/api/contacts/bulk", json={"filter": {"q": ""}, "changes": changes}).status_code == 400
+    assert db_session.query(Contact).filter_by(relationship_stage="Warm").count() == 0
+    r = client.post("/api/contacts/bulk", json={"filter": {"all": True}, "changes": changes})
+    assert r.json()["matched"] == 3
+    assert client.post("/api/contacts/bulk", json={"contact_ids": [1], "changes": {}}).status_code == 400
+    assert client.post("/api/contacts/bulk", json={"contact_ids": [1], "changes": {"relationship_stage": "Hot"}}).status_code == 400
+
+
+def test_merge_moves_everything_and_dedupes(client, db_session):
+    now = datetime.now(UTC)
+    winner = Contact(name="Stuart Russell", category="Academic")
+    loser = Contact(name="Russell, Stuart", bio="AI researcher", in_mention_rotation=1)
+    friend, partner = Contact(name="Friend"), Contact(name="Partner", relationship_stage="Engaged")
+    db_session.add_all([winner, loser, friend, partner])
+    db_session.flush()
+    w, l = winner.id, loser.id
+    kept = Mention(contact_id=w, source_type="news", source_url="https://x.test/a", title="A")
+    dupe = Mention(contact_id=l, source_type="news", source_url="https://x.test/a", title="A")
+    db_session.add_all([
+        kept, dupe,
+        Mention(contact_id=l, source_type="news", source_url="https://x.test/b", title="B"),
+        ContactInfo(contact_id=w, type="email", value="sr@x.test", is_primary=1),
+        ContactInfo(contact_id=l, type="email", value="SR@x.test", is_primary=1),
+        ContactInfo(contact_id=l, type="linkedin", value="in/sr"),
+        ContactTag(contact_id=w, tag="Prioritize"), ContactTag(contact_id=l, tag="Prioritize"),
+        ContactTag(contact_id=l, tag="Conference"),
+        Note(contact_id=l, note_text="Met at NeurIPS", note_date=now),
+        OutreachLog(contact_id=l, method="email", sent_at=now),
+        ContactConnection(contact_id=w, other_contact_id=friend.id, relationship_type="colleague"),
+        ContactConnection(contact_id=l, other_contact_id=friend.id, relationship_type="colleague"),
+        ContactConnection(contact_id=l, other_contact_id=w, relationship_type="same_person"),
+        ContactConnection(contact_id=partner.id, other_contact_id=l, relationship_type="friend"),
+    ])
+    db_session.flush()
+    db_session.add(ReplyDraft(contact_id=l, mention_id=dupe.id, reply_text="Congrats"))
+    db_session.commit()
+    version = current_graph_version(db_session)
+    assert client.get("/api/contacts/facets").json()["total"] == 4
+
+    r = client.post(f"/api/contacts/{w}/merge", json={"loser_ids": [l]})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["fields_filled"] == ["bio", "in_mention_rotation"]
+    assert data["dropped_duplicates"] == {"contact_info": 1, "tags": 1, "mentions": 1, "connections": 2}
+
+    db_session.expire_all()
+    assert db_session.get(Contact, l) is None
+    merged = db_session.get(Contact, w)
+    assert merged.bio == "AI researcher" and merged.category == "Academic"
+    assert sorted(m.source_url for m in merged.mentions) == ["https://x.test/a", "https://x.test/b"]
+    assert merged.reply_drafts[0].mention_id == kept.id
+    assert sorted((i.type, i.is_primary) for i in merged.contact_info) == [("email", 1), ("linkedin", 0)]
+    assert {t.tag for t in merged.tags} >= {"Prioritize", "Conference", "Warm intro available"}
+    assert len(merged.notes) == 1 and len(merged.outreach_log) == 1
+    pairs = {(c.contact_id, c.other_contact_id) for c in db_session.query(ContactConnection)}
+    assert pairs == {(w, friend.id), (partner.id, w)}
+    assert db_session.query(ContactNameKey).filter_by(contact_id=l).count() == 0
+    assert current_graph_version(db_session) > version
+    assert client.get("/api/contacts/facets").json()["total"] == 3
+    assert client.get("/api/contacts", params={"q": "researcher"}).json()["contacts"][0]["id"] == w
+
+
+def test_merge_rescores_alignment_unless_manual(client, db_session):
+    winner, loser = Contact(name="Ada Lovelace"), Contact(name="A. Lovelace", category="AI Safety")
+    kept, manual = Contact(name="Alan Turing"), Contact(name="A. Turing", category="AI Safety")
+    db_session.add_all([winner, loser, kept, manual])
+    db_session.commit()
+    client.patch(f"/api/contacts/{kept.id}", json={"mission_alignment": 4.0})
+
+    data = client.post(f"/api/contacts/{winner.id}/merge", json={"loser_ids": [loser.id]}).json()
+    assert data["fields_filled"] == ["category", "mission_alignment"]
+    client.post(f"/api/contacts/{kept.id}/merge", json={"loser_ids": [manual.id]})
+    db_session.expire_all()
+    assert db_session.get(Contact, winner.id).mission_alignment == 9.5
+    assert db_session.get(Contact, kept.id).mission_alignment == 4.0
+
+
+def test_merge_validation(client, db_session):
+    a, b = Contact(name="A"), Contact(name="B")
+    db_session.add_all([a, b])
+    db_session.commit()
+    assert client.post("/api/contacts/99999/merge", json={"loser_ids": [b.id]}).status_code == 404
+    assert client.post(f"/api/contacts/{a.id}/merge", json={"loser_ids": []}).status_code == 400
+    assert client.post(f"/api/contacts/{a.id}/merge", json={"loser_ids": [a.id]}).status_code == 400
+    assert client.post(f"/api/contacts/{a.id}/merge", json={"loser_ids": [b.id, 99999]}).status_code == 400
+    assert db_session.query(Contact).count() == 2
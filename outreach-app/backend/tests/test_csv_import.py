@@ -193,3 +193,66 @@ def test_import_single_row(client, db_session):
     info = db_session.query(ContactInfo).filter_by(contact_id=contact.id).first()
     assert info.type == "email"
     assert info.value == "jane@example.com"
+
+
+def test_import_rejects_non_utf8(client, db_session):
+    r = client.post(
+        "/api/contacts/import-csv",
+        files={"file": ("contacts.csv", io.BytesIO("name\nJosé\n".encode("latin-1")), "text/csv")},
+    )
+    assert r.status_code == 400
+    assert "utf-8" in r.json()["detail"].lower()
+
+    # Bad bytes past the first decoded block: earlier rows are kept, the rest is reported
+    good = "".join(f"Person {i}\n" for i in range(1000)).encode()
+    r = client.post(
+        "/api/contacts/import-csv",
+        files={"file": ("contacts.csv", io.BytesIO(b"name\n" + good + "José\n".encode("latin-1")), "text/csv")},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["skipped_rows"][-1]["reason"] == "Not UTF-8; import stopped here"
+    assert 0 < data["created"] == db_session.query(Contact).count() <= 1000
+
+
+def test_import_chunks_and_same_name_in_file(client, db_session, monkeypatch):
+    monkeypatch.setattr("app.csv_import.IMPORT_CHUNK_ROWS", 2)
+    csv = "name,email\nAlice,a@example.com\nalice,a2@example.com\nBob,\nALICE,a@example.com\nCarol,c@example.com\n"
+    r = client.post("/api/contacts/import-csv", files={"file": _csv_file(csv)})
+    data = r.json()
+    assert data["rows"] == 5
+    assert data["created"] == 3 and data["updated"] == 2
+    assert data["info_added"] == 3 and data["info_skipped_duplicates"] == 1
+    assert db_session.query(Contact).count() == 3
+    alice = db_session.query(Contact).filter_by(name="Alice").one()
+    assert db_session.query(ContactInfo).filter_by(contact_id=alice.id).count() == 2
+    assert alice.recommended_method == "email"
+
+
+# ---------------------------------------------------------------------------
+# Background job (POST /api/jobs/import-csv)
+# ---------------------------------------------------------------------------
+
+def test_import_job_reports_progress_and_errors(client, db_session, monkeypatch):
+    monkeypatch.setattr("app.csv_import.IMPORT_CHUNK_ROWS", 2)
+    rows = "".join(f"Person {i},p{i}@example.com\n" for i in range(5))
+    csv = "name,email\n" + rows + ",orphan@example.com\n"
+    r = client.post("/api/jobs/import-csv", files={"file": _csv_file(csv)})
+    assert r.status_code == 200
+    assert r.json()["status"] == "started"
+
+    status = client.get("/api/jobs/import-csv-status").json()
+    assert status["status"] == "complete"
+    assert status["percent"] == 100.0
+    assert status["rows"] == 6 and status["created"] == 5 and status["info_added"] == 5
+    assert status["skipped"] == 1
+    assert status["skipped_rows"] == [{"row": 7, "reason": "Empty name"}]
+    assert db_session.query(Contact).count() == 5
+
+
+def test_import_job_rejects_bad_header(client):
+    r = client.post("/api/jobs/import-csv", files={"file": _csv_file("email\nx@example.com\n")})
+    assert r.status_code == 400
+    status = client.get("/api/jobs/import-csv-status").json()
+    assert status["status"] == "error"
+    assert "name" in status["message"]
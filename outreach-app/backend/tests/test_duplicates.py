@@ -0,0 +1,104 @@
+"""Tests for near-duplicate contact detection (app.duplicates) and its endpoints."""
+import io
+
+from app.duplicates import name_keys, name_similarity
+from app.models import Contact, ContactInfo, ContactNameKey
+
+
+def test_name_normalization_and_similarity():
+    assert "n:russell stuart" in name_keys("Russell, Stuart J.") & name_keys("Dr. Stuart Russell")
+    assert "n:hernandez jose" in name_keys("José Hernández (MIT)")
+    assert name_similarity("Stuart Russell", "Stuart Russel") >= 0.9
+    assert name_similarity("S. Russell", "Stuart Russell") == 0.9
+    assert name_similarity("John Smith", "Jane Smith") < 0.85
+    # Spelling variants share the phonetic key
+    assert "p:S363 R240" in name_keys("Stuart Russel") & name_keys("Stewart Russell")
+
+
+def test_keys_follow_inserts_renames_and_deletes(db_session):
+    c = Contact(name="Stuart Russell")
+    db_session.add(c)
+    db_session.commit()
+    keys = {k.key for k in db_session.query(ContactNameKey).filter_by(contact_id=c.id)}
+    assert "n:russell stuart" in keys
+
+    c.name = "Yoshua Bengio"
+    db_session.commit()
+    keys = {k.key for k in db_session.query(ContactNameKey).filter_by(contact_id=c.id)}
+    assert "n:bengio yoshua" in keys and "n:russell stuart" not in keys
+
+    db_session.delete(c)
+    db_session.commit()
+    assert db_session.query(ContactNameKey).count() == 0
+
+
+def test_add_contacts_skips_exact_names_and_flags_lookalikes(client, db_session):
+    db_session.add(Contact(name="Stuart Russell"))
+    db_session.commit()
+    data = client.post("/api/contacts", json={"names": "Russell, Stuart, Stuart Russel, Ada Lovelace"}).json()
+    # "Russell, Stuart" is split on the comma, so it arrives as two names
+    assert "Stuart Russel" in data["added"]
+    assert data["possible_duplicates"][0]["name"] == "Stuart Russel"
+    assert data["possible_duplicates"][0]["candidates"][0]["name"] == "Stuart Russell"
+
+    data = client.post("/api/contacts", json={"names": "stuart russell, Dr. Stuart Russell"}).json()
+    assert data["skipped"] == ["stuart russell"] and data["added"] == ["Dr. Stuart Russell"]
+    assert data["possible_duplicates"][0]["candidates"][0]["score"] == 1.0
+
+
+def test_add_contacts_keeps_names_differing_in_initial_or_order(client, db_session):
+    db_session.add(Contact(name="John A. Smith"))
+    db_session.commit()
+    data = client.post("/api/contacts", json={"names": "John B. Smith, Smith John"}).json()
+    assert data["added"] == ["John B. Smith", "Smith John"] and data["skipped"] == []
+    assert [d["candidates"][0]["name"] for d in data["possible_duplicates"]] == ["John A. Smith"] * 2
+    assert db_session.query(Contact).count() == 3
+
+
+def test_csv_import_matches_exact_names_only(client, db_session):
+    db_session.add(Contact(name="Stuart Russell"))
+    db_session.commit()
+    csv = (
+        'name,email\n"Russell, Stuart",stuart@example.com\nstuart russell,sr@example.com\n'
+        'Ada Lovelace,ada@example.com\n"Lovelace, Ada",ada2@example.com\nStuart Russel,\n'
+    )
+    r = client.post("/api/contacts/import-csv", files={"file": ("c.csv", io.BytesIO(csv.encode()), "text/csv")})
+    data = r.json()
+    assert data["created"] == 4 and data["updated"] == 1
+    assert data["updated_names"] == ["stuart russell"]
+    assert {d["name"]: d["candidates"][0]["name"] for d in data["possible_duplicates"]} == {
+        "Russell, Stuart": "Stuart Russell",
+        "Lovelace, Ada": "Ada Lovelace",
+        "Stuart Russel": "Stuart Russell",
+    }
+    # Core-inserted contacts get name keys too
+    new = db_session.query(Contact).filter_by(name="Ada Lovelace").one()
+    assert db_session.query(ContactNameKey).filter_by(contact_id=new.id).count() > 0
+
+
+def test_csv_import_keeps_names_differing_in_initial_or_order(client, db_session):
+    db_session.add(Contact(name="John A. Smith"))
+    db_session.commit()
+    csv = "name,email\nJohn B. Smith,jb@example.com\nSmith John,sj@example.com\n"
+    data = client.post("/api/contacts/import-csv", files={"file": ("c.csv", io.BytesIO(csv.encode()), "text/csv")}).json()
+    assert data["created"] == 2 and data["updated"] == 0
+    assert [d["candidates"][0]["name"] for d in data["possible_duplicates"]] == ["John A. Smith"] * 2
+    original = db_session.query(Contact).filter_by(name="John A. Smith").one()
+    assert db_session.query(ContactInfo).filter_by(contact_id=original.id).count() == 0
+
+
+def test_contact_duplicates_endpoint_and_bulk_job(client, db_session):
+    a, b, c, d = (Contact(name=n) for n in ("Stuart Russell", "S. Russell", "Russell, Stuart J.", "Ada Lovelace"))
+    db_session.add_all([a, b, c, d])
+    db_session.commit()
+
+    data = client.get(f"/api/contacts/{a.id}/duplicates").json()
+    assert [x["id"] for x in data["candidates"]] == [c.id, b.id]
+    assert client.get(f"/api/contacts/{d.id}/duplicates").json()["count"] == 0
+
+    assert client.post("/api/jobs/find-duplicates").json()["status"] == "started"
+    result = client.get("/api/jobs/duplicates-status").json()
+    assert result["status"] == "complete"
+    assert result["contacts_scanned"] == 4
+    assert len(result["groups"]) == 1
+    assert {x["id"] for x in result["groups"][0]["contacts"]} == {a.id, b.id, c.id}
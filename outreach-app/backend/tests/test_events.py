@@ -0,0 +1,93 @@
+"""Tests for the live event stream: bus (app.events), commit-time events and SSE framing (GET /api/events)."""
+import asyncio
+import json
+import threading
+
+from sqlalchemy import insert
+
+from app.api.events import stream_events
+from app.events import bus, latest_mention_id, publish_new_mentions
+from app.models import Contact, ContactConnection, Mention
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+def test_commit_publishes_new_mentions_and_connections(db_session):
+    a, b = Contact(name="Ada Lovelace"), Contact(name="Alan Turing")
+    db_session.add_all([a, b])
+    db_session.commit()
+    start = bus.last_id
+
+    mention = Mention(contact_id=a.id, source_type="news", title="Engines")
+    db_session.add(mention)
+    db_session.flush()
+    assert bus.last_id == start  # Nothing until the commit
+    db_session.add(ContactConnection(contact_id=a.id, other_contact_id=b.id, relationship_type="co_mention"))
+    db_session.commit()
+    events = bus.recent(start)
+    assert [e["type"] for e in events] == ["mention", "connection"]
+    assert events[0]["data"] == {"id": mention.id, "contact_id": a.id, "article_id": None, "source_type": "news"}
+    assert events[1]["data"]["other_contact_id"] == b.id
+
+    # Rolled back inserts are never announced
+    start = bus.last_id
+    db_session.add(Mention(contact_id=b.id, source_type="news"))
+    db_session.flush()
+    db_session.rollback()
+    db_session.add(Contact(name="Grace Hopper"))
+    db_session.commit()
+    assert bus.recent(start) == []
+
+
+def test_new_mentions_from_other_process_published_once(db_session, monkeypatch):
+    monkeypatch.setattr("app.events._published_mentions", {})  # Ids from other tests' databases
+    a = Contact(name="Ada Lovelace")
+    db_session.add(a)
+    db_session.commit()
+    seen = latest_mention_id(db_session)
+    ours = Mention(contact_id=a.id, source_type="news")
+    db_session.add(ours)
+    db_session.commit()
+    # A Core insert stands in for the fetch subprocess: no session events
+    db_session.execute(insert(Mention).values(contact_id=a.id, source_type="podcast"))
+    db_session.commit()
+    start = bus.last_id
+
+    seen = publish_new_mentions(db_session, seen)
+    assert [(e["data"]["id"], e["data"]["source_type"]) for e in bus.recent(start)] == [(seen, "podcast")]
+    assert seen > ours.id
+
+
+def test_job_events_match_status_endpoint(client, db_session):
+    db_session.add_all([Contact(name="Stuart Russell"), Contact(name="S. Russell")])
+    db_session.commit()
+    start = bus.last_id
+
+    client.post("/api/jobs/find-duplicates")
+    jobs = [e["data"] for e in bus.recent(start) if e["type"] == "job"]
+    assert [(j["job"], j["status"]) for j in jobs] == [("duplicates", "running"), ("duplicates", "complete")]
+    assert jobs[-1] == {"job": "duplicates", **client.get("/api/jobs/duplicates-status").json()}
+
+
+def test_stream_replays_then_pushes_events_from_other_threads():
+    async def run():
+        seen = bus.publish("job", {"job": "score", "status": "running"})["id"]
+        bus.publish("mention", {"id": 1})
+        bus.publish("job", {"job": "score", "status": "complete", "scored": 3})
+        stream = stream_events(_Request(), {"job"}, seen - 1)
+        assert await anext(stream) == "retry: 1000\n\n"
+        replayed = [await anext(stream), await anext(stream)]
+        assert replayed[0].startswith(f"id: {seen}\nevent: job\n")
+        assert json.loads(replayed[1].split("data: ")[1]) == {"job": "score", "status": "complete", "scored": 3}
+
+        worker = threading.Thread(target=bus.publish, args=("job", {"job": "media", "status": "running"}))
+        worker.start()
+        pushed = await asyncio.wait_for(anext(stream), 1)
+        worker.join()
+        assert '"job": "media"' in pushed
+        await stream.aclose()
+
+    asyncio.run(run())
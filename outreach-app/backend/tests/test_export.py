@@ -0,0 +1,73 @@
+"""Tests for streaming CSV/JSONL exports (app.export, /api/export)."""
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta
+
+from app.models import Contact, ContactInfo, ContactTag, Mention, OutreachLog
+
+
+def _seed(db):
+    now = datetime.now(UTC)
+    contacts = [Contact(name=f"Person {i}", list_number=i, category="Policy") for i in range(1, 6)]
+    db.add_all(contacts)
+    db.flush()
+    first = contacts[0]
+    db.add_all([
+        ContactInfo(contact_id=first.id, type="email", value="p1@example.com", is_primary=1),
+        ContactInfo(contact_id=first.id, type="email", value="p1@work.example.com"),
+        ContactInfo(contact_id=first.id, type="substack", value="p1.substack.com"),
+        ContactTag(contact_id=first.id, tag="Prioritize"),
+        ContactTag(contact_id=contacts[3].id, tag="Funding potential"),
+        OutreachLog(contact_id=first.id, method="email", sent_at=now - timedelta(days=3), response_status="sent"),
+        OutreachLog(contact_id=first.id, method="linkedin", sent_at=now - timedelta(days=1), response_status="replied"),
+        Mention(contact_id=first.id, source_type="news", title="Old", published_at=now - timedelta(days=40)),
+        Mention(contact_id=first.id, source_type="news", title="New", published_at=now - timedelta(days=1)),
+        Mention(contact_id=contacts[1].id, source_type="podcast", title="Gone", published_at=now, dismissed=1),
+    ])
+    db.commit()
+    return contacts
+
+
+def test_export_contacts_csv(client, db_session, monkeypatch):
+    monkeypatch.setattr("app.export.EXPORT_CHUNK_ROWS", 2)  # extras looked up across several chunks
+    _seed(db_session)
+    r = client.get("/api/export/contacts")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "attachment" in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["name"] for row in rows] == [f"Person {i}" for i in range(1, 6)]
+    assert rows[0]["email"] == "p1@example.com; p1@work.example.com"
+    assert rows[0]["other"] == "p1.substack.com"
+    assert rows[0]["tags"] == "Prioritize"
+    assert rows[0]["last_outreach_method"] == "linkedin"
+    assert rows[0]["last_outreach_status"] == "replied"
+    assert rows[3]["tags"] == "Funding potential"
+    assert rows[1]["email"] == rows[1]["tags"] == rows[1]["last_outreach_method"] == ""
+
+
+def test_export_contacts_jsonl(client, db_session):
+    _seed(db_session)
+    r = client.get("/api/export/contacts", params={"format": "jsonl"})
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 5
+    assert records[0]["contact_info"][0] == {"type": "email", "value": "p1@example.com", "is_primary": True}
+    assert records[0]["last_outreach"]["method"] == "linkedin"
+    assert records[0]["in_mention_rotation"] is False
+    assert records[2]["last_outreach"] is None
+    assert client.get("/api/export/contacts", params={"format": "xml"}).status_code == 422
+
+
+def test_export_mentions_filters(client, db_session):
+    contacts = _seed(db_session)
+    r = client.get("/api/export/mentions", params={"format": "jsonl"})
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [m["title"] for m in records] == ["Gone", "New", "Old"]
+    assert records[1]["contact_name"] == "Person 1"
+
+    r = client.get("/api/export/mentions", params={"days": 30, "include_dismissed": False})
+    assert [row["title"] for row in csv.DictReader(io.StringIO(r.text))] == ["New"]
+    r = client.get("/api/export/mentions", params={"contact_id": contacts[1].id})
+    assert [row["title"] for row in csv.DictReader(io.StringIO(r.text))] == ["Gone"]
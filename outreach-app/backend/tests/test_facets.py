@@ -0,0 +1,69 @@
+"""Tests for contact facet counts (app.facets) and GET /api/contacts/facets."""
+from app.models import Contact, ContactTag
+
+
+def _seed(db):
+    a = Contact(name="Ada", category="Policy", relationship_stage="Warm", in_mention_rotation=1, enrichment_status="enriched")
+    b = Contact(name="Bob", category="Policy", relationship_stage="Cold")
+    c = Contact(name="Cy", category="Academic", relationship_stage="Warm", in_mention_rotation=1)
+    db.add_all([a, b, c])
+    db.flush()
+    db.add_all([
+        ContactTag(contact_id=a.id, tag="Prioritize"),
+        ContactTag(contact_id=c.id, tag="Prioritize"),
+        ContactTag(contact_id=b.id, tag="Funding potential"),
+    ])
+    db.commit()
+    return a, b, c
+
+
+def _values(facet):
+    return {f["value"]: f["count"] for f in facet}
+
+
+def test_facet_counts(client, db_session):
+    _seed(db_session)
+    data = client.get("/api/contacts/facets").json()
+    assert data["total"] == 3
+    assert data["category"][0] == {"value": "Policy", "count": 2}
+    assert _values(data["relationship_stage"]) == {"Warm": 2, "Cold": 1}
+    assert _values(data["tag"]) == {"Prioritize": 2, "Funding potential": 1}
+    assert _values(data["in_mention_rotation"]) == {True: 2, False: 1}
+    assert _values(data["enrichment_status"]) == {"pending": 2, "enriched": 1}
+
+
+def test_facets_respect_filters_except_their_own(client, db_session):
+    _seed(db_session)
+    data = client.get("/api/contacts/facets", params={"category": "Policy", "in_rotation": True}).json()
+    assert data["total"] == 1
+    # Category counts ignore the category filter, but not the rotation filter
+    assert _values(data["category"]) == {"Policy": 1, "Academic": 1}
+    assert _values(data["in_mention_rotation"]) == {True: 1, False: 1}
+    assert _values(data["tag"]) == {"Prioritize": 1}
+
+    data = client.get("/api/contacts/facets", params={"q": "ada"}).json()
+    assert data["total"] == 1
+    assert _values(data["relationship_stage"]) == {"Warm": 1}
+
+
+def test_facets_cached_until_write(client, db_session):
+    a, b, _ = _seed(db_session)
+    assert client.get("/api/contacts/facets").json()["cached"] is False
+    assert client.get("/api/contacts/facets").json()["cached"] is True
+
+    # Tag write through the API
+    client.post(f"/api/contacts/{b.id}/tags", json={"tag": "Prioritize"})
+    data = client.get("/api/contacts/facets").json()
+    assert data["cached"] is False
+    assert _values(data["tag"])["Prioritize"] == 3
+
+    # Bulk UPDATE (rotation) skips the flush but still invalidates
+    client.put("/api/contacts/rotation", json={"contact_ids": [a.id]})
+    data = client.get("/api/contacts/facets").json()
+    assert data["cached"] is False
+    assert _values(data["in_mention_rotation"]) == {True: 1, False: 2}
+
+    # Writes to unfaceted fields keep the cache
+    client.get("/api/contacts/facets")
+    client.patch(f"/api/contacts/{a.id}", json={"mission_alignment": 4.0})
+    assert client.get("/api/contacts/facets").json()["cached"] is True
@@ -0,0 +1,110 @@
+"""Tests for relationship map versioning (app.graph_changes) and delta responses."""
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.graph_changes import changes_since, current_graph_version, prune_graph_changes
+from app.graph_metrics import update_layout
+from app.models import Contact, ContactConnection, GraphChange
+
+
+def _pair(db_session):
+    a = Contact(name="A", list_number=1)
+    b = Contact(name="B", list_number=2)
+    db_session.add_all([a, b])
+    db_session.commit()
+    return a, b
+
+
+def test_version_bumps_on_map_writes_only(db_session):
+    a, b = _pair(db_session)
+    v1 = current_graph_version(db_session)
+    assert v1 > 0
+
+    # Fields not shown on the map don't bump the version
+    a.bio = "Researcher"
+    db_session.commit()
+    assert current_graph_version(db_session) == v1
+
+    a.relationship_stage = "Engaged"
+    db_session.commit()
+    v2 = current_graph_version(db_session)
+    assert v2 > v1
+    assert changes_since(db_session, v1) == {"contact": {a.id}, "connection": set()}
+
+    conn = ContactConnection(contact_id=a.id, other_contact_id=b.id, relationship_type="same_org")
+    db_session.add(conn)
+    db_session.commit()
+    assert changes_since(db_session, v2)["connection"] == {conn.id}
+
+
+def test_changes_since_detects_pruned_gap(db_session):
+    _pair(db_session)
+    latest = current_graph_version(db_session)
+    db_session.query(GraphChange).update(
+        {GraphChange.created_at: datetime.now(UTC) - timedelta(days=60)}, synchronize_session=False
+    )
+    db_session.commit()
+    assert prune_graph_changes(db_session) == latest - 1
+    assert current_graph_version(db_session) == latest
+    assert changes_since(db_session, 0) is None
+    assert changes_since(db_session, latest) == {"contact": set(), "connection": set()}
+    # Version from a different (reset) database
+    assert changes_since(db_session, latest + 5) is None
+
+
+def test_map_etag_and_delta(client, db_session):
+    a, b = _pair(db_session)
+    r = client.get("/api/relationship-map")
+    version = r.json()["version"]
+    etag = r.headers["etag"]
+    assert etag == f'W/"graph-{version}-full"'
+
+    r = client.get("/api/relationship-map", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    r = client.post(f"/api/contacts/{a.id}/connections", json={"other_contact_id": b.id, "relationship_type": "advisor"})
+    link_id = r.json()["id"]
+    r = client.get("/api/relationship-map", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+
+    r = client.get(f"/api/relationship-map?since={version}")
+    data = r.json()
+    assert data["full"] is False
+    assert data["since"] == version
+    assert [(l["id"], l["source_id"], l["target_id"]) for l in data["links"]] == [(link_id, a.id, b.id)]
+    # Background layout placed both endpoints, so they are sent with coordinates
+    assert {n["id"] for n in data["nodes"]} == {a.id, b.id}
+    assert data["removed_link_ids"] == [] and data["removed_node_ids"] == []
+
+    version = data["version"]
+    client.delete(f"/api/contacts/{a.id}/connections/{link_id}")
+    data = client.get(f"/api/relationship-map?since={version}").json()
+    assert data["links"] == []
+    assert data["removed_link_ids"] == [link_id]
+
+
+def test_deleted_contact_logs_cascaded_connections(client, db_session):
+    db_session.execute(text("PRAGMA foreign_keys=ON"))  # As app.database sets it; the test engine doesn't
+    a, b = _pair(db_session)
+    link = ContactConnection(contact_id=a.id, other_contact_id=b.id, relationship_type="advisor")
+    db_session.add(link)
+    db_session.commit()
+    version, b_id, link_id = current_graph_version(db_session), b.id, link.id
+
+    db_session.delete(b)
+    db_session.commit()
+    assert db_session.query(ContactConnection).count() == 0
+    data = client.get(f"/api/relationship-map?since={version}").json()
+    assert data["removed_node_ids"] == [b_id] and data["removed_link_ids"] == [link_id]
+
+
+def test_layout_refresh_bumps_version_only_when_moved(db_session):
+    _pair(db_session)
+    update_layout(db_session)
+    version = current_graph_version(db_session)
+    assert update_layout(db_session)["mode"] == "cached"
+    assert current_graph_version(db_session) == version
+    update_layout(db_session, full=True)
+    # Same seed, same graph: identical coordinates, nothing to send
+    assert current_graph_version(db_session) == version
@@ -0,0 +1,294 @@
+"""Tests for network centrality (app.graph_metrics)."""
+import pytest
+
+from app.api import jobs
+from app.graph_metrics import (
+    Graph,
+    approximate_betweenness,
+    compute_centrality,
+    detect_communities,
+    ego_network,
+    force_layout,
+    label_propagation,
+    pagerank,
+    update_layout,
+)
+from app.models import Contact, ContactConnection, ContactGraphMetrics
+
+
+def _star():
+    """Hub 1 connected to 2, 3, 4; edge 2-1 recorded in both directions."""
+    return Graph([1, 2, 3, 4], [(1, 2), (2, 1), (1, 3), (4, 1)])
+
+
+def test_graph_dedupes_undirected_edges():
+    g = _star()
+    assert g.degree(0) == 3
+    assert [g.degree(i) for i in (1, 2, 3)] == [1, 1, 1]
+    assert len(g.indices) == 6
+
+
+def test_pagerank_sums_to_one_and_ranks_hub_first():
+    ranks = pagerank(_star())
+    assert sum(ranks) == pytest.approx(1.0)
+    assert ranks[0] == max(ranks)
+    assert ranks[1] == pytest.approx(ranks[2])
+
+
+def test_pagerank_isolated_nodes():
+    ranks = pagerank(Graph([1, 2, 3], []))
+    assert ranks == pytest.approx([1 / 3] * 3)
+
+
+def test_betweenness_exact_on_path():
+    """Path 1-2-3: only the middle node lies between others (normalized = 1.0)."""
+    g = Graph([1, 2, 3], [(1, 2), (2, 3)])
+    assert approximate_betweenness(g) == pytest.approx([0.0, 1.0, 0.0])
+
+
+def test_betweenness_sampled_estimate():
+    """Sampling half the sources of a star still finds the hub and only the hub."""
+    hub_edges = [(0, i) for i in range(1, 20)]
+    g = Graph(list(range(20)), hub_edges)
+    bc = approximate_betweenness(g, samples=10, seed=1)
+    assert bc[0] > 0.5
+    assert all(b == 0.0 for b in bc[1:])
+
+
+def test_compute_centrality_stores_metrics(db_session):
+    hub = Contact(name="Hub")
+    a = Contact(name="A")
+    b = Contact(name="B")
+    db_session.add_all([hub, a, b])
+    db_session.commit()
+    db_session.add_all([
+        ContactConnection(contact_id=hub.id, other_contact_id=a.id, relationship_type="same_org"),
+        ContactConnection(contact_id=b.id, other_contact_id=hub.id, relationship_type="co_author"),
+    ])
+    db_session.commit()
+
+    result = compute_centrality(db_session)
+    assert result == {"contacts": 3, "edges": 2, "betweenness_samples": 3}
+    metrics = {m.contact_id: m for m in db_session.query(ContactGraphMetrics).all()}
+    assert metrics[hub.id].degree == 2
+    assert metrics[hub.id].betweenness == pytest.approx(1.0)
+    assert metrics[hub.id].pagerank > metrics[a.id].pagerank
+
+    # Re-running updates in place
+    compute_centrality(db_session)
+    assert db_session.query(ContactGraphMetrics).count() == 3
+
+
+def test_centrality_exposed_on_contact_and_map(client, db_session):
+    a = Contact(name="A", list_number=1)
+    b = Contact(name="B", list_number=2)
+    db_session.add_all([a, b])
+    db_session.commit()
+
+    r = client.get(f"/api/contacts/{a.id}")
+    assert r.json()["centrality"] is None
+
+    db_session.add(ContactConnection(contact_id=a.id, other_contact_id=b.id, relationship_type="same_org"))
+    db_session.commit()
+    compute_centrality(db_session)
+
+    r = client.get(f"/api/contacts/{a.id}")
+    assert r.json()["centrality"]["degree"] == 1
+    r = client.get("/api/contacts")
+    assert all(c["centrality"]["pagerank"] == pytest.approx(0.5) for c in r.json()["contacts"])
+    r = client.get("/api/relationship-map")
+    assert r.json()["nodes"][0]["centrality"]["degree"] == 1
+
+
+# --- Communities ---
+
+TWO_TRIANGLES = [(1, 2), (2, 3), (3, 1), (4, 5), (5, 6), (6, 4), (3, 4)]
+
+
+def test_label_propagation_two_triangles():
+    """Two triangles joined by one bridge split into two communities named by smallest id."""
+    g = Graph([1, 2, 3, 4, 5, 6, 7], TWO_TRIANGLES)
+    assert label_propagation(g) == [1, 1, 1, 4, 4, 4, 7]
+
+
+def _seed_two_triangles(db_session):
+    contacts = [Contact(name=f"C{i}", list_number=i) for i in range(1, 7)]
+    db_session.add_all(contacts)
+    db_session.commit()
+    ids = [c.id for c in contacts]
+    db_session.add_all([
+        ContactConnection(contact_id=ids[a - 1], other_contact_id=ids[b - 1], relationship_type="same_org")
+        for a, b in TWO_TRIANGLES
+    ])
+    db_session.commit()
+    return ids
+
+
+def test_detect_communities_stores_ids(db_session):
+    ids = _seed_two_triangles(db_session)
+    result = detect_communities(db_session)
+    assert result == {"contacts": 6, "communities": 2, "largest": 3}
+    by_contact = {m.contact_id: m.community_id for m in db_session.query(ContactGraphMetrics).all()}
+    assert {by_contact[i] for i in ids[:3]} == {ids[0]}
+    assert {by_contact[i] for i in ids[3:]} == {ids[3]}
+
+
+def test_collapsed_map_and_expand(client, db_session):
+    ids = _seed_two_triangles(db_session)
+    compute_centrality(db_session)
+    detect_communities(db_session)
+
+    r = client.get("/api/relationship-map?view=collapsed")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["view"] == "collapsed"
+    assert sorted(n["id"] for n in data["nodes"]) == [ids[0], ids[3]]
+    assert all(n["size"] == 3 for n in data["nodes"])
+    # Bridge endpoints are the most central members
+    assert {n["label"] for n in data["nodes"]} == {"C3", "C4"}
+    assert data["links"] == [{"source_id": ids[0], "target_id": ids[3], "weight": 1}]
+
+    r = client.get(f"/api/relationship-map/communities/{ids[3]}")
+    assert r.status_code == 200
+    data = r.json()
+    assert sorted(n["id"] for n in data["nodes"]) == ids[3:]
+    assert len(data["links"]) == 3
+    assert data["external_links"] == [{"community_id": ids[0], "weight": 1}]
+
+    r = client.get("/api/relationship-map")
+    assert all(n["community_id"] in (ids[0], ids[3]) for n in r.json()["nodes"])
+
+
+def test_expand_unknown_community(client):
+    r = client.get("/api/relationship-map/communities/9999")
+    assert r.status_code == 404
+
+
+# --- Layout ---
+
+def test_force_layout_keeps_fixed_nodes():
+    g = Graph([1, 2, 3], [(1, 2), (2, 3)])
+    initial = [(0.0, 0.0), (30.0, 0.0), None]
+    coords = force_layout(g, initial=initial, mobile={2}, iterations=20)
+    assert coords[0] == (0.0, 0.0)
+    assert coords[1] == (30.0, 0.0)
+    # New node settles near its neighbor, not across the map
+    assert abs(coords[2][0] - 30.0) < 100 and abs(coords[2][1]) < 100
+
+
+def test_force_layout_separates_nodes():
+    g = Graph(list(range(10)), [(i, i + 1) for i in range(9)])
+    coords = force_layout(g)
+    assert len(set(coords)) == 10
+
+
+def test_update_layout_full_then_incremental(db_session):
+    ids = _seed_two_triangles(db_session)
+    result = update_layout(db_session)
+    assert result == {"mode": "full", "contacts": 6, "moved": 6}
+    before = {m.contact_id: (m.layout_x, m.layout_y) for m in db_session.query(ContactGraphMetrics).all()}
+
+    assert update_layout(db_session)["mode"] == "cached"
+
+    # New contact linked to C1: it, C1 and C1's neighbors move; the far triangle stays put
+    newcomer = Contact(name="New")
+    db_session.add(newcomer)
+    db_session.commit()
+    db_session.add(ContactConnection(contact_id=newcomer.id, other_contact_id=ids[0], relationship_type="same_org"))
+    db_session.commit()
+    result = update_layout(db_session)
+    assert result["mode"] == "incremental"
+    assert result["moved"] == 4
+    db_session.expire_all()
+    after = {m.contact_id: (m.layout_x, m.layout_y) for m in db_session.query(ContactGraphMetrics).all()}
+    assert after[newcomer.id][0] is not None
+    assert all(after[i] == before[i] for i in ids[3:])
+
+
+def test_connection_added_during_layout_settles_next_run(db_session, monkeypatch):
+    ids = _seed_two_triangles(db_session)
+    update_layout(db_session)
+    newcomer = Contact(name="New")
+    db_session.add(newcomer)
+    db_session.commit()
+    update_layout(db_session)
+
+    def layout_while_connecting(*args, **kwargs):
+        # Created after the graph was loaded, so this run does not see it
+        db_session.add(ContactConnection(contact_id=newcomer.id, other_contact_id=ids[3], relationship_type="same_org"))
+        db_session.flush()
+        return run_layout(*args, **kwargs)
+
+    run_layout = force_layout
+    monkeypatch.setattr("app.graph_metrics.force_layout", layout_while_connecting)
+    assert update_layout(db_session, full=True)["mode"] == "full"
+    monkeypatch.undo()
+    assert update_layout(db_session)["mode"] == "incremental"
+
+
+def test_map_returns_cached_coordinates(client, db_session):
+    ids = _seed_two_triangles(db_session)
+    r = client.get("/api/relationship-map")
+    assert all(n["x"] is None for n in r.json()["nodes"])
+
+    # Creating a connection through the API settles the layout in the background
+    r = client.post(f"/api/contacts/{ids[0]}/connections", json={"other_contact_id": ids[5], "relationship_type": "advisor"})
+    assert r.status_code == 200
+    r = client.get("/api/relationship-map")
+    assert all(isinstance(n["x"], float) and isinstance(n["y"], float) for n in r.json()["nodes"])
+
+
+# --- Ego network ---
+
+def test_ego_network_hops_and_links(client, db_session):
+    ids = _seed_two_triangles(db_session)
+    r = client.get(f"/api/relationship-map/ego/{ids[0]}?hops=1")
+    assert r.status_code == 200
+    data = r.json()
+    assert [(n["id"], n["hop"]) for n in data["nodes"]] == [(ids[0], 0), (ids[1], 1), (ids[2], 1)]
+    assert len(data["links"]) == 3
+    assert data["truncated"] is False
+
+    # Two hops crosses the bridge 3-4 into the other triangle
+    data = client.get(f"/api/relationship-map/ego/{ids[0]}?hops=2").json()
+    assert {n["id"]: n["hop"] for n in data["nodes"]}[ids[3]] == 2
+    assert len(data["nodes"]) == 4
+    # Links among returned nodes only (4-5, 4-6 excluded)
+    assert len(data["links"]) == 4
+
+    assert client.get("/api/relationship-map/ego/9999").status_code == 404
+
+
+def test_ego_network_prunes_weak_connections(db_session):
+    center = Contact(name="Center")
+    others = [Contact(name=f"N{i}") for i in range(4)]
+    db_session.add_all([center, *others])
+    db_session.commit()
+    types = ["mentioned_together", "co_author", "same_org", "co_mentioned_news"]
+    db_session.add_all([
+        ContactConnection(contact_id=center.id, other_contact_id=o.id, relationship_type=t)
+        for o, t in zip(others, types)
+    ])
+    db_session.commit()
+
+    hop_of, truncated = ego_network(db_session, center.id, hops=2, max_nodes=3)
+    assert truncated is True
+    assert set(hop_of) == {center.id, others[1].id, others[2].id}
+
+
+def test_layout_runs_coalesce(test_engine, monkeypatch):
+    calls = []
+
+    def fake_update_layout(db, full=False):
+        calls.append(full)
+        if len(calls) == 1:
+            # Requests arriving mid-run fold into one rerun instead of a second writer
+            jobs.run_update_layout(test_engine)
+            jobs.run_update_layout(test_engine, full=True)
+        return {"mode": "full" if full else "incremental", "contacts": 0, "moved": 0}
+
+    monkeypatch.setattr(jobs, "update_layout", fake_update_layout)
+    jobs.run_update_layout(test_engine)
+    assert calls == [False, True]
+    jobs.run_update_layout(test_engine)
+    assert calls == [False, True, False]
@@ -0,0 +1,79 @@
+"""Tests for near-duplicate article detection (app.near_duplicates) at ingest and for stored articles."""
+from datetime import UTC, datetime
+
+from app.articles import ingest_articles
+from app.models import Article, ArticleFingerprintBand, Contact, Mention, ReplyDraft
+from app.near_duplicates import collapse_near_duplicates, fingerprint, shingles, similarity
+
+STORY = (
+    "Stuart Russell warns that frontier AI labs need binding safety standards before deploying "
+    "more capable systems, speaking at a Berkeley panel on Tuesday."
+)
+SYNDICATED = STORY.replace(" on Tuesday.", " Tuesday - The Verge")
+REWRITE = (
+    "UC Berkeley's Stuart Russell said regulators, not the companies, should decide when frontier "
+    "models are safe enough to release, in remarks at a campus event."
+)
+
+
+def _item(url, title, snippet=""):
+    return {"source_type": "news", "source_url": url, "title": title, "snippet": snippet,
+            "published_at": datetime.now(UTC)}
+
+
+def test_fingerprint_similarity():
+    assert similarity(shingles(STORY), shingles(SYNDICATED)) >= 0.6 > similarity(shingles(STORY), shingles(REWRITE))
+    a, b = fingerprint(STORY, None), fingerprint(None, SYNDICATED)
+    assert len(a.bands) == 12 and set(a.bands) & set(b.bands)
+    assert fingerprint("Short headline only", None) is None
+
+
+def test_ingest_links_syndicated_copy_to_stored_article(client, db_session):
+    russell, other = Contact(name="Stuart Russell"), Contact(name="Ada Lovelace")
+    db_session.add_all([russell, other])
+    db_session.commit()
+
+    first = ingest_articles(db_session, russell.id, [_item("https://a.test/story", STORY)])
+    copies = ingest_articles(db_session, russell.id, [
+        _item("https://b.test/syndicated/123", SYNDICATED), _item("https://c.test/other", REWRITE),
+    ])
+    assert first["articles_created"] == 1
+    assert copies == {"added": 1, "co_mentions": 0, "articles_created": 1, "near_duplicates": 1, "skipped": 1}
+    # Another contact's copy links to the representative
+    assert ingest_articles(db_session, other.id, [_item("https://b.test/syndicated/123", SYNDICATED)])["added"] == 1
+    db_session.commit()
+
+    assert db_session.query(Article).count() == 2
+    data = client.get("/api/mentions", params={"max_per_contact": 5}).json()
+    titles = sorted(m["title"] for m in data["mentions"] if m["contact_id"] == russell.id)
+    assert titles == sorted([STORY, REWRITE])
+
+
+def test_collapse_folds_unfingerprinted_copies(db_session):
+    a, b = Contact(name="Stuart Russell"), Contact(name="Ada Lovelace")
+    db_session.add_all([a, b])
+    db_session.flush()
+    story, copy, short = (
+        Article(url_key="https://a.test/1", source_type="news", title=STORY),
+        Article(url_key="https://b.test/2", source_type="news", title=SYNDICATED),
+        Article(url_key="https://c.test/3", source_type="news", title="Too short"),
+    )
+    db_session.add_all([story, copy, short])
+    db_session.flush()
+    kept = Mention(article_id=story.id, contact_id=a.id, source_type="news")
+    dupe = Mention(article_id=copy.id, contact_id=a.id, source_type="news")
+    moved = Mention(article_id=copy.id, contact_id=b.id, source_type="news")
+    db_session.add_all([kept, dupe, moved])
+    db_session.flush()
+    db_session.add(ReplyDraft(contact_id=a.id, mention_id=dupe.id, reply_text="Congrats"))
+    db_session.commit()
+
+    assert collapse_near_duplicates(db_session) == {"fingerprinted": 2, "collapsed": 1, "links_dropped": 1}
+    db_session.commit()
+    db_session.expire_all()
+    assert {x.id for x in db_session.query(Article)} == {story.id, short.id}
+    assert {(m.contact_id, m.article_id) for m in db_session.query(Mention)} == {(a.id, story.id), (b.id, story.id)}
+    assert db_session.query(ReplyDraft).one().mention_id == kept.id
+    assert db_session.query(ArticleFingerprintBand).filter_by(article_id=story.id).count() == 12
+    # Nothing left to do on a second run
+    assert collapse_near_duplicates(db_session)["collapsed"] == 0
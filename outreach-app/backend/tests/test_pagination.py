@@ -0,0 +1,81 @@
+"""Tests for keyset cursor pagination (app.pagination) on list endpoints."""
+from datetime import UTC, datetime, timedelta
+
+from app.models import Contact, Mention, OutreachLog
+from app.pagination import decode_cursor, encode_cursor
+
+
+def _walk(client, url, key, limit, **params):
+    """Follow next_cursor to the end; return all ids in order."""
+    ids, cursor = [], None
+    while True:
+        page = client.get(url, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})}).json()
+        ids += [row["id"] for row in page[key]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    when = datetime(2026, 3, 1, 12, 30)
+    assert decode_cursor(encode_cursor(when, 7), datetime) == (when, 7)
+    assert decode_cursor(encode_cursor(None, 3)) == (None, 3)
+
+
+def test_invalid_cursor(client):
+    r = client.get("/api/contacts", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+
+def test_contacts_cursor_pages_match_listing(client, db_session):
+    # Duplicate and missing list numbers: id breaks ties, NULLs come last
+    numbers = [3, 1, None, 2, 2, None, 5]
+    contacts = [Contact(name=f"C{i}", list_number=n) for i, n in enumerate(numbers)]
+    db_session.add_all(contacts)
+    db_session.commit()
+
+    expected = [c.id for c in sorted(contacts, key=lambda c: (c.list_number is None, c.list_number or 0, c.id))]
+    assert _walk(client, "/api/contacts", "contacts", limit=2) == expected
+
+    page = client.get("/api/contacts", params={"limit": 3, "include_total": False}).json()
+    assert page["total"] is None
+    assert [c["id"] for c in page["contacts"]] == expected[:3]
+    # Offset paging still works for old clients
+    page = client.get("/api/contacts", params={"limit": 3, "skip": 3}).json()
+    assert page["total"] == 7
+    assert [c["id"] for c in page["contacts"]] == expected[3:6]
+
+
+def test_mentions_cursor_pages_newest_first(client, db_session):
+    a = Contact(name="A")
+    b = Contact(name="B")
+    db_session.add_all([a, b])
+    db_session.commit()
+    now = datetime.now(UTC)
+    mentions = [
+        Mention(contact_id=c.id, source_type="news", title=f"M{i}", published_at=now - timedelta(hours=i), created_at=now)
+        for i, c in enumerate([a, b, a, b, a])
+    ]
+    undated = Mention(contact_id=a.id, source_type="news", title="undated", created_at=now)
+    db_session.add_all([*mentions, undated])
+    db_session.commit()
+
+    ids = _walk(client, "/api/mentions", "mentions", limit=2, contact_id=a.id)
+    assert ids == [mentions[0].id, mentions[2].id, mentions[4].id, undated.id]
+
+    # Dashboard: at most 2 per contact, still newest first across pages
+    ids = _walk(client, "/api/mentions", "mentions", limit=1, max_per_contact=2)
+    assert ids == [mentions[0].id, mentions[1].id, mentions[2].id, mentions[3].id]
+
+
+def test_outreach_cursor_pages(client, db_session):
+    c = Contact(name="A")
+    db_session.add(c)
+    db_session.commit()
+    now = datetime.now(UTC)
+    entries = [OutreachLog(contact_id=c.id, method="email", sent_at=now - timedelta(days=i % 2)) for i in range(5)]
+    db_session.add_all(entries)
+    db_session.commit()
+
+    expected = [e.id for e in sorted(entries, key=lambda e: (-(e.sent_at.timestamp()), -e.id))]
+    assert _walk(client, "/api/outreach", "entries", limit=2) == expected
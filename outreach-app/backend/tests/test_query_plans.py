@@ -0,0 +1,84 @@
+"""Query plan regression tests: the hot mention queries must use their indexes, not scan the table.
+
+Each test runs the real endpoint, captures its SELECTs and checks EXPLAIN QUERY PLAN
+(SQLite) against the expected index. Stats come from ANALYZE, as after the migration.
+"""
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.database import analyze_tables
+from app.models import Contact, Mention
+
+
+@pytest.fixture
+def mentions_db(test_engine, db_session):
+    """50 contacts, 3000 mentions over two years (some undated, some dismissed), analyzed."""
+    rng = random.Random(0)
+    now = datetime.now(UTC)
+    db_session.execute(insert(Contact), [{"name": f"Contact {i}"} for i in range(50)])
+    db_session.execute(insert(Mention), [
+        {
+            "contact_id": rng.randint(1, 50),
+            "source_type": "news",
+            "title": f"Story {i}",
+            "published_at": None if i % 10 == 0 else now - timedelta(days=rng.random() * 730),
+            "created_at": now - timedelta(days=rng.random() * 730),
+            "relevance_score": rng.random(),
+            "dismissed": 1 if i % 7 == 0 else 0,
+        }
+        for i in range(3000)
+    ])
+    analyze_tables(db_session.connection(), "mentions")
+    db_session.commit()
+    return test_engine
+
+
+def _plans(engine, call) -> list[tuple[str, str]]:
+    """(statement, EXPLAIN QUERY PLAN text) for every SELECT on mentions issued by call()."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM mentions" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert call().status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with engine.connect() as conn:
+        return [
+            (statement, "\n".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params)))
+            for statement, params in captured
+        ]
+
+
+def _assert_no_table_scan(plan: str):
+    assert not any(line.strip() == "SCAN mentions" for line in plan.splitlines()), plan
+
+
+def test_dashboard_uses_recent_active_index(client, mentions_db):
+    plans = _plans(mentions_db, lambda: client.get("/api/mentions", params={"days": 7}))
+    assert plans
+    for _, plan in plans:
+        assert "ix_mentions_published_created_active" in plan, plan
+        _assert_no_table_scan(plan)
+
+
+def test_contact_mentions_use_partial_contact_index(client, mentions_db):
+    plans = _plans(mentions_db, lambda: client.get("/api/mentions", params={"contact_id": 3, "days": 90}))
+    page = [plan for statement, plan in plans if "LIMIT" in statement]
+    assert page and "ix_mentions_contact_published_active" in page[0], page
+    for _, plan in plans:
+        _assert_no_table_scan(plan)
+
+
+def test_digest_uses_created_at_index(client, mentions_db):
+    plans = _plans(mentions_db, lambda: client.get("/api/digest/daily"))
+    windowed = [plan for statement, plan in plans if "mentions.created_at >=" in statement]
+    assert len(windowed) == 2  # new mentions + low-confidence mentions
+    for plan in windowed:
+        assert "ix_mentions_created_at" in plan, plan
@@ -0,0 +1,77 @@
+"""Tests for the materialized recommended contact method (app.recommendations)."""
+from sqlalchemy import update
+
+from app.models import Contact, ContactInfo
+from app.recommendations import get_recommended_method, refresh_recommendations
+
+
+def _rec(client, contact_id):
+    return client.get(f"/api/contacts/{contact_id}").json()["recommended_contact_method"]
+
+
+def test_recommendation_follows_info_outreach_and_stage(client, db_session):
+    c = Contact(name="Alice", list_number=1, relationship_stage="Cold")
+    db_session.add(c)
+    db_session.commit()
+    rec = _rec(client, c.id)
+    assert rec["method"] == "email" and rec["available"] is False and rec["value"] is None
+
+    client.post(f"/api/contacts/{c.id}/info", json={"type": "email", "value": "alice@example.org"})
+    client.post(f"/api/contacts/{c.id}/info", json={"type": "linkedin", "value": "linkedin.com/in/alice"})
+    rec = _rec(client, c.id)
+    assert (rec["method"], rec["value"], rec["available"]) == ("email", "alice@example.org", True)
+
+    # Warm contacts get LinkedIn first
+    client.patch(f"/api/contacts/{c.id}", json={"relationship_stage": "Warm"})
+    assert _rec(client, c.id)["method"] == "linkedin"
+
+    # A reply by email wins regardless of stage
+    client.post("/api/outreach", json={"contact_id": c.id, "method": "email", "response_status": "replied"})
+    rec = _rec(client, c.id)
+    assert rec["method"] == "email"
+    assert "previously got a reply" in rec["reason"]
+
+    # The list endpoint serves the same stored value
+    listed = client.get("/api/contacts").json()["contacts"][0]["recommended_contact_method"]
+    assert listed == rec
+
+
+def test_primary_value_preferred():
+    infos = [
+        ContactInfo(type="email", value="old@example.org", is_primary=0),
+        ContactInfo(type="email", value="main@example.org", is_primary=1),
+    ]
+    assert get_recommended_method(infos)["value"] == "main@example.org"
+
+
+def test_refresh_backfills_and_keeps_updated_at(db_session):
+    c = Contact(name="Bob")
+    db_session.add(c)
+    db_session.commit()
+    db_session.add(ContactInfo(contact_id=c.id, type="twitter", value="@bob"))
+    db_session.commit()
+
+    db_session.execute(update(Contact).values(recommended_method=None, recommended_value=None))
+    db_session.commit()
+    updated_at = c.updated_at
+    assert refresh_recommendations(db_session) == 1
+    db_session.commit()
+    db_session.refresh(c)
+    assert (c.recommended_method, c.recommended_value) == ("twitter", "@bob")
+    # Recomputing is not a user edit
+    assert c.updated_at == updated_at
+
+
+def test_moved_info_refreshes_both_contacts(db_session):
+    a, b = Contact(name="Ann"), Contact(name="Ben")
+    db_session.add_all([a, b])
+    db_session.commit()
+    info = ContactInfo(contact_id=a.id, type="twitter", value="@ann")
+    db_session.add(info)
+    db_session.commit()
+    assert a.recommended_value == "@ann"
+
+    info.contact_id = b.id
+    db_session.commit()
+    assert (a.recommended_value, b.recommended_value) == (None, "@ann")
+    assert refresh_recommendations(db_session, []) == 0
@@ -0,0 +1,102 @@
+"""Tests for mention retention (app.retention): archive job, rollups, archive search and history."""
+import zlib
+from datetime import UTC, datetime, timedelta
+
+from app.models import (
+    Article,
+    ArticleFingerprintBand,
+    Contact,
+    Mention,
+    MentionArchiveChunk,
+    MentionRollup,
+    ReplyDraft,
+)
+from app.retention import archive_mentions
+
+
+def _ago(days):
+    return datetime.now(UTC) - timedelta(days=days)
+
+
+def _setup(db):
+    ada, alan = Contact(name="Ada Lovelace"), Contact(name="Alan Turing")
+    db.add_all([ada, alan])
+    db.flush()
+    old, shared = (
+        Article(url_key="https://x.test/engine", source_type="news", title="Analytical Engine notes",
+                snippet="Ada Lovelace on computing machinery", published_at=_ago(400)),
+        Article(url_key="https://x.test/shared", source_type="news", title="Computing history"),
+    )
+    db.add_all([old, shared])
+    db.flush()
+    db.add(ArticleFingerprintBand(article_id=old.id, band_key=1))
+    m = {
+        "old": Mention(contact_id=ada.id, article_id=old.id, source_type="news", published_at=_ago(400),
+                       relevance_score=0.9),
+        "old_shared": Mention(contact_id=ada.id, article_id=shared.id, source_type="news", published_at=_ago(200)),
+        "shared_recent": Mention(contact_id=alan.id, article_id=shared.id, source_type="news", published_at=_ago(2)),
+        "dismissed": Mention(contact_id=alan.id, source_type="podcast", title="Turing test episode", dismissed=1,
+                             published_at=_ago(40)),
+        "low": Mention(contact_id=alan.id, source_type="news", title="Another Alan", relevance_score=0.1,
+                       created_at=_ago(100)),
+        "low_recent": Mention(contact_id=alan.id, source_type="news", relevance_score=0.1, published_at=_ago(5)),
+        "drafted": Mention(contact_id=ada.id, source_type="news", title="Old but replied", published_at=_ago(300)),
+        "recent": Mention(contact_id=ada.id, source_type="news", title="Fresh", published_at=_ago(1)),
+    }
+    db.add_all(m.values())
+    db.flush()
+    db.add(ReplyDraft(contact_id=ada.id, mention_id=m["drafted"].id, reply_text="Thanks"))
+    db.commit()
+    return ada, alan, old, shared, m
+
+
+def test_archive_moves_due_mentions_and_keeps_rollups(db_session):
+    ada, alan, old, shared, m = _setup(db_session)
+    ids = {k: v.id for k, v in m.items()}
+
+    assert archive_mentions(db_session) == {"archived": 4, "chunks": 4, "articles_deleted": 1}
+    db_session.expire_all()
+    left = {mid for (mid,) in db_session.query(Mention.id)}
+    assert left == {ids["shared_recent"], ids["low_recent"], ids["drafted"], ids["recent"]}
+    # The orphaned article goes with its fingerprint; the one still linked stays
+    assert [a.id for a in db_session.query(Article)] == [shared.id]
+    assert db_session.query(ArticleFingerprintBand).count() == 0
+
+    rollups = {(r.contact_id, r.source_type, r.month.month): r for r in db_session.query(MentionRollup)}
+    assert sum(r.mentions for r in rollups.values()) == 4
+    assert rollups[(alan.id, "podcast", _ago(40).month)].dismissed == 1
+    assert rollups[(ada.id, "news", _ago(400).month)].score_sum == 0.9
+
+    chunk = db_session.query(MentionArchiveChunk).filter_by(contact_id=ada.id, month=_ago(400).date().replace(day=1)).one()
+    assert b"Analytical Engine notes" in zlib.decompress(chunk.payload)
+    assert archive_mentions(db_session)["archived"] == 0
+
+
+def test_archive_search_history_and_job(client, db_session):
+    ada, alan, *_ = _setup(db_session)
+    assert client.post("/api/jobs/archive-mentions").json()["status"] == "started"
+    assert client.get("/api/jobs/archive-status").json()["archived"] == 4
+
+    # Hot search no longer sees archived text; the archive path does
+    assert client.get("/api/mentions/search", params={"q": "engine", "days": 365}).json()["total"] == 0
+    data = client.get("/api/mentions/archive/search", params={"q": "analyt eng"}).json()
+    assert data["total"] == 1
+    hit = data["mentions"][0]
+    assert hit["archived"] and hit["contact_name"] == "Ada Lovelace" and hit["source_url"] is None
+    assert client.get("/api/mentions/archive/search", params={"q": "engine", "days": 90}).json()["total"] == 0
+    assert client.get("/api/mentions/archive/search", params={"q": "turing"}).json()["total"] == 0
+    assert client.get("/api/mentions/archive/search", params={"q": "turing", "include_dismissed": True}).json()["total"] == 1
+
+    months = client.get("/api/mentions/history", params={"contact_id": alan.id}).json()["months"]
+    assert sum(x["mentions"] for x in months) == 4
+    assert sum(x["archived"] for x in months) == 2
+    assert sum(x["dismissed"] for x in months) == 1
+
+
+def test_merge_moves_archive_to_winner(client, db_session):
+    ada, alan, *_ = _setup(db_session)
+    archive_mentions(db_session)
+    client.post(f"/api/contacts/{ada.id}/merge", json={"loser_ids": [alan.id]})
+    assert {c.contact_id for c in db_session.query(MentionArchiveChunk)} == {ada.id}
+    data = client.get("/api/mentions/archive/search", params={"q": "alan", "contact_id": ada.id}).json()
+    assert data["total"] == 1 and data["mentions"][0]["contact_name"] == "Ada Lovelace"
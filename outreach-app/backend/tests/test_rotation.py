@@ -0,0 +1,77 @@
+"""Tests for the automatic mention rotation planner (app.rotation) and its endpoints."""
+from datetime import UTC, date, datetime, timedelta
+
+from app.models import Contact, Mention, OutreachLog
+from app.rotation import get_rotation_plan, mark_fetched, plan_rotation, remaining_quota
+
+
+def _seed(db):
+    contacts = [Contact(name=f"C{i}", list_number=i) for i in range(1, 11)]
+    contacts[0].in_mention_rotation = 1
+    db.add_all(contacts)
+    db.flush()
+    # C10 is hot; C9 was already contacted
+    for source in ("news", "podcast", "video"):
+        db.add(Mention(contact_id=contacts[9].id, source_type=source, relevance_score=0.9,
+                       published_at=datetime.now(UTC) - timedelta(days=1)))
+    db.add(OutreachLog(contact_id=contacts[8].id, method="email"))
+    db.commit()
+    return {c.name: c.id for c in contacts}
+
+
+def test_plan_fills_pinned_hot_then_round_robin(db_session):
+    ids = _seed(db_session)
+    names = {v: k for k, v in ids.items()}
+    start = date(2026, 3, 2)
+    seen: dict[str, list[int]] = {}
+    for offset in range(6):
+        day = start + timedelta(days=offset)
+        plan = plan_rotation(db_session, day=day, budget=4)
+        assert plan["candidates"] == 9
+        picked = [(names[e["contact_id"]], e["reason"]) for e in plan["entries"]]
+        if offset == 0:
+            assert picked == [("C1", "pinned"), ("C10", "hot"), ("C2", "due"), ("C3", "due")]
+            assert plan["cycle_days"] == 4  # 7 unpinned, non-hot contacts / 2 due slots
+        assert "C9" not in {n for n, _ in picked}
+        for name, _ in picked:
+            seen.setdefault(name, []).append(offset)
+        mark_fetched(db_session, [e["contact_id"] for e in plan["entries"]], day=day)
+        db_session.commit()
+
+    assert len(seen["C1"]) == 6  # pinned: daily
+    others = ("C2", "C3", "C4", "C5", "C6", "C7", "C8")
+    # Hot contact comes back more often than the rest; everyone else at least once within a cycle
+    assert len(seen["C10"]) > max(len(seen[name]) for name in others)
+    for name in others:
+        assert seen[name][0] < 4, name
+
+
+def test_replanning_keeps_fetched_rows_and_respects_quota(db_session, monkeypatch):
+    monkeypatch.setattr("app.rotation.settings.newsapi_key", "k")
+    monkeypatch.setattr("app.rotation.settings.newsapi_daily_quota", 5)
+    monkeypatch.setattr("app.rotation.settings.serper_api_key", None)
+    _seed(db_session)
+    plan = plan_rotation(db_session)
+    assert plan["budget"] == 5 and len(plan["entries"]) == 5
+    mark_fetched(db_session, [e["contact_id"] for e in plan["entries"][:2]])
+    db_session.commit()
+    assert remaining_quota(db_session) == 3
+
+    plan = plan_rotation(db_session)
+    db_session.commit()
+    assert plan["budget"] == 3
+    stored = get_rotation_plan(db_session)
+    assert stored["count"] == 5 and stored["fetched"] == 2
+    assert len({e["contact_id"] for e in stored["entries"]}) == 5
+
+
+def test_rotation_plan_endpoints(client, db_session):
+    _seed(db_session)
+    r = client.post("/api/contacts/rotation/plan", json={"budget": 3})
+    assert r.status_code == 200
+    assert r.json()["planned"] == {"pinned": 1, "hot": 1, "due": 1}
+    data = client.get("/api/contacts/rotation/plan").json()
+    assert [e["name"] for e in data["entries"]] == ["C1", "C10", "C2"]
+    assert client.get("/api/contacts/rotation/plan", params={"date": "2020-01-01"}).json()["count"] == 0
+    assert client.get("/api/contacts/rotation/plan", params={"date": "yesterday"}).status_code == 400
+    assert client.post("/api/contacts/rotation/plan", json={"budget": -1}).status_code == 400
@@ -0,0 +1,120 @@
+"""Tests for full-text search (app.search) and contact search via the API."""
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import update
+
+from app.models import Contact, Mention, Note
+from app.search import contact_search_subquery, search_terms
+
+
+def _ids(client, q):
+    r = client.get("/api/contacts", params={"q": q})
+    assert r.status_code == 200
+    return [c["id"] for c in r.json()["contacts"]]
+
+
+def test_search_terms_drop_operators():
+    assert search_terms('compute "gov" OR -x*') == ["compute", "gov", "OR", "x"]
+    assert search_terms("  ---  ") == []
+
+
+def test_contact_search_fields_prefix_and_ranking(client, db_session):
+    name_hit = Contact(name="Ada Governance", list_number=2)
+    bio_hit = Contact(name="Bob", list_number=1, bio="Works on compute governance policy")
+    other = Contact(name="Cy", list_number=3, role_org="Director, Future Institute", primary_interests="biosecurity")
+    db_session.add_all([name_hit, bio_hit, other])
+    db_session.commit()
+
+    # Prefix match on every word; name matches outrank bio matches
+    assert _ids(client, "govern") == [name_hit.id, bio_hit.id]
+    assert _ids(client, "comp gov") == [bio_hit.id]
+    assert _ids(client, "institute") == [other.id]
+    assert _ids(client, "biosec") == [other.id]
+    assert _ids(client, "nonexistent") == []
+
+
+def test_contact_search_synced_by_triggers(client, db_session):
+    c = Contact(name="Dana", list_number=1)
+    db_session.add(c)
+    db_session.commit()
+
+    note = Note(contact_id=c.id, note_text="Met at the alignment workshop", note_date=datetime.now(UTC))
+    db_session.add(note)
+    db_session.commit()
+    assert _ids(client, "workshop") == [c.id]
+
+    note.note_text = "Follow up about funding"
+    db_session.commit()
+    assert _ids(client, "workshop") == []
+    assert _ids(client, "funding") == [c.id]
+
+    # Bulk UPDATE outside the ORM is picked up too
+    db_session.execute(update(Contact).where(Contact.id == c.id).values(bio="Interpretability researcher"))
+    db_session.commit()
+    assert _ids(client, "interpret") == [c.id]
+
+    db_session.delete(note)
+    db_session.commit()
+    assert _ids(client, "funding") == []
+
+
+def test_punctuation_only_query_falls_back(db_session):
+    assert contact_search_subquery(db_session, "!!") is None
+
+
+# --- Mentions ---
+
+def _mention(contact, title, snippet="", days_ago=0, dismissed=0):
+    published = datetime.now(UTC) - timedelta(days=days_ago)
+    return Mention(
+        contact_id=contact.id, source_type="news", title=title, snippet=snippet,
+        published_at=published, created_at=published, dismissed=dismissed,
+    )
+
+
+def test_mention_search_ranking_and_filters(client, db_session):
+    alice = Contact(name="Alice")
+    bob = Contact(name="Bob")
+    db_session.add_all([alice, bob])
+    db_session.commit()
+    in_title = _mention(alice, "Compute governance hearing")
+    in_snippet = _mention(bob, "Weekly roundup", "Panel on compute governance and chips", days_ago=1)
+    old = _mention(alice, "Compute governance primer", days_ago=30)
+    dismissed = _mention(bob, "Compute governance op-ed", dismissed=1)
+    unrelated = _mention(alice, "Biosecurity funding")
+    db_session.add_all([in_title, in_snippet, old, dismissed, unrelated])
+    db_session.commit()
+
+    r = client.get("/api/mentions/search", params={"q": "comp gov"})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 2
+    assert [m["id"] for m in data["mentions"]] == [in_title.id, in_snippet.id]
+
+    data = client.get("/api/mentions/search", params={"q": "governance", "days": 60, "include_dismissed": True}).json()
+    assert {m["id"] for m in data["mentions"]} == {in_title.id, in_snippet.id, old.id, dismissed.id}
+
+    data = client.get("/api/mentions/search", params={"q": "governance", "contact_id": bob.id}).json()
+    assert [m["id"] for m in data["mentions"]] == [in_snippet.id]
+
+    data = client.get("/api/mentions/search", params={"q": "governance", "limit": 1, "skip": 1}).json()
+    assert data["total"] == 2 and [m["id"] for m in data["mentions"]] == [in_snippet.id]
+
+
+def test_mention_search_synced_on_update_and_delete(client, db_session):
+    c = Contact(name="Cy")
+    db_session.add(c)
+    db_session.commit()
+    m = _mention(c, "Talk on evals")
+    db_session.add(m)
+    db_session.commit()
+    assert client.get("/api/mentions/search", params={"q": "evals"}).json()["total"] == 1
+
+    m.title = "Talk on red teaming"
+    db_session.commit()
+    assert client.get("/api/mentions/search", params={"q": "evals"}).json()["total"] == 0
+    assert client.get("/api/mentions/search", params={"q": "red team"}).json()["total"] == 1
+
+    db_session.delete(m)
+    db_session.commit()
+    assert client.get("/api/mentions/search", params={"q": "red"}).json()["total"] == 0
@@ -4,6 +4,9 @@ from app.warm_intros import (
     compute_mission_alignment,
     find_warm_intro_paths,
     auto_tag_warm_intro,
+    refresh_mission_alignments,
+    score_all_alignments,
+    sync_warm_intro_tags,
     PRESET_TAGS,
     CATEGORY_ALIGNMENT,
 )
@@ -61,6 +64,54 @@ def test_alignment_max_10():
     assert score <= 10.0
 
 
+def test_alignment_best_keyword_wins():
+    """The highest-scoring keyword counts, regardless of where it appears in the category."""
+    c = Contact(name="Test", category="Business / AI Safety")
+    assert compute_mission_alignment(c) == 9.5
+
+
+def test_score_all_alignments_bulk(db_session):
+    """Bulk scoring fills unscored contacts and leaves existing scores alone unless overwrite."""
+    a = Contact(name="A", category="Journalism")
+    b = Contact(name="B")
+    db_session.add_all([a, b])
+    db_session.commit()
+    a.mission_alignment = 2.0
+    db_session.commit()
+
+    result = score_all_alignments(db_session)
+    assert result["scored"] == 1
+    db_session.expire_all()
+    assert a.mission_alignment == 2.0
+    assert b.mission_alignment == 5.0
+
+    result = score_all_alignments(db_session, overwrite=True)
+    assert result["scored"] == 2
+    db_session.expire_all()
+    assert a.mission_alignment == 6.0
+
+
+def test_manual_alignment_survives_rescoring(client, db_session):
+    """A score set by the user is kept by later source edits and bulk rescoring."""
+    c, d = Contact(name="Test", category="Business"), Contact(name="Other", category="Business")
+    db_session.add_all([c, d])
+    db_session.commit()
+    client.patch(f"/api/contacts/{c.id}", json={"mission_alignment": 3.0})
+
+    for contact in (c, d):
+        contact.category = "AI Governance"
+    db_session.commit()
+    assert refresh_mission_alignments(db_session, [c.id, d.id]) == 1
+    assert score_all_alignments(db_session, overwrite=True) == {"scored": 1, "skipped": 1}
+    db_session.expire_all()
+    assert (c.mission_alignment, d.mission_alignment) == (3.0, 8.5)
+
+    # Asking for the computed score clears the override
+    assert client.post(f"/api/contacts/{c.id}/compute-alignment").json()["mission_alignment"] == 8.5
+    db_session.expire_all()
+    assert c.mission_alignment_manual == 0
+
+
 # --- Warm intro paths ---
 
 
@@ -222,6 +273,102 @@ def test_auto_tag_warm_intro(db_session):
     assert len(loner_tags) == 0
 
 
+def _warm_tag_ids(db_session):
+    return {
+        r[0]
+        for r in db_session.query(ContactTag.contact_id)
+        .filter(ContactTag.tag == "Warm intro available")
+        .all()
+    }
+
+
+def test_auto_tag_warm_intro_idempotent_and_removes_stale(db_session):
+    """Re-running does not duplicate tags; tags go away once the engaged neighbor drops back."""
+    target = Contact(name="Target", relationship_stage="Cold")
+    engaged = Contact(name="Engaged", relationship_stage="Partner-Advocate")
+    db_session.add_all([target, engaged])
+    db_session.commit()
+    db_session.add(ContactConnection(
+        contact_id=engaged.id, other_contact_id=target.id, relationship_type="same_org",
+    ))
+    db_session.commit()
+
+    auto_tag_warm_intro(db_session)
+    result = auto_tag_warm_intro(db_session)
+    assert result["tagged"] == 0
+    assert result["already_tagged"] == 1
+    assert _warm_tag_ids(db_session) == {target.id}
+
+    engaged.relationship_stage = "Warm"
+    db_session.commit()
+    result = auto_tag_warm_intro(db_session)
+    assert result["removed"] == 1
+    assert _warm_tag_ids(db_session) == set()
+
+
+def test_user_added_warm_intro_tag_is_kept(client, db_session):
+    """Only tags the sync added are removed; the preset tag chosen by hand stays."""
+    target, other, bulk = Contact(name="Target"), Contact(name="Other"), Contact(name="Bulk")
+    engaged = Contact(name="Engaged", relationship_stage="Engaged")
+    db_session.add_all([target, other, bulk, engaged])
+    db_session.commit()
+    db_session.add_all([
+        ContactConnection(contact_id=engaged.id, other_contact_id=target.id, relationship_type="same_org"),
+        ContactConnection(contact_id=engaged.id, other_contact_id=bulk.id, relationship_type="same_org"),
+    ])
+    db_session.commit()
+    auto_tag_warm_intro(db_session)
+    client.post(f"/api/contacts/{other.id}/tags", json={"tag": "Warm intro available"})
+    client.post(f"/api/contacts/{target.id}/tags", json={"tag": "Warm intro available"})
+    client.post("/api/contacts/bulk", json={
+        "contact_ids": [bulk.id], "changes": {"add_tags": ["Warm intro available"]},
+    })
+
+    client.patch(f"/api/contacts/{engaged.id}", json={"relationship_stage": "Warm"})
+    assert auto_tag_warm_intro(db_session)["removed"] == 0
+    assert _warm_tag_ids(db_session) == {target.id, other.id, bulk.id}
+
+
+def test_sync_warm_intro_tags_scoped(db_session):
+    """Scoped sync only touches the given contacts."""
+    a = Contact(name="A", relationship_stage="Cold")
+    b = Contact(name="B", relationship_stage="Cold")
+    engaged = Contact(name="Engaged", relationship_stage="Engaged")
+    db_session.add_all([a, b, engaged])
+    db_session.commit()
+    db_session.add_all([
+        ContactConnection(contact_id=a.id, other_contact_id=engaged.id, relationship_type="first_degree"),
+        ContactConnection(contact_id=b.id, other_contact_id=engaged.id, relationship_type="first_degree"),
+    ])
+    db_session.commit()
+
+    result = sync_warm_intro_tags(db_session, [a.id])
+    db_session.commit()
+    assert result["tagged"] == 1
+    assert _warm_tag_ids(db_session) == {a.id}
+
+
+def test_patch_stage_retags_neighbors(client, db_session):
+    """Changing a contact's stage re-tags only its neighbors, both ways."""
+    connector = Contact(name="Connector", relationship_stage="Warm")
+    neighbor = Contact(name="Neighbor", relationship_stage="Cold")
+    db_session.add_all([connector, neighbor])
+    db_session.commit()
+    db_session.add(ContactConnection(
+        contact_id=neighbor.id, other_contact_id=connector.id, relationship_type="co_author",
+    ))
+    db_session.commit()
+
+    r = client.patch(f"/api/contacts/{connector.id}", json={"relationship_stage": "Engaged"})
+    assert r.status_code == 200
+    assert _warm_tag_ids(db_session) == {neighbor.id}
+
+    r = client.patch(f"/api/contacts/{connector.id}", json={"relationship_stage": "Cold"})
+    assert r.status_code == 200
+    db_session.expire_all()
+    assert _warm_tag_ids(db_session) == set()
+
+
 # --- Preset tags ---
 
 
@@ -21,3 +21,65 @@ export async function apiFetch<T = unknown>(
   }
   return res.json() as Promise<T>
 }
+
+type EventHandler = (data: unknown) => void
+
+const eventHandlers = new Map<string, Set<EventHandler>>()
+let eventSource: EventSource | null = null
+
+/**
+ * Subscribe to a server-sent event type from GET /api/events ("job", "mention", "connection").
+ *
+ * All subscribers share one EventSource, opened on the first subscription and closed
+ * with the last. The browser reconnects on its own (replaying missed events).
+ * Returns an unsubscribe function.
+ */
+export function onServerEvent<T = unknown>(type: string, handler: (data: T) => void): () => void {
+  if (!eventSource) eventSource = new EventSource('/api/events')
+  let handlers = eventHandlers.get(type)
+  if (!handlers) {
+    const set = new Set<EventHandler>()
+    handlers = set
+    eventHandlers.set(type, set)
+    eventSource.addEventListener(type, (e) => {
+      const data = JSON.parse((e as MessageEvent).data)
+      set.forEach((h) => h(data))
+    })
+  }
+  handlers.add(handler as EventHandler)
+  return () => {
+    handlers.delete(handler as EventHandler)
+    if ([...eventHandlers.values()].every((s) => s.size === 0)) {
+      eventSource?.close()
+      eventSource = null
+      eventHandlers.clear()
+    }
+  }
+}
+
+/**
+ * Resolves once the shared event stream is connected (or after a short wait), so a job
+ * started afterwards cannot finish before its events can be received.
+ */
+export function eventsReady(timeoutMs = 2000): Promise<void> {
+  const source = eventSource
+  if (!source || source.readyState === EventSource.OPEN) return Promise.resolve()
+  return new Promise((resolve) => {
+    const timer = setTimeout(resolve, timeoutMs)
+    source.addEventListener('open', () => { clearTimeout(timer); resolve() }, { once: true })
+  })
+}
+
+/**
+ * Wait for a background job's status over the event stream. onUpdate gets every
+ * {job, status, ...} event for `job` until it reports complete or error.
+ * Start the job after eventsReady() so no event is missed. Returns an unsubscribe function.
+ */
+export function watchJob<T extends { status: string }>(job: string, onUpdate: (s: T) => void): () => void {
+  const stop = onServerEvent<T & { job: string }>('job', (s) => {
+    if (s.job !== job) return
+    if (s.status === 'complete' || s.status === 'error') stop()
+    onUpdate(s)
+  })
+  return stop
+}
@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from 'react'
 import { useParams, Link } from 'react-router-dom'
-import { apiFetch } from '../api'
+import { apiFetch, eventsReady, watchJob } from '../api'
 
 interface ContactInfo {
   type: string
@@ -10,10 +10,18 @@ interface ContactInfo {
 
 interface ContactRecommendation {
   method: string
+  value?: string | null
   available: boolean
   reason: string
 }
 
+interface Centrality {
+  degree: number
+  pagerank: number | null
+  betweenness: number | null
+  computed_at: string | null
+}
+
 interface Contact {
   id: number
   list_number: number | null
@@ -29,6 +37,7 @@ interface Contact {
   tags?: string[]
   contact_info?: ContactInfo[]
   recommended_contact_method?: ContactRecommendation
+  centrality?: Centrality | null
 }
 
 interface WarmIntroPath {
@@ -123,13 +132,11 @@ export default function ContactDetail() {
   const [warmIntros, setWarmIntros] = useState<WarmIntroPath[]>([])
   const [error, setError] = useState<string | null>(null)
   const [draftModal, setDraftModal] = useState<{ mentionId: number; draft: ReplyDraft | null; generating: boolean; editText: string } | null>(null)
-  const mediaPollRef = useRef<ReturnType<typeof setInterval> | null>(null)
+  const stopMediaWatchRef = useRef<(() => void) | null>(null)
 
-  // Cleanup polling on unmount
+  // Stop listening for job events on unmount
   useEffect(() => {
-    return () => {
-      if (mediaPollRef.current) clearInterval(mediaPollRef.current)
-    }
+    return () => stopMediaWatchRef.current?.()
   }, [])
 
   const refreshOutreach = () => {
@@ -382,44 +389,31 @@ export default function ContactDetail() {
     if (!id) return
     setFetchingMedia(true)
     setMediaMessage(null)
-    if (mediaPollRef.current) {
-      clearInterval(mediaPollRef.current)
-      mediaPollRef.current = null
-    }
-    apiFetch<{ detail?: string; sources?: string[] }>('/api/jobs/fetch-media', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ contact_ids: [parseInt(id)], days: 30, max_per_source: 3 }),
+    let done = false
+    stopMediaWatchRef.current?.()
+    stopMediaWatchRef.current = watchJob<{ status: string; added?: number }>('media', (s) => {
+      if (s.status === 'complete') {
+        done = true
+        stopMediaWatchRef.current = null
+        setMediaMessage(`Done: ${s.added} new mentions found`)
+        setFetchingMedia(false)
+        apiFetch<{ mentions: Mention[] }>(`/api/mentions?contact_id=${id}`)
+          .then((data) => setMentions(data.mentions || []))
+          .catch((err) => setError(`Failed to refresh mentions: ${err.message}`))
+      }
     })
+    eventsReady()
+      .then(() => apiFetch<{ sources?: string[] }>('/api/jobs/fetch-media', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ contact_ids: [parseInt(id)], days: 30, max_per_source: 3 }),
+      }))
       .then((d) => {
-        if (d.detail) {
-          setMediaMessage(d.detail)
-          setFetchingMedia(false)
-        } else {
-          setMediaMessage(`Searching ${d.sources?.join(', ') || 'media'}...`)
-          mediaPollRef.current = setInterval(() => {
-            apiFetch<{ status: string; added?: number }>('/api/jobs/media-status')
-              .then((s) => {
-                if (s.status === 'complete') {
-                  if (mediaPollRef.current) clearInterval(mediaPollRef.current)
-                  mediaPollRef.current = null
-                  setMediaMessage(`Done: ${s.added} new mentions found`)
-                  setFetchingMedia(false)
-                  apiFetch<{ mentions: Mention[] }>(`/api/mentions?contact_id=${id}`)
-                    .then((data) => setMentions(data.mentions || []))
-                    .catch((err) => setError(`Failed to refresh mentions: ${err.message}`))
-                }
-              })
-              .catch((err) => {
-                if (mediaPollRef.current) clearInterval(mediaPollRef.current)
-                mediaPollRef.current = null
-                setMediaMessage(`Media status check failed: ${err.message}`)
-                setFetchingMedia(false)
-              })
-          }, 3000)
-        }
+        if (!done) setMediaMessage(`Searching ${d.sources?.join(', ') || 'media'}...`)
       })
       .catch((err) => {
+        stopMediaWatchRef.current?.()
+        stopMediaWatchRef.current = null
         setMediaMessage(`Media fetch failed: ${err.message}`)
         setFetchingMedia(false)
       })
@@ -454,25 +448,26 @@ export default function ContactDetail() {
   useEffect(() => {
     if (!id) return
     setLoading(true)
-    Promise.all([
-      apiFetch<Contact>(`/api/contacts/${id}`),
-      apiFetch<{ mentions: Mention[] }>(`/api/mentions?contact_id=${id}`),
-      apiFetch<{ entries: OutreachEntry[] }>(`/api/outreach?contact_id=${id}`),
-      apiFetch<{ notes: NoteEntry[] }>(`/api/contacts/${id}/notes`),
-      apiFetch<{ connections: ConnectionEntry[] }>(`/api/contacts/${id}/connections`),
-      apiFetch<{ tags: { id: number; tag: string }[] }>(`/api/contacts/${id}/tags`),
-      apiFetch<{ intro_paths: WarmIntroPath[] }>(`/api/contacts/${id}/warm-intros`),
-    ])
-      .then(([contactData, mentionsData, outreachData, notesData, connectionsData, tagsData, warmData]) => {
+    apiFetch<{
+      contact: Contact
+      mentions: Mention[]
+      outreach: OutreachEntry[]
+      notes: NoteEntry[]
+      connections: ConnectionEntry[]
+      tags: { id: number; tag: string }[]
+      warm_intros: WarmIntroPath[]
+    }>(`/api/contacts/${id}/full?include=contact,mentions,outreach,notes,connections,tags,warm_intros`)
+      .then((data) => {
+        const contactData = data.contact
         setContact(contactData)
-        setMentions(mentionsData.mentions || [])
-        setOutreach(outreachData.entries || [])
-        setNotes(notesData.notes || [])
-        setConnections(connectionsData.connections || [])
-        setTags(tagsData.tags || [])
-        setWarmIntros(warmData.intro_paths || [])
+        setMentions(data.mentions || [])
+        setOutreach(data.outreach || [])
+        setNotes(data.notes || [])
+        setConnections(data.connections || [])
+        setTags(data.tags || [])
+        setWarmIntros(data.warm_intros || [])
         setError(null)
-        if (outreachData.entries?.length === 0 && contactData.recommended_contact_method?.method) {
+        if (data.outreach?.length === 0 && contactData.recommended_contact_method?.method) {
           setForm((f) => ({ ...f, method: contactData.recommended_contact_method!.method }))
         }
       })
@@ -612,6 +607,15 @@ export default function ContactDetail() {
           </div>
         </div>
 
+        {contact.centrality && (
+          <div className="mt-4 rounded bg-slate-50 p-4">
+            <h3 className="text-sm font-medium text-slate-800">Network position</h3>
+            <p className="mt-1 text-sm text-slate-600">
+              {contact.centrality.degree} connections · PageRank {(contact.centrality.pagerank ?? 0).toFixed(4)} · betweenness {(contact.centrality.betweenness ?? 0).toFixed(3)}
+            </p>
+          </div>
+        )}
+
         <div className="mt-4 rounded bg-slate-50 p-4">
           <h3 className="text-sm font-medium text-slate-800">Tags</h3>
           <div className="mt-2 flex flex-wrap gap-2">
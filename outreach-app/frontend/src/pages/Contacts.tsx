@@ -1,9 +1,10 @@
 import { useEffect, useState, useRef } from 'react'
 import { Link } from 'react-router-dom'
-import { apiFetch } from '../api'
+import { apiFetch, eventsReady, watchJob } from '../api'
 
 interface ContactRecommendation {
   method: string
+  value?: string | null
   available: boolean
   reason: string
 }
@@ -27,7 +28,7 @@ export default function Contacts() {
   const [debouncedSearch, setDebouncedSearch] = useState('')
   const [rotationOnly, setRotationOnly] = useState(false)
   const [category, setCategory] = useState('')
-  const [categories, setCategories] = useState<string[]>([])
+  const [categories, setCategories] = useState<{ value: string; count: number }[]>([])
   const [togglingId, setTogglingId] = useState<number | null>(null)
   const [bulkEnriching, setBulkEnriching] = useState(false)
   const [enrichStatus, setEnrichStatus] = useState<string | null>(null)
@@ -42,14 +43,17 @@ export default function Contacts() {
     updated_names: string[]
   } | null>(null)
   const [importError, setImportError] = useState<string | null>(null)
+  const [importPercent, setImportPercent] = useState<number | null>(null)
   const debounceRef = useRef<ReturnType<typeof setTimeout> | null>(null)
-  const enrichPollRef = useRef<ReturnType<typeof setInterval> | null>(null)
+  const stopEnrichWatchRef = useRef<(() => void) | null>(null)
+  const importPollRef = useRef<ReturnType<typeof setInterval> | null>(null)
   const fileInputRef = useRef<HTMLInputElement>(null)
 
   // Cleanup polling on unmount
   useEffect(() => {
     return () => {
-      if (enrichPollRef.current) clearInterval(enrichPollRef.current)
+      stopEnrichWatchRef.current?.()
+      if (importPollRef.current) clearInterval(importPollRef.current)
     }
   }, [])
 
@@ -60,11 +64,19 @@ export default function Contacts() {
     return () => { if (debounceRef.current) clearTimeout(debounceRef.current) }
   }, [search])
 
+  // Category options with counts for the current search/rotation filters
   useEffect(() => {
-    apiFetch<{ categories: string[] }>('/api/contacts/categories')
-      .then((d) => setCategories(d.categories || []))
+    const params = new URLSearchParams()
+    if (debouncedSearch) params.set('q', debouncedSearch)
+    if (rotationOnly) params.set('in_rotation', '1')
+    apiFetch<{ category: { value: string | null; count: number }[] }>(`/api/contacts/facets?${params}`)
+      .then((d) => setCategories(
+        (d.category || [])
+          .filter((f): f is { value: string; count: number } => !!f.value)
+          .sort((a, b) => a.value.localeCompare(b.value)),
+      ))
       .catch(() => {})
-  }, [])
+  }, [debouncedSearch, rotationOnly])
 
   const loadContacts = () => {
     const params = new URLSearchParams({ limit: '100' })
@@ -104,42 +116,29 @@ export default function Contacts() {
   const handleBulkEnrich = () => {
     setBulkEnriching(true)
     setEnrichStatus('Starting bulk enrichment...')
-    if (enrichPollRef.current) {
-      clearInterval(enrichPollRef.current)
-      enrichPollRef.current = null
-    }
-    apiFetch<{ detail?: string; message?: string }>('/api/jobs/enrich-all', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ max_contacts: 50 }),
-    })
-      .then((d) => {
-        if (d.detail) {
-          setEnrichStatus(d.detail)
+    stopEnrichWatchRef.current?.()
+    stopEnrichWatchRef.current = watchJob<{ status: string; found?: number; attempted?: number; skipped?: number }>(
+      'enrich',
+      (s) => {
+        if (s.status === 'running' && s.attempted !== undefined) {
+          setEnrichStatus(`Enriching: ${s.found} emails found, ${s.attempted} attempted...`)
+        } else if (s.status === 'complete') {
+          stopEnrichWatchRef.current = null
+          setEnrichStatus(`Done: ${s.found} emails found, ${s.attempted} attempted, ${s.skipped} skipped`)
           setBulkEnriching(false)
-        } else {
-          setEnrichStatus(d.message || 'Running...')
-          enrichPollRef.current = setInterval(() => {
-            apiFetch<{ status: string; found?: number; attempted?: number; skipped?: number }>('/api/jobs/enrich-status')
-              .then((s) => {
-                if (s.status === 'complete') {
-                  if (enrichPollRef.current) clearInterval(enrichPollRef.current)
-                  enrichPollRef.current = null
-                  setEnrichStatus(`Done: ${s.found} emails found, ${s.attempted} attempted, ${s.skipped} skipped`)
-                  setBulkEnriching(false)
-                  loadContacts()
-                }
-              })
-              .catch((err) => {
-                if (enrichPollRef.current) clearInterval(enrichPollRef.current)
-                enrichPollRef.current = null
-                setEnrichStatus(`Enrichment status check failed: ${err.message}`)
-                setBulkEnriching(false)
-              })
-          }, 5000)
+          loadContacts()
         }
-      })
+      },
+    )
+    eventsReady()
+      .then(() => apiFetch('/api/jobs/enrich-all', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ max_contacts: 50 }),
+      }))
       .catch((err) => {
+        stopEnrichWatchRef.current?.()
+        stopEnrichWatchRef.current = null
         setEnrichStatus(`Bulk enrichment failed: ${err.message}`)
         setBulkEnriching(false)
       })
@@ -180,7 +179,16 @@ export default function Contacts() {
     const formData = new FormData()
     formData.append('file', file)
 
-    fetch('/api/contacts/import-csv', { method: 'POST', body: formData })
+    const finish = () => {
+      if (importPollRef.current) clearInterval(importPollRef.current)
+      importPollRef.current = null
+      setImporting(false)
+      setImportPercent(null)
+      if (fileInputRef.current) fileInputRef.current.value = ''
+    }
+
+    // Runs as a background job; poll for progress and the row-level report
+    fetch('/api/jobs/import-csv', { method: 'POST', body: formData })
       .then(async (res) => {
         if (!res.ok) {
           let detail = res.statusText
@@ -190,6 +198,31 @@ export default function Contacts() {
           } catch { /* keep statusText */ }
           throw new Error(`${res.status}: ${detail}`)
         }
+        setImportPercent(0)
+        importPollRef.current = setInterval(() => {
+          apiFetch<NonNullable<typeof importResult> & { status: string; percent?: number; message?: string }>('/api/jobs/import-csv-status')
+            .then((s) => {
+              setImportPercent(s.percent ?? null)
+              if (s.status === 'complete') {
+                setImportResult(s)
+                loadContacts()
+                finish()
+              } else if (s.status === 'error') {
+                setImportError(s.message || 'Import failed')
+                finish()
+              }
+            })
+            .catch((err) => {
+              setImportError(`Import status check failed: ${err.message}`)
+              finish()
+            })
+        }, 1000)
+      })
+      .catch((err) => {
+        setImportError(err.message || 'Import failed')
+        finish()
+      })
+  }
         return res.json()
       })
       .then((data) => {
@@ -248,7 +281,7 @@ export default function Contacts() {
         >
           <option value="">All categories</option>
           {categories.map((c) => (
-            <option key={c} value={c}>{c.replace(/^Category \d+: /, '')}</option>
+            <option key={c.value} value={c.value}>{c.value.replace(/^Category \d+: /, '')} ({c.count})</option>
           ))}
         </select>
         <label className="flex items-center gap-2 text-sm text-slate-700">
@@ -284,8 +317,14 @@ export default function Contacts() {
           disabled={importing}
           className="rounded border border-blue-500 bg-blue-50 px-3 py-1.5 text-sm font-medium text-blue-700 hover:bg-blue-100 disabled:opacity-50"
         >
-          {importing ? 'Importing...' : 'Import CSV'}
+          {importing ? `Importing...${importPercent !== null ? ` ${Math.round(importPercent)}%` : ''}` : 'Import CSV'}
         </button>
+        <a
+          href="/api/export/contacts"
+          className="rounded border border-slate-300 bg-white px-3 py-1.5 text-sm font-medium text-slate-700 hover:bg-slate-50"
+        >
+          Export CSV
+        </a>
         {enrichStatus && (
           <span className="text-sm text-slate-600">{enrichStatus}</span>
         )}
@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from 'react'
 import { Link } from 'react-router-dom'
-import { apiFetch } from '../api'
+import { apiFetch, eventsReady, onServerEvent, watchJob } from '../api'
 
 interface Mention {
   id: number
@@ -36,7 +36,7 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [refreshing, setRefreshing] = useState(false)
-  const pollIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null)
+  const stopWatchRef = useRef<(() => void) | null>(null)
 
   const loadMentions = () =>
     apiFetch<{ mentions: Mention[] }>('/api/mentions?days=7&limit=20')
@@ -55,9 +55,21 @@ export default function Dashboard() {
     loadHotLeads()
   }, [])
 
+  // New mentions arrive on the event stream; reload once per burst
   useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | null = null
+    const stop = onServerEvent('mention', () => {
+      if (timer) return
+      timer = setTimeout(() => {
+        timer = null
+        loadMentions()
+        loadHotLeads()
+      }, 300)
+    })
     return () => {
-      if (pollIntervalRef.current) clearInterval(pollIntervalRef.current)
+      stop()
+      if (timer) clearTimeout(timer)
+      stopWatchRef.current?.()
     }
   }, [])
 
@@ -66,32 +78,24 @@ export default function Dashboard() {
   const handleRefresh = () => {
     setRefreshing(true)
     setFetchMessage('Starting fetch...')
-    if (pollIntervalRef.current) {
-      clearInterval(pollIntervalRef.current)
-      pollIntervalRef.current = null
-    }
-    apiFetch('/api/jobs/fetch-mentions', { method: 'POST' })
-      .then(() => {
-        pollIntervalRef.current = setInterval(() => {
-          apiFetch<{ status: string; message: string; mentions_added: number | null }>('/api/mentions/fetch/status')
-            .then((s) => {
-              setFetchMessage(s.message)
-              if (s.status === 'complete' || s.status === 'error') {
-                if (pollIntervalRef.current) clearInterval(pollIntervalRef.current)
-                pollIntervalRef.current = null
-                setRefreshing(false)
-                loadMentions()
-                loadHotLeads()
-              }
-            })
-            .catch(() => {
-              if (pollIntervalRef.current) clearInterval(pollIntervalRef.current)
-              pollIntervalRef.current = null
-              setRefreshing(false)
-            })
-        }, 5000)
-      })
+    stopWatchRef.current?.()
+    stopWatchRef.current = watchJob<{ status: string; message: string; mentions_added: number | null }>(
+      'fetch-mentions',
+      (s) => {
+        setFetchMessage(s.message)
+        if (s.status === 'complete' || s.status === 'error') {
+          stopWatchRef.current = null
+          setRefreshing(false)
+          loadMentions()
+          loadHotLeads()
+        }
+      },
+    )
+    eventsReady()
+      .then(() => apiFetch('/api/jobs/fetch-mentions', { method: 'POST' }))
       .catch((err) => {
+        stopWatchRef.current?.()
+        stopWatchRef.current = null
         setError(`Refresh failed: ${err.message}`)
         setRefreshing(false)
         setFetchMessage(null)
@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from 'react'
 import { Link } from 'react-router-dom'
-import { apiFetch } from '../api'
+import { apiFetch, eventsReady, watchJob } from '../api'
 
 interface HotLead {
   contact_id: number
@@ -76,13 +76,11 @@ export default function Digest() {
   const [scoring, setScoring] = useState(false)
   const [scoreMsg, setScoreMsg] = useState<string | null>(null)
   const [hours, setHours] = useState(24)
-  const scorePollRef = useRef<ReturnType<typeof setInterval> | null>(null)
+  const stopScoreWatchRef = useRef<(() => void) | null>(null)
 
-  // Cleanup polling on unmount
+  // Stop listening for job events on unmount
   useEffect(() => {
-    return () => {
-      if (scorePollRef.current) clearInterval(scorePollRef.current)
-    }
+    return () => stopScoreWatchRef.current?.()
   }, [])
 
   const loadDigest = (h: number) => {
@@ -103,34 +101,21 @@ export default function Digest() {
 
   const handleScoreMentions = () => {
     setScoring(true)
-    setScoreMsg(null)
-    if (scorePollRef.current) {
-      clearInterval(scorePollRef.current)
-      scorePollRef.current = null
-    }
-    apiFetch('/api/digest/score-mentions', { method: 'POST' })
-      .then(() => {
-        setScoreMsg('Scoring...')
-        scorePollRef.current = setInterval(() => {
-          apiFetch<{ status: string; scored?: number }>('/api/digest/score-status')
-            .then((s) => {
-              if (s.status === 'complete') {
-                if (scorePollRef.current) clearInterval(scorePollRef.current)
-                scorePollRef.current = null
-                setScoreMsg(`Done: ${s.scored} mentions scored`)
-                setScoring(false)
-                loadDigest(hours)
-              }
-            })
-            .catch((err) => {
-              if (scorePollRef.current) clearInterval(scorePollRef.current)
-              scorePollRef.current = null
-              setScoreMsg(`Score status check failed: ${err.message}`)
-              setScoring(false)
-            })
-        }, 2000)
-      })
+    setScoreMsg('Scoring...')
+    stopScoreWatchRef.current?.()
+    stopScoreWatchRef.current = watchJob<{ status: string; scored?: number }>('score', (s) => {
+      if (s.status === 'complete') {
+        stopScoreWatchRef.current = null
+        setScoreMsg(`Done: ${s.scored} mentions scored`)
+        setScoring(false)
+        loadDigest(hours)
+      }
+    })
+    eventsReady()
+      .then(() => apiFetch('/api/digest/score-mentions', { method: 'POST' }))
       .catch((err) => {
+        stopScoreWatchRef.current?.()
+        stopScoreWatchRef.current = null
         setScoreMsg(`Scoring failed: ${err.message}`)
         setScoring(false)
       })
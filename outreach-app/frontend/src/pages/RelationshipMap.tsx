@@ -1,16 +1,27 @@
-import { useEffect, useState, useCallback, useMemo } from 'react'
+import { useEffect, useState, useCallback, useMemo, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import ForceGraph2D from 'react-force-graph-2d'
 import { apiFetch } from '../api'
 
+interface Centrality {
+  degree: number
+  pagerank: number | null
+  betweenness: number | null
+}
+
 interface MapNode {
   id: number
   name: string
   category: string | null
   relationship_stage: string | null
+  community_id?: number | null
+  centrality?: Centrality | null
+  x?: number | null // Server-cached layout position
+  y?: number | null
 }
 
 interface MapLink {
+  id: number
   source_id: number
   target_id: number
   relationship_type: string
@@ -28,6 +39,21 @@ interface GraphLink {
   relationship_type?: string
 }
 
+interface MapResponse {
+  version: number
+  nodes: MapNode[]
+  links: MapLink[]
+  full?: boolean
+  removed_node_ids?: number[]
+  removed_link_ids?: number[]
+}
+
+/** Replace items by id, drop removed ids, append new ones. */
+function mergeById<T extends { id: number }>(current: T[], changed: T[], removed: number[] = []): T[] {
+  const drop = new Set([...removed, ...changed.map((item) => item.id)])
+  return [...current.filter((item) => !drop.has(item.id)), ...changed]
+}
+
 function matchesSearch(node: MapNode, q: string): boolean {
   if (!q.trim()) return true
   const lower = q.trim().toLowerCase()
@@ -46,13 +72,23 @@ export default function RelationshipMap() {
   const [discoveringFromMentions, setDiscoveringFromMentions] = useState(false)
   const [discoveringAll, setDiscoveringAll] = useState(false)
 
+  const versionRef = useRef<number | null>(null)
+
   const loadMap = useCallback(() => {
     setLoading(true)
     setError(null)
-    apiFetch<{ nodes: MapNode[]; links: MapLink[] }>('/api/relationship-map')
+    // After the first load, fetch only what changed since the version we have
+    const since = versionRef.current
+    apiFetch<MapResponse>(since === null ? '/api/relationship-map' : `/api/relationship-map?since=${since}`)
       .then((data) => {
-        setNodes(data.nodes || [])
-        setLinks(data.links || [])
+        if (since === null || data.full !== false) {
+          setNodes(data.nodes || [])
+          setLinks(data.links || [])
+        } else {
+          setNodes((prev) => mergeById(prev, data.nodes, data.removed_node_ids))
+          setLinks((prev) => mergeById(prev, data.links, data.removed_link_ids))
+        }
+        versionRef.current = data.version
       })
       .catch((e) => setError(e.message || 'Failed to load map'))
       .finally(() => setLoading(false))
@@ -67,7 +103,7 @@ export default function RelationshipMap() {
     if (!search.trim()) {
       return {
         graphData: {
-          nodes: nodes.map((n) => ({ ...n, __matched: true })) as GraphNode[],
+          nodes: nodes.map((n) => ({ ...n, x: n.x ?? undefined, y: n.y ?? undefined, __matched: true })) as GraphNode[],
           links: fullLinks,
         },
         visibleCount: nodes.length,
@@ -84,6 +120,8 @@ export default function RelationshipMap() {
     const visibleIds = neighborIds
     const filteredNodes = nodes.filter((n) => visibleIds.has(n.id)).map((n) => ({
       ...n,
+      x: n.x ?? undefined,
+      y: n.y ?? undefined,
       __matched: matchingIds.has(n.id),
     })) as GraphNode[]
     const filteredLinks = fullLinks.filter(
@@ -155,6 +193,8 @@ export default function RelationshipMap() {
   }
 
   const hasConnections = links.length > 0
+  // Every node already has a server-computed position: paint it as-is, no simulation
+  const hasCachedLayout = nodes.length > 0 && nodes.every((n) => n.x != null && n.y != null)
 
   return (
     <div>
@@ -221,7 +261,11 @@ export default function RelationshipMap() {
         <ForceGraph2D
           graphData={graphData}
           nodeId="id"
-          nodeLabel={(n) => (n as GraphNode).name}
+          cooldownTicks={hasCachedLayout ? 0 : undefined}
+          nodeLabel={(n) => {
+            const g = n as GraphNode
+            return g.centrality ? `${g.name} — ${g.centrality.degree} connections` : g.name
+          }}
           nodeCanvasObject={(node, ctx, globalScale) => {
             const n = node as GraphNode
             const label = n.name ?? String(n.id)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark network centrality on a synthetic contact graph.
+
+Builds a preferential-attachment graph (each new node links to --edges-per-node
+existing nodes, biased toward well-connected ones) and times degree, PageRank
+and sampled betweenness from app.graph_metrics, plus the relationship-map force
+layout on a smaller graph (--layout-nodes). No database needed.
+
+Usage:
+    python bench_centrality.py [--nodes 50000] [--edges-per-node 3] [--samples 64] [--layout-nodes 5000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.graph_metrics import Graph, approximate_betweenness, force_layout, pagerank
+
+
+def synthetic_edges(n: int, m: int, seed: int) -> list[tuple[int, int]]:
+    """Preferential attachment: sample endpoints from the list of all previous edge endpoints."""
+    rng = random.Random(seed)
+    edges: list[tuple[int, int]] = []
+    endpoints: list[int] = list(range(m))
+    for new in range(m, n):
+        targets = {rng.choice(endpoints) for _ in range(m)}
+        for t in targets:
+            edges.append((new, t))
+            endpoints.extend((new, t))
+    return edges
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--edges-per-node", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=64, help="Betweenness source samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--layout-nodes", type=int, default=5000, help="Graph size for the layout benchmark (0 = skip)")
+    args = parser.parse_args()
+
+    edges = synthetic_edges(args.nodes, args.edges_per_node, args.seed)
+    print(f"Synthetic graph: {args.nodes} nodes, {len(edges)} edges")
+
+    t0 = time.perf_counter()
+    graph = Graph(list(range(args.nodes)), edges)
+    t1 = time.perf_counter()
+    print(f"  build CSR + degree:   {t1 - t0:7.2f}s")
+
+    ranks = pagerank(graph)
+    t2 = time.perf_counter()
+    print(f"  pagerank:             {t2 - t1:7.2f}s  (sum={sum(ranks):.4f})")
+
+    between = approximate_betweenness(graph, samples=args.samples, seed=args.seed)
+    t3 = time.perf_counter()
+    print(f"  betweenness (k={args.samples}):  {t3 - t2:7.2f}s  (max={max(between):.4f})")
+    print(f"  total:                {t3 - t0:7.2f}s")
+
+    if args.layout_nodes:
+        n = args.layout_nodes
+        layout_graph = Graph(list(range(n)), synthetic_edges(n, args.edges_per_node, args.seed))
+        print(f"Layout graph: {n} nodes, {len(layout_graph.indices) // 2} edges")
+        t0 = time.perf_counter()
+        coords = force_layout(layout_graph)
+        t1 = time.perf_counter()
+        print(f"  full layout:          {t1 - t0:7.2f}s")
+        # Incremental: the 50 newest contacts (and their non-hub neighbors) settle
+        changed = set(range(n - 50, n))
+        mobile = set(changed)
+        for i in changed:
+            mobile.update(j for j in layout_graph.neighbors(i) if layout_graph.degree(j) <= 10)
+        force_layout(layout_graph, initial=coords, mobile=mobile, iterations=30)
+        t2 = time.perf_counter()
+        print(f"  incremental ({len(mobile)} moved): {t2 - t1:7.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
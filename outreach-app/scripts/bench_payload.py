@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark response payload formats for the relationship map and contacts list.
+
+Builds synthetic rows shaped like GET /api/relationship-map nodes/links and
+GET /api/contacts rows, then compares today's row-oriented JSON (encoded the
+way FastAPI does: jsonable_encoder + json.dumps) against columnar JSON and
+columnar MessagePack from app.columnar: payload bytes, gzipped bytes and
+serialization time. No database needed.
+
+Usage:
+    python bench_payload.py [--nodes 5000] [--edges-per-node 3] [--contacts 500] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.relationship_map import MAP_INTERNED
+from app.columnar import COLUMNAR_JSON, MSGPACK, encode, negotiate, to_columns
+
+CATEGORIES = ["AI Safety Researcher", "Policy", "Academic", "Journalist", "Funder", "Tech Executive", "Advocate"]
+STAGES = ["Cold", "Warm", "Engaged", "Partner-Advocate"]
+RELATIONSHIP_TYPES = ["same_org", "co_author", "advisor", "colleague", "co_panelist"]
+
+
+def synthetic_map(n: int, m: int, rng: random.Random) -> dict:
+    nodes = [
+        {
+            "id": i,
+            "name": f"Contact {i}",
+            "category": rng.choice(CATEGORIES),
+            "relationship_stage": rng.choice(STAGES),
+            "community_id": rng.randrange(max(1, n // 50)),
+            "x": round(rng.uniform(-2000, 2000), 2),
+            "y": round(rng.uniform(-2000, 2000), 2),
+            "centrality": {
+                "degree": rng.randrange(1, 40),
+                "pagerank": round(rng.random() / n, 8),
+                "betweenness": round(rng.random() * 0.01, 8),
+                "computed_at": "2026-10-19T02:00:00+00:00",
+            },
+        }
+        for i in range(1, n + 1)
+    ]
+    links = [
+        {
+            "id": k,
+            "source_id": rng.randrange(1, n + 1),
+            "target_id": rng.randrange(1, n + 1),
+            "relationship_type": rng.choice(RELATIONSHIP_TYPES),
+        }
+        for k in range(1, n * m + 1)
+    ]
+    return {"version": 12345, "nodes": nodes, "links": links}
+
+
+def synthetic_contacts(n: int, rng: random.Random) -> dict:
+    rows = [
+        {
+            "id": i,
+            "list_number": i,
+            "name": f"Contact {i}",
+            "category": rng.choice(CATEGORIES),
+            "subcategory": None,
+            "role_org": f"Role at Org {rng.randrange(200)}",
+            "connection_to_solomon": "Shared interest in AI governance",
+            "primary_interests": "AI safety, policy, alignment",
+            "relationship_stage": rng.choice(STAGES),
+            "mission_alignment": rng.choice([None, 3.0, 4.0, 5.0]),
+            "in_mention_rotation": rng.random() < 0.1,
+            "tags": rng.sample(["Warm intro available", "Priority", "Conference"], rng.randrange(3)),
+            "centrality": None,
+            "recommended_contact_method": {"method": "email", "available": True, "reason": "Email (available)"},
+        }
+        for i in range(1, n + 1)
+    ]
+    return {"total": n, "contacts": rows, "skip": 0, "limit": n}
+
+
+def timed(fn, repeat: int) -> tuple[tuple[bytes, str], float]:
+    best = float("inf")
+    out = (b"", "")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def bench(label: str, payload: dict, list_keys: tuple[str, ...], interned: dict, repeat: int) -> None:
+    def rows_json():
+        body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return body, "application/json"
+
+    def columnar(media_type):
+        def run():
+            body = {k: to_columns(v, interned.get(k, ())) if k in list_keys else v for k, v in payload.items()}
+            return encode(body, media_type), media_type
+        return run
+
+    print(label)
+    print(f"  {'format':<18}{'bytes':>12}{'gzip':>12}{'encode ms':>12}")
+    baseline = None
+    for name, fn in (
+        ("rows JSON", rows_json),
+        ("columnar JSON", columnar(COLUMNAR_JSON)),
+        ("columnar msgpack", columnar(MSGPACK)),
+    ):
+        if name == "columnar msgpack" and negotiate(MSGPACK) != MSGPACK:
+            print(f"  {name:<18}  (msgpack not installed)")
+            continue
+        (data, _), seconds = timed(fn, repeat)
+        size = len(data)
+        baseline = baseline or size
+        print(
+            f"  {name:<18}{size:>12,}{len(gzip.compress(data)):>12,}{seconds * 1000:>12.1f}"
+            f"   ({size / baseline:.0%} of rows JSON)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--edges-per-node", type=int, default=3)
+    parser.add_argument("--contacts", type=int, default=500, help="Rows in one contacts page (max limit is 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Best of N timings")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    graph = synthetic_map(args.nodes, args.edges_per_node, rng)
+    bench(
+        f"Relationship map: {args.nodes} nodes, {len(graph['links'])} links",
+        graph, ("nodes", "links"), MAP_INTERNED, args.repeat,
+    )
+    contacts = synthetic_contacts(args.contacts, rng)
+    bench(
+        f"Contacts list: {args.contacts} rows",
+        contacts, ("contacts",), {"contacts": ("category", "subcategory", "relationship_stage")}, args.repeat,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
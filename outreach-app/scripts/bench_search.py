@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark contact search: FTS5 (app.search) vs the old ILIKE scan.
+
+Creates a throwaway SQLite database with --contacts synthetic contacts (and
+one note each), then times a few queries both ways.
+
+Usage:
+    python bench_search.py [--contacts 100000] [--repeat 20]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Contact, Note
+from app.search import contact_search_subquery
+
+TOPICS = (
+    "ai safety alignment governance compute policy research interpretability biosecurity funding "
+    "philanthropy journalism economics ethics security institute university lab foundation "
+    "robotics forecasting climate health law regulation standards evaluation startup"
+).split()
+QUERIES = ["governance", "comp gov", "interpretab", "alex", "climate law"]
+
+
+def vocabulary(rng: random.Random, size: int = 5000) -> list[str]:
+    """Filler words; drawn Zipf-style so a few are common and most are rare."""
+    syllables = ["ka", "lo", "mi", "ren", "to", "sa", "vel", "dri", "no", "pe", "qua", "zu", "bri", "ter"]
+    return ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def text_words(rng: random.Random, vocab: list[str], k: int) -> str:
+    """k words, mostly filler, with topic words as frequent as in real bios (~1 in 15)."""
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    words = rng.choices(vocab, weights=weights, k=k)
+    for i in range(len(words)):
+        if rng.random() < 1 / 15:
+            words[i] = rng.choice(TOPICS)
+    return " ".join(words)
+
+
+def seed(db: Session, n: int, rng: random.Random) -> None:
+    first = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Riley", "Casey", "Avery", "Quinn", "Jamie"]
+    vocab = vocabulary(rng)
+    batch = 5000
+    for start in range(0, n, batch):
+        rows = [
+            {
+                "list_number": i,
+                "name": f"{rng.choice(first)} {rng.choice(vocab).title()}",
+                "category": rng.choice(["Policy", "Academic", "Journalist", "Funder"]),
+                "role_org": f"{rng.choice(vocab).title()} {rng.choice(['Institute', 'Lab', 'Foundation'])}",
+                "primary_interests": ", ".join(rng.sample(TOPICS, 2)),
+                "bio": text_words(rng, vocab, 40),
+            }
+            for i in range(start + 1, min(n, start + batch) + 1)
+        ]
+        ids = db.execute(insert(Contact).returning(Contact.id), rows).scalars().all()
+        db.execute(insert(Note), [
+            {"contact_id": cid, "note_text": text_words(rng, vocab, 15), "note_date": datetime.now(UTC)}
+            for cid in ids
+        ])
+        db.commit()
+
+
+def timed(fn, repeat: int) -> tuple[int, float]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        count = fn()
+        best = min(best, time.perf_counter() - t0)
+    return count, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20, help="Best of N timings")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            t0 = time.perf_counter()
+            seed(db, args.contacts, random.Random(args.seed))
+            print(f"Seeded {args.contacts} contacts (+ notes, FTS via triggers) in {time.perf_counter() - t0:.1f}s")
+            print(f"  {'query':<16}{'hits':>8}{'FTS top-50 ms':>15}{'ILIKE top-50 ms':>17}")
+            for q in QUERIES:
+                def fts():
+                    hits = contact_search_subquery(db, q)
+                    stmt = (
+                        select(Contact.id).join(hits, hits.c.contact_id == Contact.id)
+                        .order_by(hits.c.rank, Contact.list_number).limit(50)
+                    )
+                    return len(db.execute(stmt).all())
+
+                def ilike():
+                    stmt = (
+                        select(Contact.id)
+                        .where(Contact.name.ilike(f"%{q}%") | Contact.category.ilike(f"%{q}%"))
+                        .order_by(Contact.list_number).limit(50)
+                    )
+                    return len(db.execute(stmt).all())
+
+                hits, fts_s = timed(fts, args.repeat)
+                _, ilike_s = timed(ilike, args.repeat)
+                print(f"  {q:<16}{hits:>8}{fts_s * 1000:>15.2f}{ilike_s * 1000:>17.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -8,6 +8,7 @@ Requires API key in .env:
 
 Usage:
     python fetch_mentions.py [--limit 50] [--days 7]
+    python fetch_mentions.py --plan [--days 3]   # today's automatic rotation plan (app.rotation)
 """
 import argparse
 import os
@@ -20,19 +21,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.models import Contact, Mention, OutreachLog
-
-
-def _normalize_url(url: str | None) -> str | None:
-    """Strip tracking params for dedupe; return None if invalid."""
-    if not url or not url.strip():
-        return None
-    try:
-        from urllib.parse import urlparse, urlunparse
-        p = urlparse(url.strip())
-        return urlunparse((p.scheme, p.netloc, p.path, "", "", ""))
-    except Exception:
-        return url
+from app.articles import ContactMatcher, ingest_articles
+from app.models import Contact, OutreachLog
+from app.rotation import mark_fetched, plan_rotation
 
 
 def fetch_newsapi(api_key: str, name: str, days: int) -> list[dict]:
@@ -118,6 +109,7 @@ def main():
     parser.add_argument("--days", type=int, default=7, help="Look back days")
     parser.add_argument("--max-per-contact", type=int, default=2, help="Max mentions to store per contact (1 or 2)")
     parser.add_argument("--delay", type=float, default=1.0, help="Seconds between API calls")
+    parser.add_argument("--plan", action="store_true", help="Fetch today's rotation plan (quota-aware, covers the whole list over time)")
     args = parser.parse_args()
 
     # Load API key from env (check outreach-app/.env or backend/.env)
@@ -144,90 +136,67 @@ def main():
     session = Session()
 
     try:
-        # Exclude contacts we've already reached out to
-        contacted_ids = {r.contact_id for r in session.query(OutreachLog.contact_id).distinct().all()}
-        query = session.query(Contact).order_by(Contact.list_number)
-        # If any contact is in the "mention rotation", fetch only those (daily core group)
-        use_rotation = session.query(Contact).filter(Contact.in_mention_rotation == 1).limit(1).first() is not None
-        if use_rotation:
-            query = query.filter(Contact.in_mention_rotation == 1)
-            print("Using mention rotation: only fetching for tagged contacts.")
-        if contacted_ids:
-            query = query.filter(Contact.id.notin_(contacted_ids))
-        if args.limit:
-            query = query.limit(args.limit)
-        contacts = query.all()
+        contacted_ids = set()
+        if args.plan:
+            plan = plan_rotation(session, budget=args.limit)
+            session.commit()
+            planned_ids = [e["contact_id"] for e in plan["entries"] if not e["fetched_at"]]
+            by_id = {c.id: c for c in session.query(Contact).filter(Contact.id.in_(planned_ids)).all()}
+            contacts = [by_id[cid] for cid in planned_ids if cid in by_id]
+            print(f"Using rotation plan for {plan['date']}: {plan['planned']} (cycle {plan['cycle_days']} days).")
+        else:
+            # Exclude contacts we've already reached out to
+            contacted_ids = {r.contact_id for r in session.query(OutreachLog.contact_id).distinct().all()}
+            query = session.query(Contact).order_by(Contact.list_number)
+            # If any contact is in the "mention rotation", fetch only those (daily core group)
+            use_rotation = session.query(Contact).filter(Contact.in_mention_rotation == 1).limit(1).first() is not None
+            if use_rotation:
+                query = query.filter(Contact.in_mention_rotation == 1)
+                print("Using mention rotation: only fetching for tagged contacts.")
+            if contacted_ids:
+                query = query.filter(Contact.id.notin_(contacted_ids))
+            if args.limit:
+                query = query.limit(args.limit)
+            contacts = query.all()
 
         max_per = max(1, min(args.max_per_contact, 2))  # Clamp to 1 or 2
         print(f"Fetching mentions for {len(contacts)} contacts (last {args.days} days, max {max_per} per contact)...")
         if contacted_ids:
             print(f"  (Skipping {len(contacted_ids)} contacts already contacted)")
 
-        contact_ids = [c.id for c in contacts]
-        existing_mentions = session.query(Mention).filter(Mention.contact_id.in_(contact_ids)).all()
-        seen_urls: set[tuple[int, str]] = set()
-        for m in existing_mentions:
-            n = _normalize_url(m.source_url)
-            if n:
-                seen_urls.add((m.contact_id, n))
-
-        added = 0
+        # Articles are stored once (app.articles) and linked to every contact named in them
+        matcher = ContactMatcher.from_db(session)
+        added = co_mentions = 0
         for i, contact in enumerate(contacts):
             contact_added = 0
 
             # News via NewsAPI
             if api_key:
                 articles = fetch_newsapi(api_key, contact.name, args.days)
-                for a in articles[:max_per]:
-                    raw_url = a.get("source_url")
-                    norm_url = _normalize_url(raw_url)
-                    if not norm_url or (contact.id, norm_url) in seen_urls:
-                        continue
-                    seen_urls.add((contact.id, norm_url))
-                    pub = None
-                    if a.get("published_at"):
-                        try:
-                            pub = datetime.fromisoformat(a["published_at"].replace("Z", "+00:00"))
-                        except ValueError:
-                            pass
-                    session.add(Mention(
-                        contact_id=contact.id,
-                        source_type="news",
-                        source_url=raw_url,
-                        title=a["title"],
-                        snippet=a["snippet"],
-                        published_at=pub,
-                    ))
-                    added += 1
-                    contact_added += 1
+                items = [{**a, "source_type": "news"} for a in articles[:max_per]]
+                stats = ingest_articles(session, contact.id, items, matcher)
+                contact_added += stats["added"]
+                co_mentions += stats["co_mentions"]
                 time.sleep(args.delay)
 
             # LinkedIn posts via Serper.dev
             if serper_key:
                 posts = fetch_serper_linkedin(serper_key, contact.name, args.days)
-                for p in posts[:max_per]:
-                    raw_url = p.get("source_url")
-                    norm_url = _normalize_url(raw_url)
-                    if not norm_url or (contact.id, norm_url) in seen_urls:
-                        continue
-                    seen_urls.add((contact.id, norm_url))
-                    session.add(Mention(
-                        contact_id=contact.id,
-                        source_type="linkedin",
-                        source_url=raw_url,
-                        title=p["title"],
-                        snippet=p["snippet"],
-                        published_at=None,
-                    ))
-                    added += 1
-                    contact_added += 1
+                items = [{**p, "source_type": "linkedin"} for p in posts[:max_per]]
+                stats = ingest_articles(session, contact.id, items, matcher)
+                contact_added += stats["added"]
+                co_mentions += stats["co_mentions"]
                 time.sleep(args.delay)
 
-            if contact_added:
-                print(f"  [{i+1}/{len(contacts)}] {contact.name}: +{contact_added} mentions")
+            added += contact_added
+            if args.plan:
+                mark_fetched(session, [contact.id])
+            # Commit per contact so the API can announce new mentions while the run continues
+            session.commit()
+            print(f"  [{i+1}/{len(contacts)}] {contact.name}: +{contact_added} mentions", flush=True)
 
         session.commit()
-        print(f"Done. Added {added} new mentions.")
+        print(f"Done. Added {added} new mentions (+{co_mentions} co-mentioned contacts linked).")
     finally:
         session.close()
     return 0